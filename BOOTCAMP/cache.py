@@ -0,0 +1,52 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = 'bootcamp-catalog:version'
+
+
+def _cache():
+    return caches[settings.BOOTCAMP_CATALOG_CACHE_ALIAS]
+
+
+def catalog_version():
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_catalog():
+    """باطل کردن همه‌ی صفحه‌های کش‌شده‌ی کاتالوگ (با عوض کردن نسخه)"""
+    _cache().set(VERSION_KEY, time.time_ns(), None)
+
+
+def _cache_key(request):
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.items()))
+    # پیوندهای صفحه‌بندی در پاسخ نشانی کامل (طرح و میزبان) دارند
+    raw = "|".join([
+        str(catalog_version()), request.scheme, request.get_host(), request.path, params,
+        request.accepted_renderer.format
+    ])
+    return "bootcamp-catalog:page:" + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def cached_page(request, produce):
+    """
+    پاسخ کش‌شده‌ی یک صفحه از کاتالوگ
+
+    کلید از نسخه‌ی کاتالوگ، میزبان درخواست، فیلتر وضعیت و پارامترهای صفحه‌بندی ساخته
+    می‌شود؛ پاسخ برای همه‌ی بازدیدکنندگان یک میزبان یکسان است. کش باید بین پردازه‌ها
+    مشترک باشد (بررسی BOOTCAMP.E001) تا باطل شدن نسخه به همه‌ی آن‌ها برسد.
+    """
+    key = _cache_key(request)
+    data = _cache().get(key)
+    if data is not None:
+        return data
+    data = produce()
+    _cache().set(key, data, settings.BOOTCAMP_CATALOG_CACHE_TIMEOUT)
+    return data
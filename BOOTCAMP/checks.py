@@ -0,0 +1,9 @@
+from django.core.checks import register
+
+from finalkelasor.checks import check_shared_cache
+
+
+@register()
+def check_catalog_cache(app_configs, **kwargs):
+    """ثبت‌نام در یک پردازه باید صفحه‌های کش‌شده‌ی کاتالوگ را در همه‌ی پردازه‌ها باطل کند"""
+    return check_shared_cache('BOOTCAMP_CATALOG_CACHE_ALIAS', "Bootcamp catalog", 'BOOTCAMP.E001')
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BootcampCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='نام دسته\u200cبندی')),
+                ('description', models.TextField(blank=True, verbose_name='توضیحات')),
+            ],
+            options={
+                'verbose_name': 'دسته\u200cبندی بوتکمپ',
+                'verbose_name_plural': 'دسته\u200cبندی\u200cهای بوتکمپ',
+            },
+        ),
+        migrations.CreateModel(
+            name='Bootcamp',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='عنوان')),
+                ('description', models.TextField(blank=True, verbose_name='توضیحات')),
+                ('start_date', models.DateField(verbose_name='تاریخ شروع')),
+                ('end_date', models.DateField(verbose_name='تاریخ پایان')),
+                ('schedule_days', models.CharField(max_length=100, verbose_name='روزهای برگزاری')),
+                ('schedule_time', models.CharField(max_length=100, verbose_name='ساعات برگزاری')),
+                ('capacity', models.PositiveIntegerField(verbose_name='ظرفیت')),
+                ('status', models.CharField(choices=[('draft', 'پیش نویس'), ('registration', 'در حال ثبت نام'), ('ongoing', 'در حال برگزاری'), ('completed', 'برگزار شده'), ('canceled', 'لغو شده')], default='draft', max_length=20, verbose_name='وضعیت')),
+                ('is_advance', models.BooleanField(default=False, verbose_name='ادونس؟')),
+                ('price', models.PositiveIntegerField(default=0, verbose_name='قیمت')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='bootcamps', to='BOOTCAMP.bootcampcategory')),
+            ],
+            options={
+                'verbose_name': 'بوتکمپ',
+                'verbose_name_plural': 'بوتکمپ\u200cها',
+            },
+        ),
+        migrations.CreateModel(
+            name='BootcampRegistration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'بررسی نشده'), ('reviewing', 'در حال بررسی'), ('approved', 'تایید شده'), ('rejected', 'تایید نشده')], default='pending', max_length=20, verbose_name='وضعیت')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ثبت\u200cنام')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')),
+                ('payment_receipt', models.ImageField(blank=True, null=True, upload_to='receipts/', verbose_name='رسید پرداخت')),
+                ('bootcamp', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registrations', to='BOOTCAMP.bootcamp')),
+            ],
+            options={
+                'verbose_name': 'ثبت\u200cنام بوتکمپ',
+                'verbose_name_plural': 'ثبت\u200cنام\u200cهای بوتکمپ',
+            },
+        ),
+    ]
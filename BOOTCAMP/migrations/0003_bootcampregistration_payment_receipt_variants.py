@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BOOTCAMP', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bootcampregistration',
+            name='payment_receipt_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='نسخه\u200cهای رسید پرداخت'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BOOTCAMP', '0003_bootcampregistration_payment_receipt_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bootcamp',
+            index=models.Index(fields=['status'], name='bootcamp_status_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BOOTCAMP', '0004_bootcamp_bootcamp_status_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bootcamp',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='صندلی\u200cهای پرشده'),
+        ),
+        migrations.AlterField(
+            model_name='bootcampregistration',
+            name='status',
+            field=models.CharField(choices=[('pending', 'بررسی نشده'), ('reviewing', 'در حال بررسی'), ('approved', 'تایید شده'), ('rejected', 'تایید نشده'), ('waitlisted', 'در لیست انتظار')], default='pending', max_length=20, verbose_name='وضعیت'),
+        ),
+        migrations.AddIndex(
+            model_name='bootcampregistration',
+            index=models.Index(fields=['bootcamp', 'status', 'created_at'], name='bootcamp_reg_queue_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bootcamp',
+            constraint=models.CheckConstraint(condition=models.Q(('seats_taken__lte', models.F('capacity'))), name='bootcamp_seats_within_capacity'),
+        ),
+    ]
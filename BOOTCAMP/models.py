@@ -4,6 +4,9 @@ from django.utils.translation import gettext_lazy as _  #قابلیت ترجمه
 from django.utils.translation import gettext_lazy as _
 User = get_user_model()
 from django.core.exceptions import ValidationError  # روش صحیح برای مدل‌ها
+from django.conf import settings
+
+from finalkelasor.images import ImageVariantsMixin
 
 class BootcampCategory(models.Model):
     name = models.CharField(max_length=100, verbose_name="نام دسته‌بندی")
@@ -32,6 +35,8 @@ class Bootcamp(models.Model):
     schedule_days = models.CharField(_('روزهای برگزاری'), max_length=100)
     schedule_time = models.CharField(_('ساعات برگزاری'), max_length=100)
     capacity = models.PositiveIntegerField(_('ظرفیت'))
+    # تعداد ثبت‌نام‌های دارای صندلی؛ فقط از طریق BOOTCAMP.services.registration تغییر می‌کند
+    seats_taken = models.PositiveIntegerField(_('صندلی‌های پرشده'), default=0, editable=False)
     status = models.CharField(_('وضعیت'), max_length=20, choices=Status.choices, default=Status.DRAFT)
     is_advance = models.BooleanField(_('ادونس؟'), default=False)  # برای تفکیک بوتکمپ‌های ادونس/حضوری
     price = models.PositiveIntegerField(_('قیمت'), default=0)  # قیمت به تومان
@@ -39,24 +44,49 @@ class Bootcamp(models.Model):
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
+    def save(self, *args, **kwargs):
+        # seats_taken فقط با UPDATE شرطی سرویس ثبت‌نام تغییر می‌کند؛ ذخیره‌ی کامل یک بوتکمپ
+        # (مثلاً ویرایش ادمین) نباید مقدار کهنه‌ی خوانده‌شده را روی آن بنویسد
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'seats_taken'
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('بوتکمپ')
         verbose_name_plural = _('بوتکمپ‌ها')
+        indexes = [
+            models.Index(fields=['status'], name='bootcamp_status_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(seats_taken__lte=models.F('capacity')), name='bootcamp_seats_within_capacity'
+            ),
+        ]
 
 
-class BootcampRegistration(models.Model):
+class BootcampRegistration(ImageVariantsMixin, models.Model):
     class Status(models.TextChoices):
         PENDING = 'pending', _('بررسی نشده')
         REVIEWING = 'reviewing', _('در حال بررسی')
         APPROVED = 'approved', _('تایید شده')
         REJECTED = 'rejected', _('تایید نشده')
+        WAITLISTED = 'waitlisted', _('در لیست انتظار')
 
-    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='bootcamp_registrations')
+    # وضعیت‌هایی که یک صندلی از ظرفیت بوتکمپ را اشغال می‌کنند
+    SEATED_STATUSES = (Status.PENDING, Status.REVIEWING, Status.APPROVED)
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='bootcamp_registrations')
     bootcamp = models.ForeignKey('Bootcamp', on_delete=models.CASCADE, related_name='registrations')
     status = models.CharField(_('وضعیت'), max_length=20, choices=Status.choices, default=Status.PENDING)
     created_at = models.DateTimeField(_('تاریخ ثبت‌نام'), auto_now_add=True)
     updated_at = models.DateTimeField(_('تاریخ بروزرسانی'), auto_now=True)
     payment_receipt = models.ImageField(_('رسید پرداخت'), upload_to='receipts/', null=True, blank=True)  # برای پرداخت آفلاین
+    payment_receipt_variants = models.JSONField(_('نسخه‌های رسید پرداخت'), default=dict, blank=True, editable=False)
+
+    image_variant_fields = {'payment_receipt': 'payment_receipt_variants'}
 
     def clean(self):
         if self.bootcamp.status != Bootcamp.Status.REGISTRATION:
@@ -66,5 +96,9 @@ class BootcampRegistration(models.Model):
         verbose_name = _('ثبت‌نام بوتکمپ')
         verbose_name_plural = _('ثبت‌نام‌های بوتکمپ')
         unique_together = ('user', 'bootcamp')
+        indexes = [
+            # ترتیب ارتقای لیست انتظار
+            models.Index(fields=['bootcamp', 'status', 'created_at'], name='bootcamp_reg_queue_idx'),
+        ]
 
 
@@ -8,4 +8,6 @@ class IsSuperUserOrReadOnly(permissions.BasePermission):
 
 class IsSupportUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='support').exists()
\ No newline at end of file
+        user = request.user
+        # عضویت در گروه‌ها از کش خوانده می‌شود (USER.services.permission_cache)
+        return bool(user and user.is_authenticated and user.in_group('support'))
\ No newline at end of file
@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers,permissions,validators
 from .models import Bootcamp, BootcampCategory,BootcampRegistration
+from .services import registration
+from finalkelasor.images import ImageVariantsField
 
 class BootcampCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,36 +17,76 @@ class BootcampSerializer(serializers.ModelSerializer):
         write_only=True,
         required=True
     )
+    # از annotate در BootcampViewSet.get_queryset
+    remaining_seats = serializers.IntegerField(read_only=True)
+    registration_count = serializers.IntegerField(read_only=True)
+    waitlist_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Bootcamp
         fields = [
             'id', 'title', 'description', 'category', 'category_id',
             'start_date', 'end_date', 'schedule_days', 'schedule_time',
-            'capacity', 'status', 'is_advance', 'price'
+            'capacity', 'seats_taken', 'remaining_seats', 'registration_count', 'waitlist_count',
+            'status', 'is_advance', 'price'
         ]
-        read_only_fields = ['status']  # وضعیت فقط از طریق اکشن‌های خاص تغییر کند
+        read_only_fields = ['seats_taken', 'status']  # وضعیت فقط از طریق اکشن‌های خاص تغییر کند
 
     def validate_capacity(self, value):
         if value < 1:
             raise serializers.ValidationError("ظرفیت باید حداقل ۱ باشد.")
         return value
-    
 
-    class BootcampRegistrationSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        # مقایسه با seats_taken خوانده‌شده ممکن است کهنه باشد؛ ظرفیت با UPDATE شرطی عوض می‌شود
+        capacity = validated_data.pop('capacity', None)
+        with transaction.atomic():
+            if capacity is not None:
+                if not registration.change_capacity(instance, capacity):
+                    raise serializers.ValidationError(
+                        {'capacity': ["ظرفیت نمی‌تواند از تعداد ثبت‌نام‌های فعلی کمتر باشد."]}
+                    )
+                instance.capacity = capacity
+            return super().update(instance, validated_data)
 
-     bootcamp_title = serializers.CharField(source='bootcamp.title', read_only=True)
-     user_phone = serializers.CharField(source='user.phone', read_only=True)
+
+class BootcampRegistrationSerializer(serializers.ModelSerializer):
+    bootcamp_title = serializers.CharField(source='bootcamp.title', read_only=True)
+    user_phone = serializers.CharField(source='user.phone', read_only=True)
+    payment_receipt_variants = ImageVariantsField('payment_receipt')
 
     class Meta:
         model = BootcampRegistration
         fields = [
             'id', 'user', 'user_phone', 'bootcamp', 'bootcamp_title',
-            'status', 'created_at', 'updated_at', 'payment_receipt'
+            'status', 'created_at', 'updated_at', 'payment_receipt', 'payment_receipt_variants'
         ]
         read_only_fields = ['user', 'status']  # کاربر فقط می‌تواند بوتکمپ را انتخاب کند
 
+    def validate_bootcamp(self, value):
+        # جابه‌جایی بین بوتکمپ‌ها صندلی‌ها را به هم می‌ریزد؛ باید لغو و دوباره ثبت‌نام کرد
+        if self.instance is not None and value.pk != self.instance.bootcamp_id:
+            raise serializers.ValidationError("بوتکمپ ثبت‌نام قابل تغییر نیست.")
+        return value
+
+
+class BulkReviewSerializer(serializers.Serializer):
+    """انتخاب ثبت‌نام‌ها برای بررسی گروهی: فهرست شناسه‌ها یا فیلتر بوتکمپ/وضعیت"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000)
+    bootcamp = serializers.PrimaryKeyRelatedField(queryset=Bootcamp.objects.all(), required=False)
+    status = serializers.ChoiceField(choices=BootcampRegistration.Status.choices, required=False)
+
     def validate(self, data):
-        if BootcampRegistration.objects.filter(user=self.context['request'].user, bootcamp=data['bootcamp']).exists():
-            raise serializers.ValidationError("شما قبلاً در این بوتکمپ ثبت‌نام کرده‌اید.")
-        return data
\ No newline at end of file
+        if 'ids' not in data and 'bootcamp' not in data:
+            raise serializers.ValidationError("فهرست شناسه‌ها (ids) یا بوتکمپ را مشخص کنید.")
+        return data
+
+    def get_queryset(self):
+        queryset = BootcampRegistration.objects.all()
+        if 'ids' in self.validated_data:
+            queryset = queryset.filter(pk__in=self.validated_data['ids'])
+        if 'bootcamp' in self.validated_data:
+            queryset = queryset.filter(bootcamp=self.validated_data['bootcamp'])
+        if 'status' in self.validated_data:
+            queryset = queryset.filter(status=self.validated_data['status'])
+        return queryset
@@ -0,0 +1,200 @@
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Bootcamp, BootcampRegistration
+from ..signals import registration_status_changed
+
+Status = BootcampRegistration.Status
+
+# وضعیت‌های مبدأ مجاز در تغییر گروهی؛ تایید ثبت‌نام‌های لیست انتظار به صندلی نیاز دارد
+# و فقط تکی (change_status) انجام می‌شود
+BULK_TRANSITIONS = {
+    Status.REVIEWING: (Status.PENDING,),
+    Status.APPROVED: (Status.PENDING, Status.REVIEWING),
+    Status.REJECTED: (Status.PENDING, Status.REVIEWING, Status.APPROVED, Status.WAITLISTED),
+}
+
+
+class RegistrationError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class RegistrationClosed(RegistrationError):
+    """بوتکمپ در حال ثبت‌نام نیست"""
+
+
+class AlreadyRegistered(RegistrationError):
+    """کاربر قبلاً در این بوتکمپ ثبت‌نام کرده است"""
+
+
+class BootcampFull(RegistrationError):
+    """صندلی خالی برای تغییر وضعیت ثبت‌نام وجود ندارد"""
+
+
+def _take_seat(bootcamp_id, using, open_only=True):
+    """
+    رزرو یک صندلی با یک UPDATE شرطی
+
+    شرط ظرفیت در خود UPDATE بررسی می‌شود، پس درخواست‌های همزمان هرگز بیشتر از
+    ظرفیت صندلی نمی‌گیرند و قفل ردیف بوتکمپ فقط تا پایان تراکنش جاری نگه داشته می‌شود.
+    """
+    queryset = Bootcamp.objects.using(using).filter(pk=bootcamp_id, seats_taken__lt=F('capacity'))
+    if open_only:
+        queryset = queryset.filter(status=Bootcamp.Status.REGISTRATION)
+    return queryset.update(seats_taken=F('seats_taken') + 1) == 1
+
+
+def _release_seat(bootcamp_id, using):
+    Bootcamp.objects.using(using).filter(pk=bootcamp_id, seats_taken__gt=0).update(
+        seats_taken=F('seats_taken') - 1
+    )
+
+
+def change_capacity(bootcamp, capacity, using=DEFAULT_DB_ALIAS):
+    """
+    تغییر ظرفیت بوتکمپ با یک UPDATE شرطی
+
+    شرط «ظرفیت جدید کمتر از صندلی‌های گرفته‌شده نباشد» در خود UPDATE بررسی می‌شود،
+    پس ثبت‌نام همزمان نمی‌تواند آن را نقض کند. خروجی: آیا ظرفیت تغییر کرد
+    """
+    return Bootcamp.objects.using(using).filter(pk=bootcamp.pk, seats_taken__lte=capacity).update(
+        capacity=capacity
+    ) == 1
+
+
+def _notify(status, registration_ids, using):
+    """ارسال یک سیگنال برای همه‌ی ثبت‌نام‌های تغییرکرده، داخل همان تراکنش"""
+    if registration_ids:
+        registration_status_changed.send(
+            sender=BootcampRegistration, status=status, registration_ids=list(registration_ids), using=using
+        )
+
+
+def register(user, bootcamp, payment_receipt=None, using=DEFAULT_DB_ALIAS):
+    """
+    ثبت‌نام کاربر در بوتکمپ
+
+    اگر صندلی خالی باشد ثبت‌نام با وضعیت «بررسی نشده» و در غیر این صورت در لیست
+    انتظار ثبت می‌شود. ثبت‌نام تکراری با محدودیت یکتایی پایگاه داده تشخیص داده می‌شود
+    و رزرو صندلی همراه با تراکنش برگردانده می‌شود.
+    """
+    try:
+        with transaction.atomic(using=using):
+            if _take_seat(bootcamp.pk, using):
+                status = Status.PENDING
+            elif Bootcamp.objects.using(using).filter(pk=bootcamp.pk, status=Bootcamp.Status.REGISTRATION).exists():
+                status = Status.WAITLISTED
+            else:
+                raise RegistrationClosed("این بوتکمپ در حال ثبت‌نام نیست.")
+
+            registration = BootcampRegistration(
+                user=user, bootcamp=bootcamp, status=status, payment_receipt=payment_receipt
+            )
+            registration.save(using=using)
+    except IntegrityError:
+        raise AlreadyRegistered("شما قبلاً در این بوتکمپ ثبت‌نام کرده‌اید.")
+    return registration
+
+
+def fill_seats(bootcamp_id, using=DEFAULT_DB_ALIAS):
+    """
+    ارتقای ثبت‌نام‌های لیست انتظار (به ترتیب زمان ثبت‌نام) تا پر شدن صندلی‌های خالی
+
+    ردیف‌های قفل‌شده توسط تراکنش‌های دیگر رد می‌شوند تا دو فراخوانی همزمان یک
+    ثبت‌نام را دو بار ارتقا ندهند. فهرست ثبت‌نام‌های ارتقایافته برگردانده می‌شود.
+    """
+    promoted = []
+    with transaction.atomic(using=using):
+        while True:
+            registration = BootcampRegistration.objects.using(using).select_for_update(skip_locked=True).filter(
+                bootcamp_id=bootcamp_id, status=Status.WAITLISTED
+            ).order_by('created_at', 'pk').first()
+            if registration is None or not _take_seat(bootcamp_id, using):
+                break
+            registration.status = Status.PENDING
+            registration.save(using=using, update_fields=['status', 'updated_at'])
+            promoted.append(registration)
+        _notify(Status.PENDING, [registration.pk for registration in promoted], using)
+    return promoted
+
+
+def change_status(registration, status, using=DEFAULT_DB_ALIAS):
+    """
+    تغییر وضعیت ثبت‌نام همراه با به‌روزرسانی صندلی‌ها
+
+    خروج از وضعیت‌های دارای صندلی (مثلاً رد شدن) صندلی را آزاد و نفر بعدی لیست
+    انتظار را ارتقا می‌دهد؛ ورود به آن‌ها (مثلاً تایید مستقیم از لیست انتظار) به
+    صندلی خالی نیاز دارد. خروجی: (ثبت‌نام، ثبت‌نام‌های ارتقایافته)
+    """
+    seated_statuses = BootcampRegistration.SEATED_STATUSES
+    with transaction.atomic(using=using):
+        registration = BootcampRegistration.objects.using(using).select_for_update().get(pk=registration.pk)
+        was_seated = registration.status in seated_statuses
+        seated = status in seated_statuses
+
+        if seated and not was_seated and not _take_seat(registration.bootcamp_id, using, open_only=False):
+            raise BootcampFull("ظرفیت این بوتکمپ تکمیل است.")
+
+        registration.status = status
+        registration.save(using=using, update_fields=['status', 'updated_at'])
+        _notify(status, [registration.pk], using)
+
+        promoted = []
+        if was_seated and not seated:
+            _release_seat(registration.bootcamp_id, using)
+            promoted = fill_seats(registration.bootcamp_id, using)
+    return registration, promoted
+
+
+def bulk_change_status(queryset, status, using=DEFAULT_DB_ALIAS):
+    """
+    تغییر وضعیت گروهی ثبت‌نام‌ها با یک UPDATE
+
+    ردیف‌های queryset قفل می‌شوند، فقط ثبت‌نام‌هایی که وضعیت فعلی‌شان در BULK_TRANSITIONS
+    مجاز است تغییر می‌کنند و صندلی‌های آزادشده برای هر بوتکمپ یک‌جا کم و به لیست انتظار
+    داده می‌شوند. اطلاع‌رسانی با یک سیگنال برای کل دسته انجام می‌شود.
+    خروجی: (وضعیت قبلی هر شناسه، شناسه‌های تغییرکرده، ثبت‌نام‌های ارتقایافته)
+    """
+    allowed = BULK_TRANSITIONS[status]
+    with transaction.atomic(using=using):
+        rows = list(
+            queryset.using(using).select_for_update().order_by('pk').values_list('pk', 'bootcamp_id', 'status')
+        )
+        changed = [(pk, bootcamp_id, previous) for pk, bootcamp_id, previous in rows if previous in allowed]
+        updated_ids = [pk for pk, _, _ in changed]
+        if updated_ids:
+            BootcampRegistration.objects.using(using).filter(pk__in=updated_ids).update(
+                status=status, updated_at=timezone.now()
+            )
+        _notify(status, updated_ids, using)
+
+        promoted = []
+        if status not in BootcampRegistration.SEATED_STATUSES:
+            released = Counter(
+                bootcamp_id for _, bootcamp_id, previous in changed
+                if previous in BootcampRegistration.SEATED_STATUSES
+            )
+            for bootcamp_id, seats in sorted(released.items()):
+                Bootcamp.objects.using(using).filter(pk=bootcamp_id).update(seats_taken=F('seats_taken') - seats)
+                promoted.extend(fill_seats(bootcamp_id, using))
+
+    previous_statuses = {pk: previous for pk, _, previous in rows}
+    return previous_statuses, updated_ids, promoted
+
+
+def cancel(registration, using=DEFAULT_DB_ALIAS):
+    """حذف ثبت‌نام؛ اگر صندلی داشته باشد به نفر بعدی لیست انتظار می‌رسد"""
+    with transaction.atomic(using=using):
+        deleted = BootcampRegistration.objects.using(using).filter(
+            pk=registration.pk, status__in=BootcampRegistration.SEATED_STATUSES
+        ).delete()[0]
+        if deleted:
+            _release_seat(registration.bootcamp_id, using)
+            return fill_seats(registration.bootcamp_id, using)
+        BootcampRegistration.objects.using(using).filter(pk=registration.pk).delete()
+    return []
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .cache import invalidate_catalog
+from .models import Bootcamp, BootcampCategory, BootcampRegistration
+
+# پس از تغییر وضعیت یک یا چند ثبت‌نام (تکی، گروهی یا ارتقا از لیست انتظار) یک بار برای هر
+# دسته و داخل همان تراکنش ارسال می‌شود تا گیرنده‌ها (مثلاً صف اطلاع‌رسانی) همراه آن commit یا
+# rollback شوند؛ آرگومان‌ها: status، registration_ids و using
+registration_status_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Bootcamp)
+@receiver([post_save, post_delete], sender=BootcampCategory)
+@receiver([post_save, post_delete], sender=BootcampRegistration)
+def invalidate_catalog_pages(sender, using, **kwargs):
+    # تغییر صندلی‌ها (seats_taken) همیشه همراه با ذخیره یا حذف یک ثبت‌نام در همان تراکنش است
+    transaction.on_commit(invalidate_catalog, using=using)
+
+
+@receiver(registration_status_changed)
+def invalidate_catalog_after_review(sender, using, **kwargs):
+    # تغییرهای گروهی با UPDATE انجام می‌شوند و post_save ندارند
+    transaction.on_commit(invalidate_catalog, using=using)
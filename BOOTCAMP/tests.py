@@ -1,3 +1,215 @@
-from django.test import TestCase
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from finalkelasor.testing import QueryPlanAssertionsMixin
+from USER.models import User
+
+from .checks import check_catalog_cache
+from .models import Bootcamp, BootcampCategory, BootcampRegistration
+from .serializers import BootcampSerializer
+from .services import registration
+from .signals import registration_status_changed
+from .views import BootcampRegistrationViewSet, BootcampViewSet
+
+Status = BootcampRegistration.Status
+
+
+class IndexUsageTests(QueryPlanAssertionsMixin, TestCase):
+    """فیلتر وضعیت در فهرست بوتکمپ‌ها باید از ایندکس استفاده کند"""
+
+    def test_status_filter_uses_status_index(self):
+        queryset = Bootcamp.objects.filter(status=Bootcamp.Status.REGISTRATION)
+        self.assertUsesIndex(queryset, 'bootcamp_status_idx')
+
+
+def _bootcamp(capacity, status=Bootcamp.Status.REGISTRATION):
+    category = BootcampCategory.objects.create(name="برنامه‌نویسی")
+    return Bootcamp.objects.create(
+        title="بوتکمپ جنگو", category=category, start_date=date(2030, 1, 1), end_date=date(2030, 3, 1),
+        schedule_days="شنبه", schedule_time="۱۸ تا ۲۱", capacity=capacity, status=status
+    )
+
+
+def _users(count):
+    return User.objects.bulk_create(
+        User(phone=f"0912{index:07d}", first_name='a', last_name='b', national_id=f"{index:010d}", gender='male')
+        for index in range(count)
+    )
+
+
+class RegistrationServiceTests(TestCase):
+    """رزرو صندلی، لیست انتظار و ارتقای خودکار"""
+
+    def setUp(self):
+        self.bootcamp = _bootcamp(capacity=2)
+        self.users = _users(4)
+
+    def test_registrations_beyond_capacity_are_waitlisted(self):
+        statuses = [registration.register(user, self.bootcamp).status for user in self.users]
+        self.assertEqual(statuses, [Status.PENDING, Status.PENDING, Status.WAITLISTED, Status.WAITLISTED])
+        self.bootcamp.refresh_from_db()
+        self.assertEqual(self.bootcamp.seats_taken, 2)
+
+    def test_duplicate_registration_keeps_seat_count(self):
+        registration.register(self.users[0], self.bootcamp)
+        with self.assertRaises(registration.AlreadyRegistered):
+            registration.register(self.users[0], self.bootcamp)
+        self.bootcamp.refresh_from_db()
+        self.assertEqual(self.bootcamp.seats_taken, 1)
+
+    def test_closed_bootcamp_rejects_registration(self):
+        closed = Bootcamp.objects.create(
+            title="بسته", category=self.bootcamp.category, start_date=date(2030, 1, 1), end_date=date(2030, 3, 1),
+            schedule_days="شنبه", schedule_time="۱۸", capacity=5, status=Bootcamp.Status.DRAFT
+        )
+        with self.assertRaises(registration.RegistrationClosed):
+            registration.register(self.users[0], closed)
+
+    def test_rejection_promotes_oldest_waitlisted(self):
+        first, _, waiting, _ = [registration.register(user, self.bootcamp) for user in self.users]
+        rejected, promoted = registration.change_status(first, Status.REJECTED)
+
+        self.assertEqual(rejected.status, Status.REJECTED)
+        self.assertEqual([item.pk for item in promoted], [waiting.pk])
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.status, Status.PENDING)
+        self.bootcamp.refresh_from_db()
+        self.assertEqual(self.bootcamp.seats_taken, 2)
+
+    def test_cancel_frees_seat_for_waitlist(self):
+        first, *_ = [registration.register(user, self.bootcamp) for user in self.users]
+        promoted = registration.cancel(first)
+        self.assertEqual(len(promoted), 1)
+        self.assertEqual(
+            BootcampRegistration.objects.filter(bootcamp=self.bootcamp, status=Status.WAITLISTED).count(), 1
+        )
+
+    def test_approving_waitlisted_requires_free_seat(self):
+        *_, waiting = [registration.register(user, self.bootcamp) for user in self.users]
+        with self.assertRaises(registration.BootcampFull):
+            registration.change_status(waiting, Status.APPROVED)
+
+
+class RegistrationRaceMixin:
+    """سناریوهای ثبت‌نام و رد همزمان؛ با sequential=True نخ‌ها یکی‌یکی اجرا می‌شوند و همزمانی ندارند"""
+    capacity = 10
+    students = 60
+    sequential = False
+
+    def _in_parallel(self, function, items):
+        barrier = threading.Barrier(len(items))
+        turn = threading.Lock() if self.sequential else contextlib.nullcontext()
+
+        def run(item):
+            barrier.wait()
+            try:
+                with turn:
+                    return function(item)
+            except registration.RegistrationError as exc:
+                return exc
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(items)) as executor:
+            return list(executor.map(run, items))
+
+    def test_capacity_is_never_exceeded(self):
+        bootcamp = _bootcamp(self.capacity)
+        users = _users(self.students)
+
+        # هر کاربر دو بار درخواست می‌دهد (دوبار کلیک)
+        results = self._in_parallel(lambda user: registration.register(user, bootcamp), users + users)
+
+        self.assertEqual(sum(isinstance(item, registration.AlreadyRegistered) for item in results), self.students)
+        bootcamp.refresh_from_db()
+        self.assertEqual(bootcamp.seats_taken, self.capacity)
+        registrations = BootcampRegistration.objects.filter(bootcamp=bootcamp)
+        self.assertEqual(registrations.filter(status=Status.PENDING).count(), self.capacity)
+        self.assertEqual(registrations.filter(status=Status.WAITLISTED).count(), self.students - self.capacity)
+
+    def test_concurrent_rejections_promote_each_waitlisted_once(self):
+        bootcamp = _bootcamp(self.capacity)
+        seated = [registration.register(user, bootcamp) for user in _users(self.capacity * 2)][:self.capacity]
+
+        results = self._in_parallel(lambda item: registration.change_status(item, Status.REJECTED), seated)
+
+        promoted = [item.pk for _, items in results for item in items]
+        self.assertEqual(len(promoted), len(set(promoted)))
+        bootcamp.refresh_from_db()
+        self.assertEqual(bootcamp.seats_taken, self.capacity)
+        self.assertEqual(
+            BootcampRegistration.objects.filter(bootcamp=bootcamp, status=Status.PENDING).count(), self.capacity
+        )
+
+
+class CapacityChangeTests(TestCase):
+    """تغییر ظرفیت با UPDATE شرطی: کاهش زیر صندلی‌های گرفته‌شده ۴۰۰ می‌دهد، نه خطای قید پایگاه داده"""
+
+    def setUp(self):
+        self.bootcamp = _bootcamp(capacity=3)
+        self.admin = User.objects.create_superuser(
+            phone='09350000000', password='password', first_name='c', last_name='d',
+            national_id='9000000000', gender='male'
+        )
+
+    def _patch(self, capacity):
+        request = APIRequestFactory().patch(
+            f'/BOOTCAMP/bootcamps/{self.bootcamp.pk}/', {'capacity': capacity}, format='json'
+        )
+        force_authenticate(request, user=self.admin)
+        return BootcampViewSet.as_view({'patch': 'partial_update'})(request, pk=self.bootcamp.pk)
+
+    def test_stale_instance_cannot_drop_capacity_below_seats(self):
+        stale = Bootcamp.objects.get(pk=self.bootcamp.pk)
+        for user in _users(3):
+            registration.register(user, self.bootcamp)
+
+        serializer = BootcampSerializer(stale, data={'capacity': 2}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.bootcamp.refresh_from_db()
+        self.assertEqual((self.bootcamp.capacity, self.bootcamp.seats_taken), (3, 3))
+
+    def test_capacity_change_through_api(self):
+        users = _users(4)
+        for user in users:
+            registration.register(user, self.bootcamp)
+
+        self.assertEqual(self._patch(2).status_code, 400)
+        response = self._patch(4)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.data['capacity'], response.data['seats_taken'], response.data['waitlist_count']), (4, 4, 0)
+        )
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentRegistrationTests(RegistrationRaceMixin, TransactionTestCase):
+    """
+    ثبت‌نام همزمان تعداد زیادی کاربر در یک بوتکمپ
+
+    روی SQLite نوشتن‌های همزمان قفل کل پایگاه داده را می‌گیرند، پس این تست روی
+    پایگاه‌های داده‌ای با قفل ردیف (مثل PostgreSQL) اجرا می‌شود.
+    """
+
+
+class SequentialOverbookingTests(RegistrationRaceMixin, TransactionTestCase):
+    """
+    جلوگیری از ثبت‌نام بیش از ظرفیت وقتی درخواست‌ها پشت سر هم می‌رسند؛ روی SQLite هم اجرا می‌شود
+
+    نخ‌ها با قفل یکی‌یکی اجرا می‌شوند، پس این تست چیزی درباره‌ی رقابت همزمان ثابت نمی‌کند
+    (آن کار ConcurrentRegistrationTests است). فقط نشان می‌دهد که با اتصال جدای هر نخ،
+    شمارش صندلی‌ها، لیست انتظار و ارتقا از آن بیش از ظرفیت نمی‌شود.
+    """
+    sequential = True
+    students = 20
@@ -1,36 +1,119 @@
 from django.shortcuts import render
-from rest_framework import viewsets, permissions
-from .models import Bootcamp
-from .serializers import BootcampSerializer
+from django.db.models import Count, F, Q
+from rest_framework import viewsets, permissions, serializers
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from finalkelasor.metrics import QueryBudgetMixin
+from .models import Bootcamp, BootcampRegistration
+from .serializers import BootcampSerializer, BootcampRegistrationSerializer, BulkReviewSerializer
+from .cache import cached_page
+from .pagination import BootcampCatalogPagination
 from .permissions import IsSuperUserOrReadOnly
+from .services import registration as registration_service
 
-class BootcampViewSet(viewsets.ModelViewSet):
+class BootcampViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     queryset = Bootcamp.objects.all()
     serializer_class = BootcampSerializer
     permission_classes = [IsSuperUserOrReadOnly]  # فقط سوپریوزر می‌تواند ویرایش کند
+    pagination_class = BootcampCatalogPagination
+    # شمارش برای صفحه‌بندی + صفحه‌ی بوتکمپ‌ها با دسته‌بندی و شمارش‌ها (بدون کش)
+    query_budget = {'list': 2, 'retrieve': 1}
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        seated = Q(registrations__status__in=BootcampRegistration.SEATED_STATUSES)
+        waitlisted = Q(registrations__status=BootcampRegistration.Status.WAITLISTED)
+        # دسته‌بندی و شمارش ثبت‌نام‌ها در یک کوئری گروه‌بندی‌شده
+        queryset = super().get_queryset().select_related('category').annotate(
+            registration_count=Count('registrations', filter=seated),
+            waitlist_count=Count('registrations', filter=waitlisted),
+            remaining_seats=F('capacity') - F('seats_taken'),
+        ).order_by('start_date', 'id')
         if self.request.query_params.get('status'):
             queryset = queryset.filter(status=self.request.query_params.get('status'))
         return queryset
-    
-    from rest_framework.response import Response
-from rest_framework.decorators import action
+
+    def list(self, request, *args, **kwargs):
+        # صفحه‌ی اول سایت برای همه‌ی بازدیدکنندگان؛ تا تغییر بعدی بوتکمپ‌ها یا ثبت‌نام‌ها از کش خوانده می‌شود
+        return Response(cached_page(request, lambda: super(BootcampViewSet, self).list(request, *args, **kwargs).data))
+
+    def perform_create(self, serializer):
+        bootcamp = serializer.save()
+        serializer.instance = self.get_queryset().get(pk=bootcamp.pk)
+
+    def perform_update(self, serializer):
+        bootcamp = serializer.save()
+        # افزایش ظرفیت یا باز شدن دوباره‌ی ثبت‌نام: ارتقای لیست انتظار
+        registration_service.fill_seats(bootcamp.pk)
+        serializer.instance = self.get_queryset().get(pk=bootcamp.pk)
+
 
 class BootcampRegistrationViewSet(viewsets.ModelViewSet):
     serializer_class = BootcampRegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
+        if self.action in ('approve', 'reject'):
+            return BootcampRegistration.objects.all()
         return BootcampRegistration.objects.filter(user=self.request.user)
 
+    def perform_create(self, serializer):
+        # ظرفیت، لیست انتظار و ثبت‌نام تکراری در سرویس ثبت‌نام به صورت اتمیک بررسی می‌شوند
+        try:
+            serializer.instance = registration_service.register(
+                self.request.user, serializer.validated_data['bootcamp'],
+                payment_receipt=serializer.validated_data.get('payment_receipt')
+            )
+        except registration_service.RegistrationError as exc:
+            raise serializers.ValidationError(exc.message)
+
+    def perform_destroy(self, instance):
+        registration_service.cancel(instance)
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
     def approve(self, request, pk=None):
-        registration = self.get_object()
-        registration.status = BootcampRegistration.Status.APPROVED
-        registration.save()
-        # ارسال نوتیفیکیشن به کاربر (با Celery)
+        try:
+            registration_service.change_status(self.get_object(), BootcampRegistration.Status.APPROVED)
+        except registration_service.RegistrationError as exc:
+            raise serializers.ValidationError(exc.message)
         return Response({'status': 'approved'})
-    
-    
+
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
+    def reject(self, request, pk=None):
+        registration, promoted = registration_service.change_status(
+            self.get_object(), BootcampRegistration.Status.REJECTED
+        )
+        return Response({'status': registration.status, 'promoted': [item.pk for item in promoted]})
+
+    @action(detail=False, methods=['post'], url_path='bulk-approve', permission_classes=[permissions.IsAdminUser])
+    def bulk_approve(self, request):
+        return self._bulk_change_status(request, BootcampRegistration.Status.APPROVED)
+
+    @action(detail=False, methods=['post'], url_path='bulk-reject', permission_classes=[permissions.IsAdminUser])
+    def bulk_reject(self, request):
+        return self._bulk_change_status(request, BootcampRegistration.Status.REJECTED)
+
+    @action(detail=False, methods=['post'], url_path='bulk-review', permission_classes=[permissions.IsAdminUser])
+    def bulk_review(self, request):
+        return self._bulk_change_status(request, BootcampRegistration.Status.REVIEWING)
+
+    def _bulk_change_status(self, request, status):
+        serializer = BulkReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        previous, updated_ids, promoted = registration_service.bulk_change_status(serializer.get_queryset(), status)
+
+        # نتیجه برای هر شناسه‌ی درخواستی (یا هر ثبت‌نام منطبق با فیلتر)
+        updated_ids = set(updated_ids)
+        results = []
+        for pk in serializer.validated_data.get('ids') or previous:
+            if pk not in previous:
+                results.append({'id': pk, 'result': 'not_found'})
+            elif pk in updated_ids:
+                results.append({'id': pk, 'result': 'updated', 'status': status})
+            else:
+                results.append({'id': pk, 'result': 'skipped', 'status': previous[pk]})
+        return Response({
+            'status': status,
+            'updated': len(updated_ids),
+            'results': results,
+            'promoted': [registration.pk for registration in promoted],
+        })
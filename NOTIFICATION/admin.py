@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import OutboxMessage
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['channel', 'recipient', 'subject', 'status', 'attempts', 'available_at', 'sent_at']
+    list_filter = ['channel', 'status']
+    search_fields = ['recipient', 'subject', 'dedup_key']
+    readonly_fields = ['created_at', 'sent_at', 'last_error']
@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime
+
+import requests
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from USER.services.sms_service import CircuitOpenError, get_kavenegar_client
+
+logger = logging.getLogger(__name__)
+
+
+class BaseBackend:
+    """
+    ارسال‌کننده‌ی یک کانال
+
+    send_messages یک دسته پیام (OutboxMessage) می‌گیرد و برای هر پیام به همان ترتیب
+    None (موفق) یا متن خطا برمی‌گرداند. هر دسته در یک نخ جداگانه ارسال می‌شود.
+    """
+
+    def send_messages(self, messages):
+        raise NotImplementedError
+
+
+class EmailBackend(BaseBackend):
+    """ارسال ایمیل با backend ایمیل جنگو؛ همه‌ی پیام‌های دسته از یک اتصال SMTP استفاده می‌کنند"""
+
+    def send_messages(self, messages):
+        try:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+        except Exception as exc:
+            logger.exception("Could not open email connection")
+            return [str(exc)] * len(messages)
+
+        errors = []
+        try:
+            for message in messages:
+                email = EmailMessage(message.subject, message.body, settings.DEFAULT_FROM_EMAIL, [message.recipient])
+                try:
+                    connection.send_messages([email])
+                    errors.append(None)
+                except Exception as exc:
+                    logger.warning("Email to %s failed: %s", message.recipient, exc)
+                    errors.append(str(exc))
+        finally:
+            connection.close()
+        return errors
+
+
+class SMSBackend(BaseBackend):
+    """ارسال پیامک متنی با کلاینت مشترک کاوهنگار"""
+
+    def send_messages(self, messages):
+        client = get_kavenegar_client()
+        errors = []
+        for message in messages:
+            try:
+                client.send_sms(message.recipient, message.body)
+                errors.append(None)
+            except CircuitOpenError:
+                errors.append("Kavenegar circuit is open")
+            except requests.RequestException as exc:
+                logger.warning("SMS to %s failed: %s", message.recipient, exc)
+                errors.append(str(exc))
+        return errors
+
+
+# پیام‌هایی که ارسال‌کننده‌ی محلی «ارسال» کرده است (برای تست و محیط توسعه)
+sent_messages = []
+
+class LocalBackend(BaseBackend):
+    """ارسال‌کننده‌ی جایگزین که پیام‌ها را فقط لاگ می‌کند و در sent_messages نگه می‌دارد"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            logger.info("[%s] %s: %s\n%s", message.channel, message.recipient, message.subject, message.body)
+            sent_messages.append({
+                'channel': message.channel,
+                'recipient': message.recipient,
+                'subject': message.subject,
+                'body': message.body,
+                'sent_at': datetime.now(),
+            })
+        return [None] * len(messages)
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from NOTIFICATION.services.outbox import get_outbox_worker
+
+
+class Command(BaseCommand):
+    help = "ارسال پیام‌های آماده‌ی صف اطلاع‌رسانی (ایمیل و پیامک)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="اجرای مداوم با این فاصله (ثانیه) وقتی صف خالی است؛ 0 یعنی یک بار خالی کردن صف (مناسب cron)"
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        worker = get_outbox_worker()
+        while True:
+            sent, failed = worker.drain()
+            if sent or failed:
+                self.stdout.write(self.style.SUCCESS(f"ارسال شد: {sent}، ناموفق: {failed}"))
+            if not interval:
+                return
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('email', 'ایمیل'), ('sms', 'پیامک')], max_length=10, verbose_name='کانال')),
+                ('recipient', models.CharField(max_length=254, verbose_name='گیرنده')),
+                ('subject', models.CharField(blank=True, max_length=255, verbose_name='موضوع')),
+                ('body', models.TextField(verbose_name='متن')),
+                ('dedup_key', models.CharField(blank=True, max_length=200, null=True, unique=True, verbose_name='کلید یکتایی')),
+                ('status', models.CharField(choices=[('pending', 'در انتظار ارسال'), ('sending', 'در حال ارسال'), ('sent', 'ارسال شده'), ('failed', 'ناموفق')], default='pending', max_length=10, verbose_name='وضعیت')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='تعداد تلاش')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='زمان ارسال')),
+                ('last_error', models.TextField(blank=True, verbose_name='آخرین خطا')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='تاریخ ارسال')),
+            ],
+            options={
+                'verbose_name': 'پیام صف ارسال',
+                'verbose_name_plural': 'پیام\u200cهای صف ارسال',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='notification_outbox_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('NOTIFICATION', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=200, null=True, verbose_name='کلید گروه'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(fields=['group_key', 'status'], name='notification_outbox_group_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxMessage(models.Model):
+    """
+    پیام اطلاع‌رسانی در صف ارسال (الگوی transactional outbox)
+
+    ردیف در همان تراکنشِ تغییر اصلی (ثبت‌نام، تیکت، پرداخت) نوشته می‌شود و دستور
+    drain_outbox آن را در پس‌زمینه ارسال می‌کند؛ پس تأخیر SMTP یا سرویس پیامک
+    هیچ‌وقت داخل درخواست کاربر نیست و با rollback تراکنش، پیام هم از بین می‌رود.
+    """
+    class Channel(models.TextChoices):
+        EMAIL = 'email', _('ایمیل')
+        SMS = 'sms', _('پیامک')
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('در انتظار ارسال')
+        SENDING = 'sending', _('در حال ارسال')
+        SENT = 'sent', _('ارسال شده')
+        FAILED = 'failed', _('ناموفق')
+
+    channel = models.CharField(_('کانال'), max_length=10, choices=Channel.choices)
+    recipient = models.CharField(_('گیرنده'), max_length=254)
+    subject = models.CharField(_('موضوع'), max_length=255, blank=True)
+    body = models.TextField(_('متن'))
+    # پیام‌های با کلید یکسان فقط یک بار ثبت می‌شوند (مثلاً دو بار پردازش یک رویداد)
+    dedup_key = models.CharField(_('کلید یکتایی'), max_length=200, null=True, blank=True, unique=True)
+    # تا وقتی پیامی از یک گروه در انتظار ارسال است پیام دیگری برای همان گروه ثبت نمی‌شود
+    # (خلاصه‌ی چند رویداد پشت‌سرهم، مثلاً چند پاسخ به یک تیکت)
+    group_key = models.CharField(_('کلید گروه'), max_length=200, null=True, blank=True)
+    status = models.CharField(_('وضعیت'), max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(_('تعداد تلاش'), default=0)
+    # زمان تلاش بعدی؛ برای پیام‌های در حال ارسال پایان مهلت کارگر است
+    available_at = models.DateTimeField(_('زمان ارسال'), default=timezone.now)
+    last_error = models.TextField(_('آخرین خطا'), blank=True)
+    created_at = models.DateTimeField(_('تاریخ ایجاد'), auto_now_add=True)
+    sent_at = models.DateTimeField(_('تاریخ ارسال'), null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_channel_display()} به {self.recipient} ({self.get_status_display()})"
+
+    class Meta:
+        verbose_name = _('پیام صف ارسال')
+        verbose_name_plural = _('پیام‌های صف ارسال')
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='notification_outbox_due_idx'),
+            models.Index(fields=['group_key', 'status'], name='notification_outbox_group_idx'),
+        ]
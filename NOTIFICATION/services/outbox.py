@@ -0,0 +1,175 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+Channel = OutboxMessage.Channel
+Status = OutboxMessage.Status
+
+
+def email(recipient, subject, body, dedup_key=None):
+    return OutboxMessage(channel=Channel.EMAIL, recipient=recipient, subject=subject, body=body, dedup_key=dedup_key)
+
+
+def sms(recipient, body, dedup_key=None):
+    return OutboxMessage(channel=Channel.SMS, recipient=recipient, body=body, dedup_key=dedup_key)
+
+
+def digest(message, group_key, window):
+    """
+    پیام گروهی: با window ثانیه تأخیر ارسال می‌شود و رویدادهای همان گروه در این فاصله
+    پیام جدیدی نمی‌سازند، پس چند رویداد پشت‌سرهم با یک پیام اطلاع داده می‌شوند.
+    """
+    message.group_key = group_key
+    message.available_at = timezone.now() + timedelta(seconds=window)
+    return message
+
+
+def enqueue(messages, using=DEFAULT_DB_ALIAS):
+    """
+    ثبت پیام‌ها در صف ارسال با یک INSERT
+
+    باید داخل تراکنشِ تغییری که پیام را ایجاد کرده فراخوانی شود. پیام‌هایی که کلید
+    یکتایی‌شان قبلاً ثبت شده یا پیامی از گروهشان هنوز در انتظار ارسال است نادیده گرفته می‌شوند.
+    """
+    messages = [message for message in messages if message.recipient]
+    group_keys = {message.group_key for message in messages if message.group_key}
+    if group_keys:
+        waiting = set(OutboxMessage.objects.using(using).filter(
+            group_key__in=group_keys, status=Status.PENDING
+        ).values_list('group_key', flat=True))
+        messages = [message for message in messages if message.group_key not in waiting]
+    if messages:
+        OutboxMessage.objects.using(using).bulk_create(messages, ignore_conflicts=True)
+    return len(messages)
+
+
+class OutboxWorker:
+    """
+    ارسال پیام‌های صف در دسته‌ها با چند نخ
+
+    هر دسته با SELECT ... FOR UPDATE SKIP LOCKED برداشته و با یک UPDATE به وضعیت
+    «در حال ارسال» با مهلت lease برده می‌شود؛ پس چند پردازه‌ی drain_outbox می‌توانند
+    همزمان کار کنند و اگر کارگری وسط ارسال از کار بیفتد، پس از پایان مهلت پیام دوباره
+    برداشته می‌شود. پیام‌های هر کانال در تکه‌هایی بین نخ‌ها پخش می‌شوند و خطاها با
+    تأخیر افزایشی تا max_attempts بار دوباره تلاش می‌شوند.
+    """
+
+    def __init__(self, backends, workers=4, batch_size=100, max_attempts=5, retry_backoff=30, lease=300):
+        self.backends = backends
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease = lease
+
+    def claim(self, using=DEFAULT_DB_ALIAS):
+        now = timezone.now()
+        with transaction.atomic(using=using):
+            ids = list(
+                OutboxMessage.objects.using(using).select_for_update(skip_locked=True).filter(
+                    status__in=[Status.PENDING, Status.SENDING], available_at__lte=now
+                ).order_by('available_at', 'pk').values_list('pk', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                return []
+            OutboxMessage.objects.using(using).filter(pk__in=ids).update(
+                status=Status.SENDING, available_at=now + timedelta(seconds=self.lease),
+                attempts=F('attempts') + 1
+            )
+        return list(OutboxMessage.objects.using(using).filter(pk__in=ids).order_by('pk'))
+
+    def drain_once(self, using=DEFAULT_DB_ALIAS):
+        """ارسال یک دسته؛ خروجی: (تعداد موفق، تعداد ناموفق)"""
+        messages = self.claim(using)
+        if not messages:
+            return 0, 0
+
+        chunks = []
+        for channel in {message.channel for message in messages}:
+            channel_messages = [message for message in messages if message.channel == channel]
+            size = -(-len(channel_messages) // max(self.workers, 1))
+            chunks.extend(channel_messages[start:start + size] for start in range(0, len(channel_messages), size))
+
+        if self.workers == 0:
+            results = [self._send(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='outbox') as executor:
+                results = list(executor.map(self._send, chunks))
+
+        sent, failed = [], []
+        for chunk, errors in zip(chunks, results):
+            for message, error in zip(chunk, errors):
+                (failed if error else sent).append((message, error))
+        self._record(sent, failed, using)
+        return len(sent), len(failed)
+
+    def drain(self, using=DEFAULT_DB_ALIAS):
+        """ارسال دسته‌ها تا خالی شدن پیام‌های آماده"""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = self.drain_once(using)
+            if not sent and not failed:
+                return total_sent, total_failed
+            total_sent += sent
+            total_failed += failed
+
+    def _send(self, chunk):
+        backend = self.backends.get(chunk[0].channel)
+        try:
+            if backend is None:
+                return [f"No backend for channel {chunk[0].channel}"] * len(chunk)
+            return backend.send_messages(chunk)
+        except Exception as exc:
+            logger.exception("Notification backend for %s raised", chunk[0].channel)
+            return [str(exc)] * len(chunk)
+        finally:
+            close_old_connections()
+
+    def _record(self, sent, failed, using):
+        now = timezone.now()
+        with transaction.atomic(using=using):
+            if sent:
+                OutboxMessage.objects.using(using).filter(pk__in=[message.pk for message, _ in sent]).update(
+                    status=Status.SENT, sent_at=now, last_error=''
+                )
+            for message, error in failed:
+                if message.attempts >= self.max_attempts:
+                    changes = {'status': Status.FAILED}
+                else:
+                    # تأخیر افزایشی: 30، 60، 120 ثانیه و ...
+                    delay = self.retry_backoff * (2 ** (message.attempts - 1))
+                    changes = {'status': Status.PENDING, 'available_at': now + timedelta(seconds=delay)}
+                OutboxMessage.objects.using(using).filter(pk=message.pk).update(last_error=error, **changes)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_outbox_worker():
+    """کارگر مشترک پردازه که بر اساس تنظیمات ساخته می‌شود"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = OutboxWorker(
+                    backends={
+                        channel: import_string(path)() for channel, path in settings.NOTIFICATION_BACKENDS.items()
+                    },
+                    workers=settings.NOTIFICATION_WORKERS,
+                    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+                    max_attempts=settings.NOTIFICATION_MAX_ATTEMPTS,
+                    retry_backoff=settings.NOTIFICATION_RETRY_BACKOFF,
+                    lease=settings.NOTIFICATION_LEASE,
+                )
+    return _worker
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from BOOTCAMP.models import BootcampRegistration
+from BOOTCAMP.signals import registration_status_changed
+from PAYMENT.models import Transaction
+
+from .services import outbox
+
+Status = BootcampRegistration.Status
+
+REGISTRATION_MESSAGES = {
+    Status.PENDING: "یک صندلی در بوتکمپ «{title}» آزاد شد و ثبت‌نام شما از لیست انتظار خارج شد.",
+    Status.REVIEWING: "ثبت‌نام شما در بوتکمپ «{title}» در حال بررسی است.",
+    Status.APPROVED: "ثبت‌نام شما در بوتکمپ «{title}» تایید شد.",
+    Status.REJECTED: "ثبت‌نام شما در بوتکمپ «{title}» تایید نشد.",
+}
+
+
+@receiver(registration_status_changed)
+def notify_registration_status(sender, status, registration_ids, using, **kwargs):
+    template = REGISTRATION_MESSAGES.get(status)
+    if template is None:
+        return
+    rows = BootcampRegistration.objects.using(using).filter(pk__in=registration_ids).values_list(
+        'pk', 'updated_at', 'user__phone', 'bootcamp__title'
+    )
+    outbox.enqueue([
+        outbox.sms(
+            phone, template.format(title=title),
+            # پردازش دوباره‌ی همین تغییر پیام تکراری نمی‌سازد ولی تغییر بعدی همان وضعیت پیام جدید دارد
+            dedup_key=f"bootcamp-registration:{pk}:{status}:{updated_at.timestamp()}"
+        )
+        for pk, updated_at, phone, title in rows
+    ], using=using)
+
+
+@receiver(post_save, sender=Transaction)
+def notify_payment(sender, instance, created, using, **kwargs):
+    if not created or instance.transaction_type != 'payment':
+        return
+    phone = get_user_model().objects.using(using).filter(pk=instance.user_id).values_list('phone', flat=True).first()
+    outbox.enqueue([
+        outbox.sms(
+            phone, f"پرداخت فاکتور #{instance.invoice_id} به مبلغ {instance.amount:,} تومان ثبت شد.",
+            dedup_key=f"payment-transaction:{instance.pk}"
+        )
+    ], using=using)
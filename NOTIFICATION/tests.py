@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from BOOTCAMP.models import Bootcamp, BootcampCategory, BootcampRegistration
+from BOOTCAMP.services import registration
+from PAYMENT.models import Invoice, Transaction
+from TICKET.models import Ticket
+from USER.models import User
+
+from . import backends
+from .models import OutboxMessage
+from .services import outbox
+from .services.outbox import OutboxWorker
+
+
+class FailingBackend(backends.BaseBackend):
+    def send_messages(self, messages):
+        return ["connection refused"] * len(messages)
+
+
+class OutboxWorkerTests(TestCase):
+    """برداشتن دسته‌ها، ارسال با نخ‌ها، تلاش دوباره و حذف پیام‌های تکراری"""
+
+    def setUp(self):
+        backends.sent_messages.clear()
+        self.local = backends.LocalBackend()
+
+    def test_duplicate_keys_are_enqueued_once(self):
+        outbox.enqueue([outbox.sms('09120000000', "متن", dedup_key='event:1')])
+        outbox.enqueue([outbox.sms('09120000000', "متن", dedup_key='event:1')])
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_drain_sends_all_batches_with_threads(self):
+        outbox.enqueue(
+            [outbox.sms(f"0912{index:07d}", "متن") for index in range(25)]
+            + [outbox.email('support@example.com', "موضوع", "متن") for _ in range(5)]
+        )
+        worker = OutboxWorker({'sms': self.local, 'email': self.local}, workers=3, batch_size=10)
+
+        self.assertEqual(worker.drain(), (30, 0))
+        self.assertEqual(len(backends.sent_messages), 30)
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.Status.SENT).exists())
+
+    def test_failures_are_retried_with_backoff_then_marked_failed(self):
+        outbox.enqueue([outbox.sms('09120000000', "متن")])
+        worker = OutboxWorker({'sms': FailingBackend()}, workers=0, max_attempts=2, retry_backoff=60)
+
+        self.assertEqual(worker.drain(), (0, 1))
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.Status.PENDING, 1))
+        self.assertGreater(message.available_at, timezone.now() + timedelta(seconds=50))
+
+        OutboxMessage.objects.update(available_at=timezone.now())
+        worker.drain()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.last_error), (OutboxMessage.Status.FAILED, "connection refused"))
+
+    def test_expired_lease_is_reclaimed(self):
+        outbox.enqueue([outbox.sms('09120000000', "متن")])
+        OutboxMessage.objects.update(status=OutboxMessage.Status.SENDING, available_at=timezone.now())
+        worker = OutboxWorker({'sms': self.local}, workers=0)
+        self.assertEqual(worker.drain(), (1, 0))
+
+
+class DomainEventTests(TestCase):
+    """رویدادهای بوتکمپ، تیکت و پرداخت فقط پیام صف می‌سازند و چیزی همزمان ارسال نمی‌کنند"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            phone='09120000001', password='password', first_name='a', last_name='b',
+            national_id='0000000001', gender='male'
+        )
+        cls.support = User.objects.create_support_user(
+            phone='09120000002', password='password', first_name='c', last_name='d',
+            national_id='0000000002', gender='male'
+        )
+
+    def test_registration_review_enqueues_sms(self):
+        bootcamp = Bootcamp.objects.create(
+            title="جنگو", category=BootcampCategory.objects.create(name="وب"), start_date=date(2030, 1, 1),
+            end_date=date(2030, 2, 1), schedule_days="شنبه", schedule_time="۱۸", capacity=5,
+            status=Bootcamp.Status.REGISTRATION
+        )
+        item = registration.register(self.user, bootcamp)
+        registration.change_status(item, BootcampRegistration.Status.APPROVED)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.channel, message.recipient), (OutboxMessage.Channel.SMS, self.user.phone))
+        self.assertIn("تایید شد", message.body)
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+    def test_ticket_events_enqueue_instead_of_sending(self):
+        from django.core import mail
+
+        ticket = Ticket.objects.create(user=self.user, subject="مشکل پرداخت")
+        ticket.messages.create(sender=self.support, content="بررسی شد")
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            sorted(OutboxMessage.objects.values_list('channel', 'recipient')),
+            [('email', 'support@yourdomain.com'), ('sms', self.user.phone)]
+        )
+
+    def test_payment_enqueues_sms(self):
+        invoice = Invoice.objects.create(user=self.user, amount=150000, title="شهریه")
+        Transaction.objects.create(user=self.user, invoice=invoice, amount=150000, transaction_type='payment')
+        Transaction.objects.create(user=self.user, amount=50000, transaction_type='charge')
+
+        message = OutboxMessage.objects.get()
+        self.assertIn("150,000", message.body)
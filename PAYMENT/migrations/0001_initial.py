@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=0, max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('1000'))], verbose_name='مبلغ')),
+                ('title', models.CharField(max_length=100, verbose_name='عنوان فاکتور')),
+                ('description', models.TextField(blank=True, verbose_name='توضیحات')),
+                ('status', models.CharField(choices=[('pending', 'در انتظار پرداخت'), ('paid', 'پرداخت شده'), ('failed', 'پرداخت ناموفق'), ('canceled', 'لغو شده')], default='pending', max_length=10, verbose_name='وضعیت')),
+                ('payment_method', models.CharField(blank=True, choices=[('online', 'پرداخت آنلاین'), ('offline', 'پرداخت آفلاین'), ('wallet', 'کیف پول')], max_length=15, null=True, verbose_name='روش پرداخت')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')),
+                ('payment_gateway', models.CharField(blank=True, max_length=50, verbose_name='درگاه پرداخت')),
+                ('payment_tracking_code', models.CharField(blank=True, max_length=100, verbose_name='کد پیگیری پرداخت')),
+                ('offline_receipt_image', models.ImageField(blank=True, null=True, upload_to='finance/receipts/', verbose_name='تصویر رسید پرداخت')),
+                ('offline_receipt_code', models.CharField(blank=True, max_length=100, verbose_name='کد پیگیری پرداخت آفلاین')),
+                ('offline_payment_date', models.DateField(blank=True, null=True, verbose_name='تاریخ پرداخت آفلاین')),
+            ],
+            options={
+                'verbose_name': 'فاکتور',
+                'verbose_name_plural': 'فاکتورها',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Transaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=0, max_digits=12, verbose_name='مبلغ')),
+                ('transaction_type', models.CharField(choices=[('payment', 'پرداخت'), ('charge', 'شارژ کیف پول'), ('refund', 'عودت وجه')], max_length=20, verbose_name='نوع تراکنش')),
+                ('description', models.TextField(blank=True, verbose_name='توضیحات')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ تراکنش')),
+            ],
+            options={
+                'verbose_name': 'تراکنش',
+                'verbose_name_plural': 'تراکنش\u200cها',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
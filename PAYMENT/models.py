@@ -4,9 +4,11 @@ from django.conf import settings
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from finalkelasor.images import ImageVariantsMixin
+
 User = settings.AUTH_USER_MODEL
 
-class Invoice(models.Model):
+class Invoice(ImageVariantsMixin, models.Model):
     """
     مدل فاکتور با تمام ویژگی‌های درخواستی
     """
@@ -69,6 +71,7 @@ class Invoice(models.Model):
         null=True,
         blank=True
     )
+    offline_receipt_variants = models.JSONField(_('نسخه‌های تصویر رسید'), default=dict, blank=True, editable=False)
     offline_receipt_code = models.CharField(_('کد پیگیری پرداخت آفلاین'), max_length=100, blank=True)
     offline_payment_date = models.DateField(_('تاریخ پرداخت آفلاین'), null=True, blank=True)
 
@@ -76,6 +79,12 @@ class Invoice(models.Model):
         verbose_name = _('فاکتور')
         verbose_name_plural = _('فاکتورها')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='payment_invoice_user_idx'),
+            models.Index(fields=['status'], name='payment_invoice_status_idx'),
+        ]
+
+    image_variant_fields = {'offline_receipt_image': 'offline_receipt_variants'}
 
     def __str__(self):
         return f"فاکتور #{self.id} - {self.user} - {self.amount} تومان"
@@ -126,6 +135,10 @@ class Transaction(models.Model):
         verbose_name = _('تراکنش')
         verbose_name_plural = _('تراکنش‌ها')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'transaction_type', '-created_at'], name='payment_tx_user_type_idx'),
+            models.Index(fields=['user', '-created_at'], name='payment_tx_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_transaction_type_display()} - {self.amount} تومان"
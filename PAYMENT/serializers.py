@@ -2,6 +2,8 @@ from rest_framework import serializers
 from .models import Invoice, Transaction
 from django.contrib.auth import get_user_model
 
+from finalkelasor.images import ImageVariantsField
+
 User = get_user_model()
 
 class UserMiniSerializer(serializers.ModelSerializer):
@@ -13,12 +15,13 @@ class InvoiceListSerializer(serializers.ModelSerializer):
     user = UserMiniSerializer()
     status_display = serializers.CharField(source='get_status_display')
     payment_type = serializers.SerializerMethodField()
+    offline_receipt_variants = ImageVariantsField('offline_receipt_image')
 
     class Meta:
         model = Invoice
         fields = [
             'id', 'user', 'title', 'amount', 'status', 
-            'status_display', 'payment_type', 'created_at'
+            'status_display', 'payment_type', 'offline_receipt_variants', 'created_at'
         ]
 
     def get_payment_type(self, obj):
@@ -29,6 +32,7 @@ class InvoiceDetailSerializer(serializers.ModelSerializer):
     created_by = UserMiniSerializer()
     status_display = serializers.CharField(source='get_status_display')
     payment_type = serializers.SerializerMethodField()
+    offline_receipt_variants = ImageVariantsField('offline_receipt_image')
 
     class Meta:
         model = Invoice
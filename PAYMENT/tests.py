@@ -1,3 +1,22 @@
 from django.test import TestCase
 
-# Create your tests here.
+from finalkelasor.testing import QueryPlanAssertionsMixin
+
+from .models import Invoice, Transaction
+
+
+class IndexUsageTests(QueryPlanAssertionsMixin, TestCase):
+    """کوئری‌های اصلی فهرست فاکتورها و تراکنش‌ها باید از ایندکس‌های Meta.indexes استفاده کنند"""
+
+    def test_user_invoices_use_user_index(self):
+        self.assertUsesIndex(Invoice.objects.filter(user_id=1), 'payment_invoice_user_idx')
+
+    def test_invoice_status_filter_uses_status_index(self):
+        self.assertUsesIndex(Invoice.objects.filter(status=Invoice.Status.PAID), 'payment_invoice_status_idx')
+
+    def test_user_transactions_use_user_index(self):
+        self.assertUsesIndex(Transaction.objects.filter(user_id=1), 'payment_tx_user_created_idx')
+
+    def test_transaction_summary_uses_type_index(self):
+        queryset = Transaction.objects.filter(user_id=1, transaction_type='payment')
+        self.assertUsesIndex(queryset, 'payment_tx_user_type_idx')
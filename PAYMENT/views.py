@@ -1,6 +1,6 @@
 from django.shortcuts import render
 
-from django.db import models
+from django.db import models, transaction
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -48,7 +48,9 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         else:
             serializer.save(user=self.request.user, created_by=self.request.user)
 
+    # فاکتور، تراکنش و پیام اطلاع‌رسانی پرداخت با هم ثبت می‌شوند
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @transaction.atomic
     def pay_online(self, request, pk=None):
         """پرداخت آنلاین فاکتور"""
         invoice = self.get_object()
@@ -88,6 +90,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @transaction.atomic
     def offline_payment(self, request, pk=None):
         """ثبت پرداخت آفلاین"""
         invoice = self.get_object()
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('BOOTCAMP', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('attachment', models.FileField(blank=True, null=True, upload_to='ticket_attachments/%Y/%m/%d/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('is_from_support', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Ticket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=200)),
+                ('status', models.CharField(choices=[('under_review', 'درحال بررسی'), ('answered', 'پاسخ داده شده'), ('unanswered', 'پاسخ داده نشده'), ('closed', 'بسته شده')], default='under_review', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bootcamp', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='BOOTCAMP.bootcamp')),
+            ],
+        ),
+    ]
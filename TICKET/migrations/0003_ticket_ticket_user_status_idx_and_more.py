@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BOOTCAMP', '0004_bootcamp_bootcamp_status_idx'),
+        ('TICKET', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'status'], name='ticket_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketmessage',
+            index=models.Index(fields=['ticket', 'created_at'], name='ticket_message_ticket_idx'),
+        ),
+    ]
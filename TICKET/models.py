@@ -1,7 +1,6 @@
-from django.db import models
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 
 class Ticket(models.Model):
     STATUS_CHOICES = [
@@ -12,12 +11,12 @@ class Ticket(models.Model):
     ]
     
     user = models.ForeignKey(
-        'User', 
+        settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE,
         related_name='tickets'
     )
     bootcamp = models.ForeignKey(
-        'bootcamp.Bootcamp',
+        'BOOTCAMP.Bootcamp',
         on_delete=models.SET_NULL,
         null=True,
         blank=True
@@ -31,27 +30,16 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args, **kwargs):
-        is_new = not self.pk
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            self._notify_support_team()
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'status'], name='ticket_user_status_idx'),
+        ]
 
-    def _notify_support_team(self):
-        subject = f"تیکت جدید #{self.id}: {self.subject}"
-        message = render_to_string('tickets/email/new_ticket_notification.txt', {
-            'ticket': self,
-            'user': self.user
-        })
-        
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [settings.SUPPORT_EMAIL],
-            fail_silently=False,
-        )
+    def save(self, *args, **kwargs):
+        # پیام اطلاع‌رسانی در گیرنده‌ی post_save (TICKET.signals) در صف نوشته می‌شود؛ تیکت و
+        # پیام صف باید با هم ثبت یا با هم برگردانده شوند
+        with transaction.atomic(using=kwargs.get('using') or self._state.db):
+            super().save(*args, **kwargs)
 
 class TicketMessage(models.Model):
     ticket = models.ForeignKey(
@@ -60,7 +48,7 @@ class TicketMessage(models.Model):
         related_name='messages'
     )
     sender = models.ForeignKey(
-        'User',
+        settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
     content = models.TextField()
@@ -72,30 +60,21 @@ class TicketMessage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_from_support = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['ticket', 'created_at'], name='ticket_message_ticket_idx'),
+        ]
+
     def save(self, *args, **kwargs):
+        is_new = self._state.adding
         self.is_from_support = self.sender.is_support
-        super().save(*args, **kwargs)
-        
-        if not self.is_from_support:
-            self._update_ticket_status()
-        else:
-            self._notify_user_reply()
+        with transaction.atomic(using=kwargs.get('using') or self._state.db):
+            super().save(*args, **kwargs)
+            if is_new:
+                self._update_ticket_status()
 
     def _update_ticket_status(self):
-        self.ticket.status = 'unanswered'
-        self.ticket.save()
-
-    def _notify_user_reply(self):
-        subject = f"پاسخ به تیکت #{self.ticket.id}"
-        message = render_to_string('tickets/email/support_reply_notification.txt', {
-            'ticket': self.ticket,
-            'message': self
-        })
-        
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [self.ticket.user.email],
-            fail_silently=False,
-        )
\ No newline at end of file
+        # فقط ستون وضعیت؛ ذخیره‌ی دوباره‌ی کل تیکت لازم نیست
+        Ticket.objects.using(self._state.db).filter(pk=self.ticket_id).update(
+            status='answered' if self.is_from_support else 'unanswered', updated_at=timezone.now()
+        )
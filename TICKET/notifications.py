@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from NOTIFICATION.services import outbox
+
+
+def ticket_created(ticket, using):
+    """ایمیل تیکت جدید به تیم پشتیبانی؛ ایمیل‌های صف در هر دسته با یک اتصال SMTP ارسال می‌شوند"""
+    subject = f"تیکت جدید #{ticket.id}: {ticket.subject}"
+    message = render_to_string('tickets/email/new_ticket_notification.txt', {
+        'ticket': ticket,
+        'user': ticket.user,
+        'site_url': settings.SITE_URL,
+    })
+    outbox.enqueue([
+        outbox.email(settings.SUPPORT_EMAIL, subject, message, dedup_key=f"ticket-created:{ticket.id}")
+    ], using=using)
+
+
+def support_replied(message, using):
+    """
+    اطلاع پاسخ پشتیبانی به صاحب تیکت
+
+    کاربران ایمیل ندارند، پس اطلاع‌رسانی با پیامک است. پاسخ‌های پشت‌سرهم به یک تیکت
+    در بازه‌ی TICKET_REPLY_DIGEST_WINDOW با یک پیامک خلاصه اطلاع داده می‌شوند.
+    """
+    ticket = message.ticket
+    text = f"پشتیبانی به تیکت #{ticket.id} («{ticket.subject}») پاسخ داد؛ پاسخ‌ها را در پنل کاربری ببینید."
+    outbox.enqueue([
+        outbox.digest(
+            outbox.sms(ticket.user.phone, text),
+            group_key=f"ticket-replies:{ticket.id}", window=settings.TICKET_REPLY_DIGEST_WINDOW
+        )
+    ], using=using)
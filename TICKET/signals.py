@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import notifications
+from .models import Ticket, TicketMessage
+
+
+# پیام‌ها در همان تراکنش در صف NOTIFICATION نوشته می‌شوند و فقط پس از commit ارسال می‌شوند؛
+# کندی یا خطای SMTP دیگر روی ذخیره‌ی تیکت اثری ندارد
+@receiver(post_save, sender=Ticket)
+def notify_support_team(sender, instance, created, using, **kwargs):
+    if created:
+        notifications.ticket_created(instance, using)
+
+
+@receiver(post_save, sender=TicketMessage)
+def notify_user_reply(sender, instance, created, using, **kwargs):
+    if created and instance.is_from_support:
+        notifications.support_replied(instance, using)
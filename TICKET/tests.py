@@ -1,3 +1,119 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from finalkelasor.testing import QueryPlanAssertionsMixin
+from NOTIFICATION.models import OutboxMessage
+from USER.models import User
+
+from .models import Ticket, TicketMessage
+from .views import TicketViewSet
+
+
+class IndexUsageTests(QueryPlanAssertionsMixin, TestCase):
+    """کوئری‌های اصلی فهرست تیکت‌ها و پیام‌ها باید از ایندکس‌های Meta.indexes استفاده کنند"""
+
+    def test_user_tickets_use_user_status_index(self):
+        self.assertUsesIndex(Ticket.objects.filter(user_id=1, status='unanswered'), 'ticket_user_status_idx')
+
+    def test_ticket_messages_use_ticket_index(self):
+        queryset = TicketMessage.objects.filter(ticket_id=1).order_by('created_at')
+        self.assertUsesIndex(queryset, 'ticket_message_ticket_idx')
+
+
+@override_settings(QUERY_BUDGET_ENFORCE=True)
+class QueryBudgetTests(TestCase):
+    """فهرست تیکت‌ها با هر تعداد تیکت و پیام باید در بودجه‌ی کوئری TicketViewSet بماند"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            phone='09120000001', password='password', first_name='a', last_name='b',
+            national_id='0000000001', gender='male'
+        )
+        cls.support = User.objects.create_support_user(
+            phone='09120000002', password='password', first_name='c', last_name='d',
+            national_id='0000000002', gender='male'
+        )
+        # bulk_create تا ایمیل‌های اطلاع‌رسانی save ارسال نشوند
+        tickets = Ticket.objects.bulk_create(
+            Ticket(user=cls.user, subject=f"تیکت {index}") for index in range(10)
+        )
+        TicketMessage.objects.bulk_create(
+            TicketMessage(ticket=ticket, sender=sender, content="متن")
+            for ticket in tickets for sender in (cls.user, cls.support)
+        )
+
+    def test_list_within_budget(self):
+        view = TicketViewSet.as_view({'get': 'list'})
+        for user in (self.user, self.support):
+            request = APIRequestFactory().get('/TICKET/tickets/')
+            force_authenticate(request, user=user)
+            response = view(request)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data), 10)
+            self.assertEqual(len(response.data[0]['messages']), 2)
+
+
+class TicketNotificationTests(TestCase):
+    """اطلاع‌رسانی تیکت‌ها از طریق صف NOTIFICATION و خلاصه شدن پاسخ‌های پشت‌سرهم"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            phone='09120000001', password='password', first_name='a', last_name='b',
+            national_id='0000000001', gender='male'
+        )
+        cls.support = User.objects.create_support_user(
+            phone='09120000002', password='password', first_name='c', last_name='d',
+            national_id='0000000002', gender='male'
+        )
+
+    def test_new_ticket_email_is_rendered_into_outbox(self):
+        ticket = Ticket.objects.create(user=self.user, subject="مشکل ورود")
+        message = OutboxMessage.objects.get(channel=OutboxMessage.Channel.EMAIL)
+        self.assertEqual(message.recipient, settings.SUPPORT_EMAIL)
+        self.assertIn("مشکل ورود", message.body)
+        self.assertIn(f"/admin/TICKET/ticket/{ticket.id}/change/", message.body)
+
+    def test_failed_enqueue_leaves_no_ticket_or_message(self):
+        ticket = Ticket.objects.create(user=self.user, subject="مشکل ورود")
+        with mock.patch('TICKET.notifications.outbox.enqueue', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                Ticket.objects.create(user=self.user, subject="مشکل پرداخت")
+            with self.assertRaises(DatabaseError):
+                TicketMessage.objects.create(ticket=ticket, sender=self.support, content="پاسخ")
+
+        self.assertEqual(list(Ticket.objects.values_list('subject', flat=True)), ["مشکل ورود"])
+        self.assertFalse(TicketMessage.objects.exists())
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, 'under_review')
+
+    def test_consecutive_replies_are_coalesced(self):
+        ticket = Ticket.objects.create(user=self.user, subject="مشکل ورود")
+        for content in ("پاسخ اول", "پاسخ دوم", "پاسخ سوم"):
+            TicketMessage.objects.create(ticket=ticket, sender=self.support, content=content)
+
+        replies = OutboxMessage.objects.filter(channel=OutboxMessage.Channel.SMS)
+        self.assertEqual(replies.count(), 1)
+        self.assertGreater(replies.get().available_at, timezone.now())
+
+        # پس از ارسال خلاصه، پاسخ بعدی پیام تازه‌ای می‌سازد
+        replies.update(status=OutboxMessage.Status.SENT)
+        TicketMessage.objects.create(ticket=ticket, sender=self.support, content="پاسخ چهارم")
+        self.assertEqual(replies.count(), 2)
+
+    def test_message_updates_ticket_status_without_resaving_it(self):
+        ticket = Ticket.objects.create(user=self.user, subject="مشکل ورود")
+        with self.assertNumQueries(4):  # SAVEPOINT/RELEASE، INSERT پیام و UPDATE وضعیت
+            TicketMessage.objects.create(ticket=ticket, sender=self.user, content="سلام")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, 'unanswered')
+
+        TicketMessage.objects.create(ticket=ticket, sender=self.support, content="پاسخ")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, 'answered')
@@ -2,14 +2,17 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.db.models import Prefetch
+from finalkelasor.metrics import QueryBudgetMixin
 from .models import Ticket, TicketMessage
 from .serializers import TicketSerializer, TicketMessageSerializer, CreateTicketSerializer
 from .permissions import IsTicketOwnerOrSupport
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'list': 2, 'retrieve': 2}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -18,9 +21,15 @@ class TicketViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        if user.is_support:
-            return self.queryset
-        return self.queryset.filter(user=user)
+        queryset = self.queryset
+        if not user.is_support:
+            queryset = queryset.filter(user=user)
+        if self.action in ['list', 'retrieve']:
+            # TicketSerializer کاربر، بوتکمپ و پیام‌ها (با فرستنده‌ی هر پیام) را نمایش می‌دهد
+            queryset = queryset.select_related('user', 'bootcamp').prefetch_related(
+                Prefetch('messages', queryset=TicketMessage.objects.select_related('sender').order_by('created_at'))
+            )
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -42,11 +51,8 @@ class TicketMessageViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         ticket = Ticket.objects.get(pk=self.kwargs['ticket_pk'])
         user = self.request.user
-        
-        if user.is_support:
-            ticket.status = 'answered'
-            ticket.save()
-        
+
+        # وضعیت تیکت (پاسخ داده شده / پاسخ داده نشده) در TicketMessage.save به‌روز می‌شود
         serializer.save(
             sender=user,
             ticket=ticket,
@@ -0,0 +1,106 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .services.local_cache import TTLCache
+
+# ادعاهایی که UserRefreshToken در توکن قرار می‌دهد و مستقیماً به فیلدهای کاربر نگاشت می‌شوند
+CLAIM_FIELDS = ('is_staff', 'is_superuser', 'is_support', 'user_type')
+
+# فیلدهایی که تغییرشان روی ادعاهای توکن اثری ندارد
+NON_CLAIM_FIELDS = {'last_login'}
+
+# زمان آخرین تغییر هر کاربر که از کش مشترک خوانده شده است
+_changed_at_cache = TTLCache(maxsize=10000, ttl=settings.JWT_CLAIMS_CACHE_TTL)
+
+
+def _cache():
+    return caches[settings.AUTH_CHANGED_CACHE_ALIAS]
+
+
+def _changed_at_key(user_id):
+    return f"auth:user-changed:{user_id}"
+
+
+def mark_user_changed(*user_ids):
+    """
+    ثبت تغییر کاربران تا توکن‌های صادرشده پیش از این لحظه دیگر به تنهایی معتبر نباشند
+
+    زمان با دقت کسری از ثانیه ذخیره می‌شود ولی iat توکن ثانیه‌ی کامل است؛ پس توکنی
+    که در همان ثانیه‌ی تغییر صادر شده هم (با مقایسه‌ی <=) از پایگاه داده بررسی می‌شود.
+    مقدار تا پایان عمر طولانی‌ترین توکن دسترسی در کش مشترک AUTH_CHANGED_CACHE_ALIAS
+    (بررسی USER.E002) نگه داشته می‌شود تا همه‌ی پردازه‌ها آن را ببینند.
+    """
+    leeway = api_settings.LEEWAY
+    if hasattr(leeway, 'total_seconds'):
+        leeway = leeway.total_seconds()
+    timeout = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds() + leeway + 60
+    changed_at = time.time()
+    _cache().set_many({_changed_at_key(user_id): changed_at for user_id in user_ids}, timeout)
+    for user_id in user_ids:
+        _changed_at_cache.delete(user_id)
+
+
+def _user_changed_at(user_id):
+    changed_at = _changed_at_cache.get(user_id)
+    if changed_at is None:
+        changed_at = _cache().get(_changed_at_key(user_id), 0)
+        _changed_at_cache.set(user_id, changed_at)
+    return changed_at
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    احراز هویت JWT بدون کوئری به جدول کاربر
+
+    کاربر از روی ادعاهای توکن ساخته می‌شود (نمونه‌ی واقعی مدل با فیلدهای
+    تعویق‌افتاده، پس کلید خارجی و فیلدهای دیگر هم در صورت نیاز کار می‌کنند).
+    اگر توکن قدیمی و فاقد این ادعاها باشد یا کاربر پس از صدور توکن (یا در همان
+    ثانیه) تغییر کرده باشد، مانند JWTAuthentication معمولی کاربر از پایگاه داده
+    خوانده می‌شود؛ غیرفعال شدن کاربر هم از همین راه اعمال می‌شود.
+
+    تغییرها با سیگنال‌های USER.signals و UserQuerySet.update ثبت می‌شوند. تغییری که
+    از این دو عبور نکند (bulk_update یا SQL خام) باید خودش mark_user_changed را صدا بزند.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        # شناسه در توکن رشته است؛ با نوع فیلد یکی می‌شود تا کلید کش و user.pk با بقیه‌ی کد بخواند
+        user_id = get_user_model()._meta.get_field(api_settings.USER_ID_FIELD).to_python(user_id)
+
+        if 'user_type' not in validated_token:
+            return super().get_user(validated_token)
+
+        if validated_token.get('iat', 0) <= _user_changed_at(user_id):
+            return super().get_user(validated_token)
+
+        return self.build_user(user_id, validated_token)
+
+    def build_user(self, user_id, validated_token):
+        User = get_user_model()
+        values = {
+            User._meta.get_field(api_settings.USER_ID_FIELD).attname: user_id,
+            # توکن فقط برای کاربر فعال صادر می‌شود و غیرفعال‌سازی بعدی ثبت تغییر است
+            'is_active': True,
+        }
+        for claim in CLAIM_FIELDS:
+            values[claim] = validated_token.get(claim)
+
+        field_names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+        user = User.from_db(
+            router.db_for_read(User),
+            field_names,
+            [values[name] for name in field_names]
+        )
+        # مجموعه‌ی دسترسی‌های پشتیبانی از توکن؛ User.has_support_permission کوئری نمی‌زند
+        user._support_permissions = frozenset(validated_token.get('support_permissions', []))
+        return user
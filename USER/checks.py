@@ -0,0 +1,21 @@
+from django.core.checks import register
+
+from finalkelasor.checks import check_shared_cache
+
+
+@register()
+def check_otp_cache(app_configs, **kwargs):
+    """کدی که یک پردازه‌ی gunicorn صادر کرده باید در پردازه‌های دیگر هم قابل بررسی باشد"""
+    return check_shared_cache('OTP_CACHE_ALIAS', "OTP", 'USER.E001')
+
+
+@register()
+def check_auth_changed_cache(app_configs, **kwargs):
+    """ابطال توکن در یک پردازه (مثلاً غیرفعال شدن کاربر) باید در همه‌ی پردازه‌ها دیده شود"""
+    return check_shared_cache('AUTH_CHANGED_CACHE_ALIAS', "Token revocation", 'USER.E002')
+
+
+@register()
+def check_support_permission_cache(app_configs, **kwargs):
+    """ابطال دسترسی‌های پشتیبان باید به همه‌ی پردازه‌ها برسد، نه فقط پردازه‌ای که آن را ثبت کرده"""
+    return check_shared_cache('SUPPORT_PERMISSION_CACHE_ALIAS', "Support permission", 'USER.E003')
@@ -0,0 +1,72 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from USER.models import User
+from USER.views import LoginView
+
+
+class Command(BaseCommand):
+    help = "اندازه‌گیری تعداد ورود در ثانیه (روی یک هسته) برای LoginView با هشرهای مختلف"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=50,
+            help="تعداد درخواست ورود برای هر هشر"
+        )
+        parser.add_argument(
+            '--policy', action='append', choices=sorted(settings.PASSWORD_HASHERS_BY_POLICY),
+            help="هشر مورد آزمایش (قابل تکرار؛ پیش‌فرض: همه)"
+        )
+
+    def handle(self, *args, **options):
+        policies = options['policy'] or sorted(settings.PASSWORD_HASHERS_BY_POLICY)
+        view = LoginView.as_view()
+        factory = APIRequestFactory()
+
+        for policy in policies:
+            hasher = settings.PASSWORD_HASHERS_BY_POLICY[policy]
+            with override_settings(PASSWORD_HASHERS=[hasher]):
+                try:
+                    elapsed = self._run(view, factory, options['requests'])
+                except ValueError as e:
+                    # کتابخانه‌ی اختیاری هشر (argon2-cffi یا bcrypt) نصب نیست
+                    self.stdout.write(self.style.WARNING(f"{policy}: {e}"))
+                    continue
+
+            per_login = elapsed / options['requests']
+            self.stdout.write(
+                f"{policy:8} {options['requests']} ورود در {elapsed:.2f} ثانیه — "
+                f"{per_login * 1000:.1f} میلی‌ثانیه برای هر ورود، "
+                f"{1 / per_login:.1f} ورود در ثانیه روی هر هسته"
+            )
+
+    def _run(self, view, factory, count):
+        phone, password = '09000000000', 'benchmark-password'
+
+        # کاربر آزمایشی فقط داخل تراکنشی ساخته می‌شود که در پایان برگردانده می‌شود
+        with transaction.atomic():
+            User.objects.create_user(
+                phone=phone,
+                password=password,
+                first_name='benchmark',
+                last_name='user',
+                national_id='0000000000',
+                gender='male'
+            )
+            request_data = {'phone': phone, 'password': password}
+
+            started = time.perf_counter()
+            for _ in range(count):
+                response = view(factory.post('/USER/login/', request_data, format='json'))
+                if response.status_code != 200:
+                    raise RuntimeError(f"Login failed during benchmark: {response.data}")
+            elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        return elapsed
@@ -0,0 +1,52 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from USER.models import User
+
+
+class Command(BaseCommand):
+    help = "ثبت گروهی کاربران از فایل CSV با ستون‌های phone, first_name, last_name, national_id, gender, password"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="مسیر فایل CSV")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="تعداد کاربران در هر bulk_create"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="تعداد پردازه‌های هش رمز (پیش‌فرض: تعداد هسته‌ها)"
+        )
+        parser.add_argument(
+            '--rejected',
+            help="مسیر فایل CSV برای ذخیره‌ی ردیف‌های رد شده همراه با دلیل"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f"خواندن فایل ممکن نیست: {e}")
+
+        created, rejected = User.objects.bulk_create_users(
+            rows,
+            batch_size=options['batch_size'],
+            workers=options['workers']
+        )
+
+        for number, row, reason in rejected:
+            self.stderr.write(f"ردیف {number} ({row.get('phone', '')}): {reason}")
+
+        if options['rejected'] and rejected:
+            fieldnames = ['row', 'reason'] + list(rows[0].keys())
+            with open(options['rejected'], 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                for number, row, reason in rejected:
+                    writer.writerow({'row': number, 'reason': reason, **row})
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{created} کاربر ثبت شد، {len(rejected)} ردیف رد شد."
+        ))
@@ -0,0 +1,68 @@
+import gzip
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from USER.models import SMSLog
+
+
+class Command(BaseCommand):
+    help = "حذف (و در صورت نیاز بایگانی) لاگ‌های قدیمی پیامک به صورت تکه‌تکه"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.SMS_LOG_RETENTION_DAYS,
+            help="لاگ‌های قدیمی‌تر از این تعداد روز حذف می‌شوند"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="تعداد رکوردهای حذف‌شده در هر تراکنش"
+        )
+        parser.add_argument(
+            '--archive',
+            help="مسیر فایل JSON Lines برای بایگانی پیش از حذف (پسوند .gz فشرده می‌شود)"
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="فقط تعداد رکوردهای قابل حذف را نمایش می‌دهد"
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        queryset = SMSLog.objects.filter(created_at__lt=cutoff).order_by('pk')
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} لاگ قدیمی‌تر از {cutoff:%Y-%m-%d} وجود دارد.")
+            return
+
+        archive = None
+        if options['archive']:
+            opener = gzip.open if options['archive'].endswith('.gz') else open
+            archive = opener(options['archive'], 'at', encoding='utf-8')
+
+        deleted = 0
+        try:
+            while True:
+                # هر تکه با کلید اصلی انتخاب و حذف می‌شود تا قفل‌ها کوتاه بمانند
+                rows = list(queryset.values(
+                    'id', 'user_id', 'phone', 'otp', 'status', 'response', 'created_at'
+                )[:options['chunk_size']])
+                if not rows:
+                    break
+
+                if archive is not None:
+                    for row in rows:
+                        archive.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n")
+                    archive.flush()
+
+                SMSLog.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+                deleted += len(rows)
+        finally:
+            if archive is not None:
+                archive.close()
+
+        self.stdout.write(self.style.SUCCESS(f"{deleted} لاگ پیامک حذف شد."))
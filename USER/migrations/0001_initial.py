@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('phone', models.CharField(max_length=15, unique=True)),
+                ('first_name', models.CharField(max_length=30)),
+                ('last_name', models.CharField(max_length=30)),
+                ('national_id', models.CharField(max_length=10, unique=True)),
+                ('gender', models.CharField(choices=[('male', 'مرد'), ('female', 'زن')], max_length=10)),
+                ('is_staff', models.BooleanField(default=False)),
+                ('is_support', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('user_type', models.CharField(choices=[('normal', 'کاربر عادی'), ('support', 'پشتیبان'), ('superuser', 'سوپریوزر')], default='normal', max_length=10)),
+                ('otp', models.CharField(blank=True, max_length=6, null=True)),
+                ('otp_expiry', models.DateTimeField(blank=True, null=True)),
+                ('otp_retry_count', models.PositiveIntegerField(default=0)),
+                ('otp_last_sent', models.DateTimeField(blank=True, null=True)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SMSLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', models.CharField(max_length=15)),
+                ('otp', models.CharField(max_length=6)),
+                ('status', models.CharField(max_length=20)),
+                ('response', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SupportPermission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('permission', models.CharField(choices=[('bootcamp', 'مدیریت بوتکمپ\u200cها'), ('ticket', 'مدیریت تیکت\u200cها'), ('blog', 'مدیریت بلاگ'), ('finance', 'مدیریت مالی')], max_length=20)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='support_permissions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'permission')},
+            },
+        ),
+    ]
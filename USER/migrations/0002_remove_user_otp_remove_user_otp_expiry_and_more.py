@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('USER', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='otp',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_expiry',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_last_sent',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_retry_count',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('USER', '0002_remove_user_otp_remove_user_otp_expiry_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='smslog',
+            index=models.Index(fields=['phone', '-created_at'], name='user_smslog_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='smslog',
+            index=models.Index(fields=['created_at'], name='user_smslog_created_idx'),
+        ),
+    ]
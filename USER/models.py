@@ -1,11 +1,31 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.core.exceptions import ValidationError
-from django.utils import timezone
-import random
-from datetime import timedelta
+from .services import permission_cache
+from .services.password_pool import hash_passwords
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        update() سیگنال post_save نمی‌فرستد؛ پس تغییر کاربران (مثلاً گرفتن is_staff
+        یا غیرفعال کردن) اینجا ثبت می‌شود تا توکن‌های قبلی فقط با ادعاهایشان پذیرفته نشوند.
+        """
+        from .authentication import NON_CLAIM_FIELDS, mark_user_changed
+
+        if set(kwargs) <= NON_CLAIM_FIELDS:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            user_ids = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+        if user_ids:
+            mark_user_changed(*user_ids)
+        return rows
+
 
 class CustomUserManager(BaseUserManager):
+    def get_queryset(self):
+        return UserQuerySet(self.model, using=self._db)
+
     def _create_user(self, phone, password=None, **extra_fields):
         if not phone:
             raise ValueError("شماره تلفن باید وارد شود")
@@ -41,6 +61,96 @@ class CustomUserManager(BaseUserManager):
             raise ValueError('سوپریوزر باید is_superuser=True باشد')
             
         return self._create_user(phone, password, **extra_fields)
+    
+    def bulk_create_users(self, rows, batch_size=500, workers=None):
+        """
+        ثبت گروهی کاربران (مثلاً دانشجویان یک دوره از فایل CSV)
+
+        تکراری بودن شماره تلفن و کد ملی با یک کوئری بررسی می‌شود، رمزها به صورت
+        موازی هش می‌شوند و درج با bulk_create در دسته‌های `batch_size` تایی انجام
+        می‌شود. اگر درج یک دسته به خاطر کاربری که همزمان ثبت شده شکست بخورد، ردیف‌های
+        آن دسته تک‌تک درج و ردیف‌های متعارض رد می‌شوند.
+        خروجی (تعداد کاربران ساخته‌شده، فهرست (شماره ردیف، ردیف، دلیل رد)) است.
+        """
+        accepted, rejected = self._validate_import_rows(rows)
+        
+        phones = [row['phone'] for _, row in accepted]
+        national_ids = [row['national_id'] for _, row in accepted]
+        existing = self.filter(
+            models.Q(phone__in=phones) | models.Q(national_id__in=national_ids)
+        ).values_list('phone', 'national_id')
+        existing_phones = {phone for phone, _ in existing}
+        existing_national_ids = {national_id for _, national_id in existing}
+        
+        valid = []
+        for number, row in accepted:
+            if row['phone'] in existing_phones:
+                rejected.append((number, row, "این شماره تلفن قبلا ثبت شده است"))
+            elif row['national_id'] in existing_national_ids:
+                rejected.append((number, row, "این کد ملی قبلا ثبت شده است"))
+            else:
+                valid.append((number, row))
+        
+        hashes = hash_passwords([row.get('password') or None for _, row in valid], workers)
+        users = [
+            (number, row, self.model(
+                phone=row['phone'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                national_id=row['national_id'],
+                gender=row['gender'],
+                password=password_hash,
+            ))
+            for (number, row), password_hash in zip(valid, hashes)
+        ]
+        
+        created = 0
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            try:
+                # هر دسته در تراکنش جداگانه تا قفل نوشتن طولانی نشود
+                with transaction.atomic(using=self._db):
+                    self.bulk_create([user for _, _, user in batch])
+                created += len(batch)
+            except IntegrityError:
+                # کاربری با همین شماره یا کد ملی پس از بررسی بالا ثبت شده است
+                for number, row, user in batch:
+                    try:
+                        with transaction.atomic(using=self._db):
+                            user.save(using=self._db)
+                        created += 1
+                    except IntegrityError:
+                        rejected.append((number, row, "این شماره تلفن یا کد ملی همزمان ثبت شده است"))
+        
+        return created, sorted(rejected, key=lambda item: item[0])
+    
+    def _validate_import_rows(self, rows):
+        required = ['phone', 'first_name', 'last_name', 'national_id', 'gender']
+        max_lengths = {field: self.model._meta.get_field(field).max_length for field in required}
+        genders = {choice for choice, _ in self.model._meta.get_field('gender').choices}
+        seen_phones, seen_national_ids = set(), set()
+        accepted, rejected = [], []
+        
+        for number, row in enumerate(rows, start=1):
+            row = {key: (value or '').strip() for key, value in row.items()}
+            missing = [field for field in required if not row.get(field)]
+            too_long = [field for field, max_length in max_lengths.items() if len(row.get(field, '')) > max_length]
+            if missing:
+                rejected.append((number, row, f"فیلدهای الزامی خالی است: {', '.join(missing)}"))
+            elif too_long:
+                rejected.append((number, row, f"طول فیلدها بیش از حد مجاز است: {', '.join(too_long)}"))
+            elif row['gender'] not in genders:
+                rejected.append((number, row, "جنسیت نامعتبر است"))
+            elif row['phone'] in seen_phones:
+                rejected.append((number, row, "شماره تلفن در فایل تکراری است"))
+            elif row['national_id'] in seen_national_ids:
+                rejected.append((number, row, "کد ملی در فایل تکراری است"))
+            else:
+                seen_phones.add(row['phone'])
+                seen_national_ids.add(row['national_id'])
+                accepted.append((number, row))
+        
+        return accepted, rejected
 
 class User(AbstractBaseUser, PermissionsMixin):
     USER_TYPE_CHOICES = [
@@ -58,10 +168,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_support = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     user_type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES, default='normal')
-    otp = models.CharField(max_length=6, null=True, blank=True)
-    otp_expiry = models.DateTimeField(null=True, blank=True)
-    otp_retry_count = models.PositiveIntegerField(default=0)
-    otp_last_sent = models.DateTimeField(null=True, blank=True)
+    # وضعیت OTP در USER.services.otp_store و در کش نگهداری می‌شود
     
     objects = CustomUserManager()
     
@@ -74,18 +181,25 @@ class User(AbstractBaseUser, PermissionsMixin):
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
     
-    def generate_otp(self):
-        self.otp = str(random.randint(100000, 999999))
-        self.otp_expiry = timezone.now() + timedelta(minutes=5)
-        self.otp_retry_count += 1
-        self.otp_last_sent = timezone.now()
-        self.save()
-        return self.otp
+    def get_support_permissions(self):
+        if not hasattr(self, '_support_permissions'):
+            self._support_permissions = permission_cache.get_support_permissions(self.pk)
+        return self._support_permissions
     
-    def can_resend_otp(self):
-        if not self.otp_last_sent:
+    def has_support_permission(self, permission):
+        """آیا کاربر به بخش داده‌شده (bootcamp، ticket، blog یا finance) دسترسی پشتیبانی دارد؟"""
+        if not self.is_active:
+            return False
+        if self.is_superuser:
             return True
-        return timezone.now() > self.otp_last_sent + timedelta(minutes=2)
+        if not self.is_support:
+            return False
+        return permission in self.get_support_permissions()
+    
+    def in_group(self, name):
+        if not hasattr(self, '_group_names'):
+            self._group_names = permission_cache.get_group_names(self.pk)
+        return name in self._group_names
 
 class SupportPermission(models.Model):
     PERMISSION_CHOICES = [
@@ -111,3 +225,10 @@ class SMSLog(models.Model):
     status = models.CharField(max_length=20)
     response = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['phone', '-created_at'], name='user_smslog_phone_idx'),
+            # دستور prune_sms_logs رکوردهای قدیمی‌تر از یک تاریخ را حذف می‌کند
+            models.Index(fields=['created_at'], name='user_smslog_created_idx'),
+        ]
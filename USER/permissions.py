@@ -0,0 +1,22 @@
+from rest_framework import permissions
+
+class HasSupportPermission(permissions.BasePermission):
+    """
+    دسترسی پشتیبان به یک بخش مشخص؛ برای استفاده زیرکلاس بسازید یا از support_permission استفاده کنید
+    """
+    support_permission = None
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated and
+            user.has_support_permission(self.support_permission)
+        )
+
+def support_permission(area):
+    """ساخت کلاس دسترسی برای یک بخش، مثلاً support_permission('finance')"""
+    return type(
+        f"Has{area.title()}SupportPermission",
+        (HasSupportPermission,),
+        {'support_permission': area}
+    )
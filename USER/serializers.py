@@ -1,8 +1,8 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from django.utils import timezone
 from .models import User
+from .tokens import UserRefreshToken
+from .services.otp_store import get_otp_store
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -43,7 +43,7 @@ class LoginSerializer(serializers.Serializer):
         if not user.is_active:
             raise serializers.ValidationError('حساب کاربری غیرفعال است')
         
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         return {
             'user': UserSerializer(user).data,
@@ -59,16 +59,13 @@ class OTPSerializer(serializers.Serializer):
         phone = attrs.get('phone')
         otp = attrs.get('otp')
         
+        if not get_otp_store().verify(phone, otp):
+            raise serializers.ValidationError('کد تأیید نامعتبر یا منقضی شده است')
+        
         try:
             user = User.objects.get(phone=phone)
         except User.DoesNotExist:
             raise serializers.ValidationError('کاربری با این شماره تلفن یافت نشد')
         
-        if user.otp != otp:
-            raise serializers.ValidationError('کد تأیید نامعتبر است')
-        
-        if user.otp_expiry < timezone.now():
-            raise serializers.ValidationError('کد تأیید منقضی شده است')
-        
         attrs['user'] = user
         return attrs
\ No newline at end of file
@@ -0,0 +1,138 @@
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+
+from .sms_log import get_sms_log_buffer
+
+logger = logging.getLogger(__name__)
+
+
+class OTPDispatchQueue:
+    """
+    صف ارسال پیامک OTP با تعداد محدودی کارگر (worker)
+
+    درخواست HTTP فقط کار را در صف می‌گذارد و بلافاصله پاسخ می‌دهد؛
+    ارسال به سرویس‌دهنده‌ی پیامک، تلاش مجدد با تأخیر افزایشی و ثبت لاگ
+    (از طریق بافر SMSLog) در نخ‌های پس‌زمینه انجام می‌شود.
+    اگر تعداد کارگرها صفر باشد ارسال به صورت همزمان انجام می‌شود (مناسب تست).
+    """
+
+    def __init__(self, sender, workers=4, max_size=1000, max_retries=3, retry_backoff=0.5):
+        self.sender = sender
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=max_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def enqueue(self, user_id, phone, otp):
+        """قرار دادن یک پیامک در صف؛ اگر صف پر باشد False برمی‌گرداند"""
+        job = {'user_id': user_id, 'phone': phone, 'otp': otp}
+
+        if self.workers == 0:
+            self._deliver(job)
+            return True
+
+        self._start()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            logger.warning("OTP queue is full, dropping message for %s", phone)
+            return False
+        return True
+
+    def _start(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f"otp-worker-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            try:
+                self._deliver(job)
+            except Exception:
+                logger.exception("Unexpected error while dispatching OTP to %s", job['phone'])
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+
+    def _deliver(self, job):
+        attempts = 0
+        success = False
+
+        while attempts <= self.max_retries:
+            attempts += 1
+            try:
+                success = self.sender(job['phone'], job['otp'])
+            except Exception:
+                logger.exception("OTP sender raised for %s", job['phone'])
+                success = False
+
+            if success:
+                break
+            if attempts <= self.max_retries:
+                # تأخیر افزایشی بین تلاش‌ها: 0.5، 1، 2 ثانیه و ...
+                time.sleep(self.retry_backoff * (2 ** (attempts - 1)))
+
+        self._log(job, success, attempts)
+        return success
+
+    def _log(self, job, success, attempts):
+        get_sms_log_buffer().add(
+            user_id=job['user_id'],
+            phone=job['phone'],
+            otp=job['otp'],
+            status='success' if success else 'failed',
+            response={'attempts': attempts}
+        )
+
+    def join(self):
+        """منتظر ماندن تا خالی شدن صف (برای تست و خاموش شدن سرور)"""
+        self._queue.join()
+
+    def shutdown(self, wait=True):
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+
+_otp_queue = None
+_otp_queue_lock = threading.Lock()
+
+def get_otp_queue():
+    """صف مشترک پردازه که بر اساس تنظیمات ساخته می‌شود"""
+    global _otp_queue
+    if _otp_queue is None:
+        with _otp_queue_lock:
+            if _otp_queue is None:
+                _otp_queue = OTPDispatchQueue(
+                    sender=import_string(settings.OTP_SMS_SENDER),
+                    workers=settings.OTP_QUEUE_WORKERS,
+                    max_size=settings.OTP_QUEUE_MAX_SIZE,
+                    max_retries=settings.OTP_QUEUE_MAX_RETRIES,
+                    retry_backoff=settings.OTP_QUEUE_RETRY_BACKOFF,
+                )
+    return _otp_queue
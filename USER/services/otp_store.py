@@ -0,0 +1,117 @@
+import random
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare
+
+
+class OTPThrottled(Exception):
+    """درخواست OTP به دلیل محدودیت تعداد یا فاصله‌ی زمانی رد شد"""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class OTPStore:
+    """
+    نگهداری کد OTP و شمارنده‌های محدودیت ارسال در کش
+
+    به جای ذخیره در جدول کاربر، همه‌ی وضعیت OTP در یک کش جنگو نگه داشته
+    می‌شود که باید بین همه‌ی پردازه‌ها مشترک باشد (کش پایگاه داده یا Redis؛
+    بررسی USER.E001). محدودیت‌ها با عملیات اتمیک `add` و `incr` کش پیاده
+    شده‌اند تا درخواست‌های همزمان از آن عبور نکنند.
+    """
+
+    def __init__(self, cache, code_ttl=300, resend_interval=120, max_sends=5, lockout=1800, max_attempts=5):
+        self.cache = cache
+        self.code_ttl = code_ttl
+        self.resend_interval = resend_interval
+        self.max_sends = max_sends
+        self.lockout = lockout
+        self.max_attempts = max_attempts
+
+    def _key(self, kind, phone):
+        return f"otp:{kind}:{phone}"
+
+    def issue(self, phone):
+        """ساخت کد جدید برای شماره؛ در صورت عبور از محدودیت OTPThrottled ایجاد می‌کند"""
+        count_key = self._key('count', phone)
+        sent_key = self._key('sent', phone)
+
+        if (self.cache.get(count_key) or 0) >= self.max_sends:
+            raise OTPThrottled("تعداد درخواست‌ها بیش از حد مجاز است. لطفاً 30 دقیقه دیگر تلاش کنید.")
+
+        # add فقط وقتی موفق است که کلید وجود نداشته باشد؛ پس در هر بازه فقط یک ارسال
+        if not self.cache.add(sent_key, 1, self.resend_interval):
+            raise OTPThrottled("لطفاً 2 دقیقه بعد مجدداً تلاش کنید")
+
+        if self._incr(count_key, self.lockout) >= self.max_sends:
+            # مدت مسدود بودن از آخرین ارسال حساب می‌شود
+            self.cache.touch(count_key, self.lockout)
+
+        otp = str(random.randint(100000, 999999))
+        self.cache.set(self._key('code', phone), otp, self.code_ttl)
+        self.cache.delete(self._key('attempts', phone))
+        return otp
+
+    def release(self, phone):
+        """لغو کدی که ارسال نشد تا کاربر بدون انتظار برای بازه‌ی ارسال مجدد دوباره درخواست دهد"""
+        self.cache.delete_many([self._key('code', phone), self._key('sent', phone)])
+        try:
+            self.cache.decr(self._key('count', phone))
+        except ValueError:
+            pass
+
+    def verify(self, phone, code):
+        """
+        بررسی کد؛ در صورت درستی کد مصرف و حذف می‌شود
+
+        هر تلاش پیش از مقایسه شمرده می‌شود و پس از `max_attempts` تلاش کد باطل
+        می‌شود. حذف کد فقط برای یکی از درخواست‌های همزمان موفق است، پس یک کد
+        بیش از یک بار پذیرفته نمی‌شود.
+        """
+        code_key = self._key('code', phone)
+        attempts_key = self._key('attempts', phone)
+        stored = self.cache.get(code_key)
+        if stored is None:
+            return False
+        if self._incr(attempts_key, self.code_ttl) > self.max_attempts:
+            self.cache.delete(code_key)
+            return False
+        if not constant_time_compare(stored, code or ''):
+            return False
+        if not self.cache.delete(code_key):
+            return False
+        self.cache.delete(attempts_key)
+        return True
+
+    def _incr(self, key, timeout):
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # کلید بین add و incr منقضی شده است
+            self.cache.set(key, 1, timeout)
+            return 1
+
+
+_otp_store = None
+_otp_store_lock = threading.Lock()
+
+def get_otp_store():
+    """انبار مشترک OTP بر اساس تنظیمات"""
+    global _otp_store
+    if _otp_store is None:
+        with _otp_store_lock:
+            if _otp_store is None:
+                _otp_store = OTPStore(
+                    cache=caches[settings.OTP_CACHE_ALIAS],
+                    code_ttl=settings.OTP_CODE_TTL,
+                    resend_interval=settings.OTP_RESEND_INTERVAL,
+                    max_sends=settings.OTP_MAX_SENDS,
+                    lockout=settings.OTP_LOCKOUT,
+                    max_attempts=settings.OTP_MAX_ATTEMPTS,
+                )
+    return _otp_store
@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+
+
+def _init_worker():
+    # در حالت spawn پردازه‌ی فرزند باید خودش جنگو را راه‌اندازی کند
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_password(raw_password):
+    return make_password(raw_password)
+
+
+def hash_passwords(raw_passwords, workers=None):
+    """
+    هش کردن گروهی رمزها به صورت موازی در چند پردازه
+
+    هش کردن رمز کاملاً وابسته به CPU است و در نخ‌ها به خاطر GIL موازی نمی‌شود.
+    رمز None به رمز غیرقابل‌استفاده تبدیل می‌شود. ترتیب خروجی با ورودی یکی است.
+    """
+    raw_passwords = list(raw_passwords)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(raw_passwords) < 2:
+        return [_hash_password(password) for password in raw_passwords]
+
+    chunksize = max(1, len(raw_passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(_hash_password, raw_passwords, chunksize=chunksize))
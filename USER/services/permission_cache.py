@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from .local_cache import TTLCache
+
+# لایه‌ی اول: کش درون‌پردازه‌ای با عمر چند ثانیه؛ لایه‌ی دوم: کش مشترک
+# SUPPORT_PERMISSION_CACHE_ALIAS (بررسی USER.E003)؛ در نهایت پایگاه داده.
+# ابطال فقط لایه‌ی محلی همان پردازه را پاک می‌کند؛ پردازه‌های دیگر حداکثر پس از
+# SUPPORT_PERMISSION_LOCAL_CACHE_TTL ثانیه مقدار تازه را از کش مشترک می‌خوانند.
+_local = TTLCache(
+    maxsize=settings.SUPPORT_PERMISSION_LOCAL_CACHE_SIZE,
+    ttl=settings.SUPPORT_PERMISSION_LOCAL_CACHE_TTL
+)
+
+KINDS = ('permissions', 'groups')
+
+
+def _cache():
+    return caches[settings.SUPPORT_PERMISSION_CACHE_ALIAS]
+
+
+def _key(kind, user_id):
+    return f"support-access:{kind}:{user_id}"
+
+
+def _load(kind, user_id, loader):
+    key = _key(kind, user_id)
+    value = _local.get(key)
+    if value is None:
+        value = _cache().get(key)
+        if value is None:
+            value = frozenset(loader())
+            _cache().set(key, value, settings.SUPPORT_PERMISSION_CACHE_TIMEOUT)
+        _local.set(key, value)
+    return value
+
+
+def get_support_permissions(user_id):
+    """مجموعه‌ی کدهای SupportPermission کاربر (مثلاً {'blog', 'finance'})"""
+    from ..models import SupportPermission
+
+    return _load('permissions', user_id, lambda: SupportPermission.objects.filter(
+        user_id=user_id
+    ).values_list('permission', flat=True))
+
+
+def get_group_names(user_id):
+    """نام گروه‌هایی که کاربر عضو آن‌هاست"""
+    from django.contrib.auth.models import Group
+
+    return _load('groups', user_id, lambda: Group.objects.filter(
+        user__pk=user_id
+    ).values_list('name', flat=True))
+
+
+def invalidate(*user_ids):
+    """حذف مجموعه‌های ذخیره‌شده‌ی کاربران از هر دو لایه‌ی کش"""
+    keys = [_key(kind, user_id) for user_id in user_ids for kind in KINDS]
+    for key in keys:
+        _local.delete(key)
+    _cache().delete_many(keys)
@@ -0,0 +1,89 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class SMSLogBuffer:
+    """
+    بافر لاگ پیامک‌ها که رکوردها را دسته‌ای با bulk_create ذخیره می‌کند
+
+    رکوردها در حافظه جمع می‌شوند و وقتی تعدادشان به `batch_size` برسد یا
+    `flush_interval` ثانیه از آخرین ذخیره بگذرد (و هنگام خاموش شدن پردازه)
+    یکجا در جدول SMSLog نوشته می‌شوند.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._records = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def add(self, **fields):
+        from ..models import SMSLog
+
+        with self._lock:
+            self._records.append(SMSLog(**fields))
+            should_flush = len(self._records) >= self.batch_size
+
+        if should_flush:
+            self.flush()
+        else:
+            self._start_timer()
+
+    def flush(self):
+        """ذخیره‌ی همه‌ی رکوردهای بافرشده؛ تعداد رکوردهای ذخیره‌شده را برمی‌گرداند"""
+        from ..models import SMSLog
+
+        with self._flush_lock:
+            with self._lock:
+                records, self._records = self._records, []
+            if not records:
+                return 0
+            try:
+                SMSLog.objects.bulk_create(records, batch_size=self.batch_size)
+            except Exception:
+                logger.exception("Failed to flush %d SMS log records", len(records))
+                return 0
+            return len(records)
+
+    def _start_timer(self):
+        if self._timer is not None:
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Thread(target=self._run_timer, name="sms-log-flusher", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+_sms_log_buffer = None
+_sms_log_buffer_lock = threading.Lock()
+
+def get_sms_log_buffer():
+    """بافر مشترک پردازه که هنگام خروج پردازه تخلیه می‌شود"""
+    global _sms_log_buffer
+    if _sms_log_buffer is None:
+        with _sms_log_buffer_lock:
+            if _sms_log_buffer is None:
+                _sms_log_buffer = SMSLogBuffer(
+                    batch_size=settings.SMS_LOG_BATCH_SIZE,
+                    flush_interval=settings.SMS_LOG_FLUSH_INTERVAL,
+                )
+                atexit.register(_sms_log_buffer.flush)
+    return _sms_log_buffer
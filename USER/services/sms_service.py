@@ -1,22 +1,198 @@
+import logging
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from datetime import datetime
 
-def send_otp_via_kaveneghar(phone, otp):
-    try:
-        url = f"https://api.kavenegar.com/v1/{settings.KAVEHNEGAR_API_KEY}/verify/lookup.json"
-        
-        params = {
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """سرویس‌دهنده در دسترس نیست و مدار قطع است"""
+
+
+class CircuitBreaker:
+    """
+    قطع‌کننده‌ی مدار ساده
+
+    پس از `failure_threshold` خطای پشت‌سرهم مدار باز می‌شود و تا
+    `reset_timeout` ثانیه همه‌ی درخواست‌ها بدون تماس با سرویس‌دهنده رد می‌شوند.
+    پس از آن یک درخواست آزمایشی (half-open) اجازه‌ی عبور دارد؛ اگر نتیجه‌ی آن
+    تا `reset_timeout` ثانیه ثبت نشود، درخواست آزمایشی دیگری مجاز می‌شود.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow_request(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # فقط یک درخواست آزمایشی تا مشخص شدن نتیجه (یا گذشتن مهلت آن)
+                self._state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class KavenegarClient:
+    """
+    کلاینت کاوهنگار با اتصال‌های نگه‌داشته‌شده (keep-alive)
+
+    یک `requests.Session` با استخر اتصال بین همه‌ی درخواست‌ها مشترک است تا
+    برای هر پیامک دست‌دهی TLS جدید انجام نشود.
+    """
+    BASE_URL = "https://api.kavenegar.com/v1"
+
+    def __init__(self, api_key, otp_template, connect_timeout=3, read_timeout=5,
+                 pool_size=10, failure_threshold=5, reset_timeout=30, sender=''):
+        self.api_key = api_key
+        self.otp_template = otp_template
+        self.sender = sender
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'failures': 0,
+            'short_circuited': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0,
+        }
+
+    def send_otp(self, phone, otp):
+        """ارسال OTP با قالب تأیید؛ در صورت خطا استثنا ایجاد می‌کند"""
+        return self._post('verify/lookup.json', {
             'receptor': phone,
-            'template': settings.KAVEHNEGAR_OTP_TEMPLATE,
+            'template': self.otp_template,
             'token': otp,
             'type': 'sms'
-        }
-        
-        response = requests.post(url, params=params)
-        response.raise_for_status()
-        
+        })
+
+    def send_sms(self, phone, message):
+        """ارسال پیامک متنی ساده (اطلاع‌رسانی‌ها)؛ در صورت خطا استثنا ایجاد می‌کند"""
+        params = {'receptor': phone, 'message': message}
+        if self.sender:
+            params['sender'] = self.sender
+        return self._post('sms/send.json', params)
+
+    def _post(self, path, params):
+        if not self.breaker.allow_request():
+            self._count('short_circuited')
+            raise CircuitOpenError("Kavenegar circuit is open")
+
+        started = time.monotonic()
+        try:
+            response = self.session.post(
+                f"{self.BASE_URL}/{self.api_key}/{path}",
+                params=params,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except Exception:
+            # هر خطایی (نه فقط RequestException) باید ثبت شود تا مدار در half-open نماند
+            self._record(time.monotonic() - started, failed=True)
+            self.breaker.record_failure()
+            raise
+
+        self._record(time.monotonic() - started, failed=False)
+        self.breaker.record_success()
+        return response.json()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _record(self, latency, failed):
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            self._stats['total_latency'] += latency
+            self._stats['max_latency'] = max(self._stats['max_latency'], latency)
+            if failed:
+                self._stats['failures'] += 1
+
+    def stats(self):
+        """شمارنده‌های تأخیر و نرخ خطا"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        requests_count = stats['requests']
+        stats['avg_latency'] = stats['total_latency'] / requests_count if requests_count else 0.0
+        stats['failure_rate'] = stats['failures'] / requests_count if requests_count else 0.0
+        stats['circuit_state'] = self.breaker.state
+        return stats
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_kavenegar_client():
+    """کلاینت مشترک پردازه بر اساس تنظیمات"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = KavenegarClient(
+                    api_key=settings.KAVEHNEGAR_API_KEY,
+                    otp_template=settings.KAVEHNEGAR_OTP_TEMPLATE,
+                    connect_timeout=settings.KAVEHNEGAR_CONNECT_TIMEOUT,
+                    read_timeout=settings.KAVEHNEGAR_READ_TIMEOUT,
+                    pool_size=settings.KAVEHNEGAR_POOL_SIZE,
+                    failure_threshold=settings.KAVEHNEGAR_CIRCUIT_FAILURE_THRESHOLD,
+                    reset_timeout=settings.KAVEHNEGAR_CIRCUIT_RESET_TIMEOUT,
+                    sender=settings.KAVEHNEGAR_SENDER,
+                )
+    return _client
+
+def send_otp_via_kaveneghar(phone, otp):
+    try:
+        get_kavenegar_client().send_otp(phone, otp)
         return True
-    except Exception as e:
-        print(f"Error in sending OTP via Kavenegar: {e}")
-        return False
\ No newline at end of file
+    except CircuitOpenError:
+        logger.warning("Kavenegar circuit is open, OTP to %s not sent", phone)
+        return False
+    except requests.RequestException:
+        logger.exception("Error in sending OTP via Kavenegar to %s", phone)
+        return False
+
+
+# پیام‌هایی که ارسال‌کننده‌ی محلی «ارسال» کرده است (برای تست و محیط توسعه)
+sent_messages = []
+
+def send_otp_locally(phone, otp):
+    """ارسال‌کننده‌ی جایگزین که به جای تماس با کاوهنگار فقط پیام را نگه می‌دارد"""
+    sent_messages.append({'phone': phone, 'otp': otp, 'sent_at': datetime.now()})
+    return True
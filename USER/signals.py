@@ -0,0 +1,51 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_save, post_delete, m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from .authentication import NON_CLAIM_FIELDS, mark_user_changed
+from .models import User, SupportPermission
+from .services import permission_cache
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields and set(update_fields) <= NON_CLAIM_FIELDS:
+        return
+    mark_user_changed(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    mark_user_changed(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=SupportPermission)
+def support_permission_changed(sender, instance, **kwargs):
+    mark_user_changed(instance.user_id)
+    permission_cache.invalidate(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # پس از پاک شدن، اعضای گروه دیگر قابل پیدا کردن نیستند
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_cleared_user_ids', [])
+    else:
+        user_ids = pk_set or []
+    permission_cache.invalidate(*user_ids)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    permission_cache.invalidate(*instance.user_set.values_list('pk', flat=True))
@@ -1,3 +1,487 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import requests
+
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from finalkelasor.testing import QueryPlanAssertionsMixin
+
+from . import authentication
+from .checks import check_auth_changed_cache, check_otp_cache, check_support_permission_cache
+from .models import SMSLog, SupportPermission, User
+from .services import permission_cache, sms_service
+from .services.otp_queue import OTPDispatchQueue
+from .services.otp_store import OTPStore, OTPThrottled
+from .services.password_pool import hash_passwords
+from .services.sms_log import SMSLogBuffer
+from .services.sms_service import CircuitBreaker, CircuitOpenError, KavenegarClient
+from .tokens import UserRefreshToken
+
+
+def _user(phone='09120000000', national_id='0000000000', **extra):
+    return User.objects.create_user(
+        phone=phone, password='password', first_name='a', last_name='b',
+        national_id=national_id, gender='male', **extra
+    )
+
+
+class IndexUsageTests(QueryPlanAssertionsMixin, TestCase):
+    """جستجوی لاگ پیامک‌های یک شماره باید از ایندکس استفاده کند"""
+
+    def test_phone_history_uses_phone_index(self):
+        queryset = SMSLog.objects.filter(phone='09120000000').order_by('-created_at')
+        self.assertUsesIndex(queryset, 'user_smslog_phone_idx')
+
+
+class OTPQueueTests(TestCase):
+    """ارسال OTP در صف با ارسال‌کننده‌ی محلی، تلاش دوباره و رد شدن در صف پر"""
+
+    def setUp(self):
+        sms_service.sent_messages.clear()
+        caches['otp'].clear()
+        self.user = _user()
+        # بافر جداگانه برای هر تست تا رکوردهای تست‌های دیگر در آن نمانند
+        self.log_buffer = SMSLogBuffer(flush_interval=3600)
+        patcher = mock.patch('USER.services.otp_queue.get_sms_log_buffer', return_value=self.log_buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_synchronous_queue_sends_and_logs(self):
+        otp_queue = OTPDispatchQueue(sms_service.send_otp_locally, workers=0)
+        self.assertTrue(otp_queue.enqueue(self.user.pk, self.user.phone, '123456'))
+        self.log_buffer.flush()
+
+        self.assertEqual([message['otp'] for message in sms_service.sent_messages], ['123456'])
+        log = SMSLog.objects.get()
+        self.assertEqual((log.status, log.response), ('success', {'attempts': 1}))
+
+    def test_failed_sends_are_retried_then_logged_as_failed(self):
+        sender = mock.Mock(side_effect=[False, RuntimeError("timeout"), False])
+        otp_queue = OTPDispatchQueue(sender, workers=0, max_retries=2, retry_backoff=0)
+        otp_queue.enqueue(self.user.pk, self.user.phone, '123456')
+        self.log_buffer.flush()
+
+        self.assertEqual(sender.call_count, 3)
+        log = SMSLog.objects.get()
+        self.assertEqual((log.status, log.response), ('failed', {'attempts': 3}))
+
+    def test_full_queue_rejects_new_messages(self):
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_sender(phone, otp):
+            started.set()
+            release.wait(5)
+            return True
+
+        otp_queue = OTPDispatchQueue(blocking_sender, workers=1, max_size=1)
+        with mock.patch.object(OTPDispatchQueue, '_log'):
+            try:
+                self.assertTrue(otp_queue.enqueue(self.user.pk, self.user.phone, '111111'))
+                started.wait(5)
+                # کارگر مشغول پیام اول است و پیام دوم صف را پر می‌کند
+                self.assertTrue(otp_queue.enqueue(self.user.pk, self.user.phone, '222222'))
+                self.assertFalse(otp_queue.enqueue(self.user.pk, self.user.phone, '333333'))
+            finally:
+                release.set()
+                otp_queue.join()
+                otp_queue.shutdown()
+
+    def test_send_otp_view_queues_code_that_verifies(self):
+        otp_queue = OTPDispatchQueue(sms_service.send_otp_locally, workers=0)
+        client = APIClient()
+        with mock.patch('USER.views.get_otp_queue', return_value=otp_queue):
+            response = client.post('/USER/send-otp/', {'phone': self.user.phone})
+        self.assertEqual(response.status_code, 202)
+
+        otp = sms_service.sent_messages[-1]['otp']
+        response = client.post('/USER/verify-otp/', {'phone': self.user.phone, 'otp': otp})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+
+    def test_send_otp_view_returns_503_when_queue_is_full(self):
+        otp_queue = mock.Mock(enqueue=mock.Mock(return_value=False))
+        with mock.patch('USER.views.get_otp_queue', return_value=otp_queue):
+            response = APIClient().post('/USER/send-otp/', {'phone': self.user.phone})
+        self.assertEqual(response.status_code, 503)
+
+
+class CircuitBreakerTests(TestCase):
+    """باز شدن مدار پس از خطاهای پشت‌سرهم و درخواست آزمایشی پس از مهلت"""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('USER.services.sms_service.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _open_client(self):
+        client = KavenegarClient('key', 'template', failure_threshold=2, reset_timeout=30)
+        client.session.post = mock.Mock(side_effect=requests.ConnectionError("refused"))
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                client.send_otp('09120000000', '123456')
+        return client
+
+    def test_open_circuit_short_circuits_without_calling_provider(self):
+        client = self._open_client()
+        with self.assertRaises(CircuitOpenError):
+            client.send_otp('09120000000', '123456')
+        self.assertEqual(client.session.post.call_count, 2)
+        self.assertEqual(client.stats()['short_circuited'], 1)
+
+    def test_successful_probe_closes_circuit(self):
+        client = self._open_client()
+        self.now += 30
+        client.session.post = mock.Mock(return_value=mock.Mock(json=mock.Mock(return_value={})))
+        client.send_otp('09120000000', '123456')
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unexpected_probe_error_reopens_circuit(self):
+        client = self._open_client()
+        self.now += 30
+        client.session.post = mock.Mock(side_effect=ValueError("bad response"))
+        with self.assertRaises(ValueError):
+            client.send_otp('09120000000', '123456')
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+    def test_unfinished_probe_allows_another_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        self.now += 30
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        self.now += 30
+        self.assertTrue(breaker.allow_request())
+
+
+class OTPStoreTests(TestCase):
+    """محدودیت ارسال، مصرف یک‌باره‌ی کد و محدودیت تلاش در کش مشترک"""
+
+    def setUp(self):
+        caches['otp'].clear()
+        self.store = OTPStore(caches['otp'], resend_interval=120, max_sends=2, max_attempts=3)
+
+    def test_resend_interval_and_send_limit(self):
+        self.store.issue('09120000000')
+        with self.assertRaises(OTPThrottled):
+            self.store.issue('09120000000')
+
+        caches['otp'].delete('otp:sent:09120000000')
+        self.store.issue('09120000000')
+        caches['otp'].delete('otp:sent:09120000000')
+        with self.assertRaises(OTPThrottled):
+            self.store.issue('09120000000')
+
+    def test_code_issued_by_one_process_verifies_once_in_another(self):
+        otp = self.store.issue('09120000000')
+        other_worker = OTPStore(caches['otp'])
+        self.assertTrue(other_worker.verify('09120000000', otp))
+        self.assertFalse(self.store.verify('09120000000', otp))
+
+    def test_code_is_revoked_after_too_many_wrong_guesses(self):
+        otp = self.store.issue('09120000000')
+        wrong = '000000' if otp != '000000' else '111111'
+        for _ in range(3):
+            self.assertFalse(self.store.verify('09120000000', wrong))
+        self.assertFalse(self.store.verify('09120000000', otp))
+
+    def test_new_code_resets_attempts(self):
+        self.store.issue('09120000000')
+        for _ in range(3):
+            self.store.verify('09120000000', 'wrong')
+        caches['otp'].delete('otp:sent:09120000000')
+        otp = self.store.issue('09120000000')
+        self.assertTrue(self.store.verify('09120000000', otp))
+
+    def test_failed_send_releases_resend_window(self):
+        user = _user()
+        unavailable = mock.Mock(enqueue=mock.Mock(return_value=False))
+        with mock.patch('USER.views.get_otp_queue', return_value=unavailable):
+            response = APIClient().post('/USER/send-otp/', {'phone': user.phone})
+        self.assertEqual(response.status_code, 503)
+
+        available = OTPDispatchQueue(mock.Mock(return_value=True), workers=0)
+        with mock.patch('USER.views.get_otp_queue', return_value=available), \
+                mock.patch.object(OTPDispatchQueue, '_log'):
+            response = APIClient().post('/USER/send-otp/', {'phone': user.phone})
+        self.assertEqual(response.status_code, 202)
+
+    def test_process_local_otp_cache_is_an_error(self):
+        with override_settings(CACHES={'otp': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([error.id for error in check_otp_cache(None)], ['USER.E001'])
+        self.assertEqual(check_otp_cache(None), [])
+
+    def test_process_local_auth_changed_cache_is_an_error(self):
+        with override_settings(CACHES={'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([error.id for error in check_auth_changed_cache(None)], ['USER.E002'])
+        self.assertEqual(check_auth_changed_cache(None), [])
+
+
+class SMSLogBufferTests(TestCase):
+    """ذخیره‌ی دسته‌ای لاگ پیامک‌ها و حذف تکه‌تکه‌ی لاگ‌های قدیمی"""
+
+    def setUp(self):
+        self.user = _user()
+
+    def _log(self, buffer, otp='123456'):
+        buffer.add(user_id=self.user.pk, phone=self.user.phone, otp=otp, status='success', response={})
+
+    def test_records_are_written_when_batch_fills(self):
+        buffer = SMSLogBuffer(batch_size=3, flush_interval=3600)
+        for _ in range(2):
+            self._log(buffer)
+        self.assertEqual(SMSLog.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            self._log(buffer)
+        self.assertEqual(SMSLog.objects.count(), 3)
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_prune_deletes_old_logs_in_chunks_and_archives_them(self):
+        buffer = SMSLogBuffer(flush_interval=3600)
+        for index in range(5):
+            self._log(buffer, otp=f"{index:06d}")
+        buffer.flush()
+        old_ids = list(SMSLog.objects.order_by('pk').values_list('pk', flat=True)[:3])
+        SMSLog.objects.filter(pk__in=old_ids).update(created_at=timezone.now() - timedelta(days=100))
+
+        with tempfile.TemporaryDirectory() as directory:
+            archive = os.path.join(directory, 'sms.jsonl.gz')
+            call_command('prune_sms_logs', days=90, chunk_size=2, archive=archive, stdout=io.StringIO())
+            with gzip.open(archive, 'rt', encoding='utf-8') as f:
+                archived = [json.loads(line)['id'] for line in f]
+
+        self.assertEqual(archived, old_ids)
+        self.assertEqual(SMSLog.objects.count(), 2)
+
+
+class ClaimsAuthenticationTests(TestCase):
+    """کاربر از ادعاهای توکن ساخته می‌شود و تغییرهای بعدی توکن‌های قبلی را باطل می‌کنند"""
+
+    def setUp(self):
+        caches[settings.AUTH_CHANGED_CACHE_ALIAS].clear()
+        authentication._changed_at_cache.clear()
+        self.staff = _user(is_staff=True)
+        self.token = UserRefreshToken.for_user(self.staff).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def _authenticate(self):
+        request = mock.Mock(META={'HTTP_AUTHORIZATION': f"Bearer {self.token}"})
+        return authentication.ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_user_is_built_from_claims_without_query(self):
+        # زمان تغییر کاربر یک بار از کش مشترک خوانده و چند ثانیه در پردازه نگه داشته می‌شود
+        with self.assertNumQueries(1):
+            self._authenticate()
+        with self.assertNumQueries(0):
+            user = self._authenticate()
+        self.assertEqual((user.pk, user.is_staff, user.is_active), (self.staff.pk, True, True))
+
+    def test_demotion_in_same_second_as_token_is_revoked(self):
+        # تغییر دقیقاً در ثانیه‌ی iat توکن ثبت می‌شود
+        with mock.patch('USER.authentication.time.time', return_value=float(self.token['iat'])):
+            self.staff.is_staff = False
+            self.staff.save()
+        self.assertEqual(self.client.get('/WEBLOG/categories/').status_code, 403)
+
+    def test_revocation_is_shared_between_processes(self):
+        self._authenticate()
+        # پردازه‌ی دیگری کاربر را تغییر داده است: فقط کش مشترک به‌روز شده و لایه‌ی محلی منقضی می‌شود
+        caches[settings.AUTH_CHANGED_CACHE_ALIAS].set(authentication._changed_at_key(self.staff.pk), self.token['iat'])
+        authentication._changed_at_cache.clear()
+        with self.assertNumQueries(2):
+            self._authenticate()
+
+    def test_demotion_through_queryset_update_is_revoked(self):
+        self.assertEqual(self.client.get('/WEBLOG/categories/').status_code, 200)
+        User.objects.filter(pk=self.staff.pk).update(is_staff=False)
+        self.assertEqual(self.client.get('/WEBLOG/categories/').status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        User.objects.filter(pk=self.staff.pk).update(is_active=False)
+        self.assertEqual(self.client.get('/WEBLOG/categories/').status_code, 401)
+
+    def test_last_login_update_keeps_claims_path(self):
+        self._authenticate()
+        User.objects.filter(pk=self.staff.pk).update(last_login=timezone.now())
+        with self.assertNumQueries(0):
+            self._authenticate()
+
+    def test_token_without_claims_loads_user(self):
+        token = UserRefreshToken.for_user(self.staff).access_token
+        del token['user_type']
+        self.token = token
+        with self.assertNumQueries(1):
+            self.assertTrue(self._authenticate().is_staff)
+
+
+class SupportPermissionCacheTests(TestCase):
+    """دسترسی‌ها و گروه‌های پشتیبان از کش خوانده و با تغییرشان باطل می‌شوند"""
+
+    def setUp(self):
+        caches[settings.SUPPORT_PERMISSION_CACHE_ALIAS].clear()
+        permission_cache._local.clear()
+        self.support = _user(is_support=True)
+        SupportPermission.objects.create(user=self.support, permission='blog')
+
+    def test_permissions_are_read_once(self):
+        permission_cache.get_support_permissions(self.support.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(permission_cache.get_support_permissions(self.support.pk), {'blog'})
+
+        # پردازه‌ی دیگر (لایه‌ی محلی خالی) فقط کش مشترک را می‌خواند، نه جدول دسترسی‌ها را
+        permission_cache._local.clear()
+        with self.assertNumQueries(1) as queries:
+            self.assertEqual(permission_cache.get_support_permissions(self.support.pk), {'blog'})
+        self.assertNotIn('USER_supportpermission', queries.captured_queries[0]['sql'])
+
+    def test_other_process_sees_invalidation_after_local_ttl(self):
+        permission_cache.get_support_permissions(self.support.pk)
+        # پردازه‌ی دیگری دسترسی را حذف کرده است: ردیف و کش مشترک تغییر کرده‌اند ولی لایه‌ی محلی این پردازه نه
+        SupportPermission.objects.filter(user=self.support).update(permission='ticket')
+        permission_cache._cache().clear()
+        self.assertEqual(permission_cache.get_support_permissions(self.support.pk), {'blog'})
+
+        expired = time.monotonic() + settings.SUPPORT_PERMISSION_LOCAL_CACHE_TTL + 1
+        with mock.patch('USER.services.local_cache.time.monotonic', return_value=expired):
+            self.assertEqual(permission_cache.get_support_permissions(self.support.pk), {'ticket'})
+
+    def test_process_local_shared_cache_is_an_error(self):
+        with override_settings(CACHES={'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([error.id for error in check_support_permission_cache(None)], ['USER.E003'])
+        self.assertEqual(check_support_permission_cache(None), [])
+
+    def test_permission_changes_invalidate_cache(self):
+        permission_cache.get_support_permissions(self.support.pk)
+        SupportPermission.objects.create(user=self.support, permission='ticket')
+        self.assertEqual(permission_cache.get_support_permissions(self.support.pk), {'blog', 'ticket'})
+
+        SupportPermission.objects.filter(permission='blog').get().delete()
+        self.assertEqual(permission_cache.get_support_permissions(self.support.pk), {'ticket'})
+
+    def test_group_membership_changes_invalidate_cache(self):
+        group = Group.objects.create(name='editors')
+        self.assertFalse(User.objects.get(pk=self.support.pk).in_group('editors'))
+
+        self.support.groups.add(group)
+        self.assertTrue(User.objects.get(pk=self.support.pk).in_group('editors'))
+
+        group.user_set.clear()
+        self.assertFalse(User.objects.get(pk=self.support.pk).in_group('editors'))
+
+    def test_token_user_checks_permissions_without_query(self):
+        # تغییرهای setUp در همان ثانیه‌ی صدور توکن ثبت شده‌اند و توکن را به مسیر پایگاه داده می‌فرستند
+        caches[settings.AUTH_CHANGED_CACHE_ALIAS].clear()
+        authentication._changed_at_cache.clear()
+        token = UserRefreshToken.for_user(self.support).access_token
+        request = mock.Mock(META={'HTTP_AUTHORIZATION': f"Bearer {token}"})
+        authentication.ClaimsJWTAuthentication().authenticate(request)
+        with self.assertNumQueries(0):
+            user = authentication.ClaimsJWTAuthentication().authenticate(request)[0]
+            self.assertTrue(user.has_support_permission('blog'))
+            self.assertFalse(user.has_support_permission('finance'))
+
+
+def _row(index, **extra):
+    return {
+        'phone': f"0935{index:07d}", 'first_name': 'a', 'last_name': 'b', 'national_id': f"{index:010d}",
+        'gender': 'female', 'password': f"pass-{index}", **extra
+    }
+
+
+class BulkImportTests(TestCase):
+    """ثبت گروهی کاربران با گزارش ردیف‌های رد شده"""
+
+    def test_valid_rows_are_created_with_usable_passwords(self):
+        created, rejected = User.objects.bulk_create_users([_row(1), _row(2)], batch_size=1, workers=1)
+        self.assertEqual((created, rejected), (2, []))
+        self.assertTrue(User.objects.get(phone='09350000001').check_password('pass-1'))
+
+    def test_invalid_rows_are_rejected_before_insert(self):
+        _user(phone='09350000003', national_id='9999999999')
+        rows = [
+            _row(1, last_name='x' * 31),
+            _row(2, gender='other'),
+            _row(3),
+            _row(4),
+            _row(5, phone='09350000004'),
+            _row(6, first_name=''),
+        ]
+        created, rejected = User.objects.bulk_create_users(rows, workers=1)
+
+        self.assertEqual(created, 1)
+        self.assertEqual([number for number, _, _ in rejected], [1, 2, 3, 5, 6])
+        self.assertIn('last_name', rejected[0][2])
+
+    def test_rows_created_concurrently_are_rejected_not_raised(self):
+        def hash_then_conflict(passwords, workers):
+            # کاربری با همان شماره‌ی ردیف دوم پس از بررسی تکراری‌ها ثبت می‌شود
+            _user(phone='09350000002', national_id='8888888888')
+            return hash_passwords(passwords, workers)
+
+        with mock.patch('USER.models.hash_passwords', side_effect=hash_then_conflict):
+            created, rejected = User.objects.bulk_create_users([_row(1), _row(2), _row(3)], workers=1)
+
+        self.assertEqual(created, 2)
+        self.assertEqual([number for number, _, _ in rejected], [2])
+        self.assertEqual(User.objects.filter(phone__startswith='0935').count(), 3)
+
+    def test_import_command_writes_rejected_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'users.csv')
+            with open(source, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(_row(1)))
+                writer.writeheader()
+                writer.writerows([_row(1), _row(2, gender='')])
+            rejected_path = os.path.join(directory, 'rejected.csv')
+            call_command(
+                'import_users', source, workers=1, rejected=rejected_path, stdout=io.StringIO(), stderr=io.StringIO()
+            )
+            with open(rejected_path, encoding='utf-8') as f:
+                rejected = list(csv.DictReader(f))
+
+        self.assertTrue(User.objects.filter(phone='09350000001').exists())
+        self.assertEqual([row['row'] for row in rejected], ['2'])
+
+
+class PasswordHashingTests(TestCase):
+    """هزینه‌ی هش از تنظیمات خوانده می‌شود و هش قدیمی در ورود موفق به‌روز می‌شود"""
+
+    def _login(self, user):
+        return APIClient().post('/USER/login/', {'phone': user.phone, 'password': 'password'})
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_new_hashes_use_configured_cost(self):
+        self.assertTrue(make_password('password').startswith('pbkdf2_sha256$1000$'))
+
+    def test_login_rehashes_password_after_cost_change(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = _user()
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self._login(user).status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_login_upgrades_legacy_hasher(self):
+        user = _user()
+        User.objects.filter(pk=user.pk).update(password=make_password('password', hasher='pbkdf2_sha1'))
+        self.assertEqual(self._login(user).status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
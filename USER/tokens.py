@@ -0,0 +1,24 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    توکن تجدید که اطلاعات دسترسی کاربر را هم در خود دارد
+
+    این ادعاها (claims) به توکن دسترسی هم کپی می‌شوند تا
+    USER.authentication.ClaimsJWTAuthentication بدون خواندن ردیف کاربر
+    از پایگاه داده، کاربر درخواست را بسازد.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token['is_support'] = getattr(user, 'is_support', False)
+        token['user_type'] = getattr(user, 'user_type', 'normal')
+        token['support_permissions'] = (
+            list(user.support_permissions.values_list('permission', flat=True))
+            if token['is_support'] else []
+        )
+        return token
@@ -2,14 +2,11 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .serializers import RegisterSerializer, LoginSerializer, OTPSerializer, UserSerializer
-from .models import User, SMSLog
-from .services.sms_service import send_otp_via_kaveneghar
+from .models import User
+from .tokens import UserRefreshToken
+from .services.otp_queue import get_otp_queue
+from .services.otp_store import get_otp_store, OTPThrottled
 import random
-from django.utils import timezone
-from datetime import timedelta
-
-MAX_OTP_RETRIES = 5
-OTP_RETRY_TIMEOUT = timedelta(minutes=30)
 
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
@@ -39,54 +36,37 @@ class SendOTPView(generics.GenericAPIView):
     def post(self, request, *args, **kwargs):
         phone = request.data.get('phone')
         
-        try:
-            user = User.objects.get(phone=phone)
-        except User.DoesNotExist:
+        # فقط شناسه‌ی کاربر لازم است؛ وضعیت OTP در کش است
+        user_id = User.objects.filter(phone=phone).values_list('id', flat=True).first()
+        if user_id is None:
             return Response(
                 {"detail": "کاربری با این شماره تلفن یافت نشد"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if user.otp_retry_count >= MAX_OTP_RETRIES:
-            if timezone.now() < user.otp_last_sent + OTP_RETRY_TIMEOUT:
-                return Response(
-                    {"detail": "تعداد درخواست‌ها بیش از حد مجاز است. لطفاً 30 دقیقه دیگر تلاش کنید."},
-                    status=status.HTTP_429_TOO_MANY_REQUESTS
-                )
-            else:
-                user.otp_retry_count = 0
-        
-        if not user.can_resend_otp():
+        otp_store = get_otp_store()
+        try:
+            otp = otp_store.issue(phone)
+        except OTPThrottled as e:
             return Response(
-                {"detail": "لطفاً 2 دقیقه بعد مجدداً تلاش کنید"},
+                {"detail": e.message},
                 status=status.HTTP_429_TOO_MANY_REQUESTS
             )
         
-        otp = user.generate_otp()
-        
-        # ارسال OTP از طریق کاوهنگار
-        success = send_otp_via_kaveneghar(phone, otp)
-        
-        # ذخیره لاگ ارسال
-        SMSLog.objects.create(
-            user=user,
-            phone=phone,
-            otp=otp,
-            status='success' if success else 'failed',
-            response={'manual_log': 'در حالت توسعه'}
-        )
-        
-        if not success:
+        # ارسال OTP در پس‌زمینه؛ ثبت لاگ ارسال هم در همان‌جا انجام می‌شود
+        if not get_otp_queue().enqueue(user_id, phone, otp):
+            # پیامکی ارسال نشده است؛ کاربر نباید تا پایان بازه‌ی ارسال مجدد منتظر بماند
+            otp_store.release(phone)
             return Response(
-                {"detail": "خطا در ارسال کد تأیید"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"detail": "سرویس ارسال پیامک موقتاً در دسترس نیست. لطفاً بعداً تلاش کنید."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
         
         return Response({
-            "message": "کد تأیید به شماره شما ارسال شد",
+            "message": "کد تأیید در صف ارسال قرار گرفت",
             "expiry": "5 دقیقه",
             "retry_after": "2 دقیقه"
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_202_ACCEPTED)
 
 class VerifyOTPView(generics.GenericAPIView):
     serializer_class = OTPSerializer
@@ -96,12 +76,10 @@ class VerifyOTPView(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
+        # کد در OTPSerializer مصرف و از کش حذف شده است
         user = serializer.validated_data['user']
-        user.otp = None
-        user.otp_expiry = None
-        user.save()
         
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         return Response({
             "user": UserSerializer(user).data,
@@ -115,4 +93,6 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
+        # request.user از ادعاهای توکن ساخته شده و بیشتر فیلدهایش تعویق‌افتاده است؛
+        # پروفایل کامل با یک کوئری خوانده می‌شود تا هر فیلد کوئری جداگانه نزند
+        return User.objects.get(pk=self.request.user.pk)
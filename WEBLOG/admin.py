@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike
+from .services.search import get_search_backend
 
 @admin.register(BlogCategory)
 class BlogCategoryAdmin(admin.ModelAdmin):
@@ -24,6 +25,12 @@ class BlogPostAdmin(admin.ModelAdmin):
     ordering = ['-published_at']
     filter_horizontal = ['tags']
 
+    def get_search_results(self, request, queryset, search_term):
+        # به جای LIKE روی کل محتوا از ایندکس متن کامل استفاده می‌شود
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return get_search_backend().filter_posts(queryset, search_term), False
+
 @admin.register(BlogComment)
 class BlogCommentAdmin(admin.ModelAdmin):
     list_display = ['post', 'author', 'is_approved', 'created_at']
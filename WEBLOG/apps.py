@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class WeblogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'WEBLOG'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+
+        # جدول جستجو مدل Django ندارد و همراه با جدول‌های برنامه در migrate ساخته می‌شود
+        post_migrate.connect(signals.create_search_table, sender=self)
@@ -0,0 +1,127 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+# برچسب‌های وابستگی پاسخ‌های کش‌شده
+POSTS = 'blog:posts'
+CATEGORIES = 'blog:categories'
+TAGS = 'blog:tags'
+
+
+def post_tag(slug):
+    return f"blog:post:{slug}"
+
+
+def _cache():
+    return caches[settings.BLOG_RESPONSE_CACHE_ALIAS]
+
+
+def _version_key(tag):
+    return f"blog-cache:version:{tag}"
+
+
+def tag_versions(tags):
+    """نسخه‌ی فعلی هر برچسب؛ برچسب بدون نسخه یک نسخه‌ی تازه می‌گیرد"""
+    cache = _cache()
+    keys = {tag: _version_key(tag) for tag in tags}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for tag, key in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        versions[tag] = found[key]
+    return versions
+
+
+def invalidate(*tags):
+    """باطل کردن همه‌ی پاسخ‌هایی که به این برچسب‌ها وابسته‌اند (با عوض کردن نسخه)"""
+    version = time.time_ns()
+    _cache().set_many({_version_key(tag): version for tag in tags}, None)
+
+
+class CachedResponseMixin:
+    """
+    کش پاسخ list و retrieve با باطل‌سازی مبتنی بر برچسب و پشتیبانی از ETag/Last-Modified
+
+    کلید کش از میزبان و مسیر، پارامترهای کوئری، سطح دسترسی (کارمند یا عمومی)، فرمت پاسخ
+    و نسخه‌ی برچسب‌های وابسته ساخته می‌شود؛ پس با تغییر هر برچسب (در WEBLOG.signals)
+    کلید عوض می‌شود و ETag هم به تبع آن تغییر می‌کند.
+    """
+    cache_tags = ()
+    # تابعی که از مقدار lookup برچسب مخصوص همان شیء را می‌سازد (برای retrieve)
+    object_cache_tag = None
+
+    def get_cache_tags(self):
+        tags = list(self.cache_tags)
+        if self.action == 'retrieve' and self.object_cache_tag:
+            tags.append(self.object_cache_tag(self.kwargs[self.lookup_url_kwarg or self.lookup_field]))
+        return tags
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(request, lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(request, lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs))
+
+    def get_object(self):
+        obj = super().get_object()
+        self._last_modified = getattr(obj, 'updated_at', None)
+        return obj
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.remember_last_modified(page)
+        return page
+
+    def remember_last_modified(self, objects):
+        """آخرین updated_at اشیای همان صفحه؛ Last-Modified پاسخ فهرست حداقل این مقدار است"""
+        dates = [obj.updated_at for obj in objects if 'updated_at' in obj.__dict__]
+        self._last_modified = max(dates) if dates else None
+
+    def _cache_key(self, request, versions):
+        visibility = 'staff' if request.user.is_staff else 'public'
+        params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.items()))
+        # پیوندهای صفحه‌بندی و نشانی نسخه‌های تصویر در پاسخ کامل (با طرح و میزبان) هستند
+        raw = "|".join([
+            request.scheme, request.get_host(), request.path, params, visibility, request.accepted_renderer.format,
+            ",".join(f"{tag}:{version}" for tag, version in sorted(versions.items()))
+        ])
+        return "blog-cache:response:" + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    def _cached_response(self, request, produce):
+        versions = tag_versions(self.get_cache_tags())
+        key = self._cache_key(request, versions)
+        etag = quote_etag(key.rsplit(':', 1)[1])
+        cache = _cache()
+        entry = cache.get(key)
+
+        if entry is None:
+            self._last_modified = None
+            response = produce()
+            if response.status_code != 200:
+                return response
+            last_modified = self._last_modified
+            last_modified = int(last_modified.timestamp()) if last_modified else int(time.time())
+            # لایک، نظر و تغییر دسته‌بندی/تگ updated_at مقاله را عوض نمی‌کنند ولی نسخه‌ی برچسب
+            # (time_ns زمان باطل‌سازی) را عوض می‌کنند؛ Last-Modified تازه‌ترینِ این دو است
+            changed_at = max(versions.values(), default=0) // 10 ** 9
+            entry = {
+                'data': response.data,
+                'last_modified': max(last_modified, changed_at),
+            }
+            cache.set(key, entry, settings.BLOG_RESPONSE_CACHE_TIMEOUT)
+        else:
+            response = Response(entry['data'])
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        return get_conditional_response(
+            request, etag=etag, last_modified=entry['last_modified'], response=response
+        )
@@ -0,0 +1,9 @@
+from django.core.checks import register
+
+from finalkelasor.checks import check_shared_cache
+
+
+@register()
+def check_response_cache(app_configs, **kwargs):
+    """باطل‌سازی برچسب‌ها در یک پردازه باید پاسخ‌های کش‌شده‌ی همه‌ی پردازه‌ها را کهنه کند"""
+    return check_shared_cache('BLOG_RESPONSE_CACHE_ALIAS', "Blog response", 'WEBLOG.E001')
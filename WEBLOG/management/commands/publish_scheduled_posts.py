@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from WEBLOG.services.publishing import publish_due_posts
+
+
+class Command(BaseCommand):
+    help = "انتشار مقالات زمان‌بندی‌شده‌ای که زمان انتشارشان رسیده است"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="اجرای مداوم با این فاصله (ثانیه)؛ 0 یعنی یک بار اجرا (مناسب cron)"
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            for post in publish_due_posts():
+                self.stdout.write(self.style.SUCCESS(f"منتشر شد: {post.slug}"))
+            if not interval:
+                return
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from WEBLOG.services import feed
+
+
+class Command(BaseCommand):
+    help = "ساخت دوباره‌ی فید مادی‌شده‌ی مقالات منتشرشده (کلی، دسته‌بندی‌ها و تگ‌ها)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="تعداد ردیف در هر bulk_create"
+        )
+
+    def handle(self, *args, **options):
+        total = feed.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} ردیف فید ساخته شد."))
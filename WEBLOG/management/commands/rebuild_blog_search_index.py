@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from WEBLOG.models import BlogPost
+from WEBLOG.services.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "ساخت دوباره‌ی ایندکس جستجوی متن کامل مقالات"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help="تعداد مقالات خوانده‌شده در هر مرحله"
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = 0
+
+        with transaction.atomic():
+            backend.drop_table()
+            backend.create_table()
+            posts = BlogPost.objects.only('id', 'title', 'excerpt', 'content').order_by('pk')
+            for post in posts.iterator(chunk_size=options['chunk_size']):
+                backend.index_post(post)
+                indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{indexed} مقاله ایندکس شد."))
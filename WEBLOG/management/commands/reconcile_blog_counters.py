@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from WEBLOG.models import BlogPost, BlogComment, BlogLike
+
+
+def _count_subquery(model):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+class Command(BaseCommand):
+    help = "محاسبه‌ی دوباره‌ی like_count و comment_count مقالات از روی جدول‌های لایک و نظر"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="فقط مقالات دارای شمارنده‌ی نادرست را نمایش می‌دهد"
+        )
+
+    def handle(self, *args, **options):
+        mismatched = BlogPost.objects.annotate(
+            actual_likes=_count_subquery(BlogLike),
+            actual_comments=_count_subquery(BlogComment),
+        ).exclude(
+            Q(like_count=F('actual_likes')) & Q(comment_count=F('actual_comments'))
+        )
+
+        if options['dry_run']:
+            for post in mismatched.values('slug', 'like_count', 'actual_likes', 'comment_count', 'actual_comments'):
+                self.stdout.write(
+                    f"{post['slug']}: لایک {post['like_count']} ← {post['actual_likes']}، "
+                    f"نظر {post['comment_count']} ← {post['actual_comments']}"
+                )
+            return
+
+        # یک UPDATE برای همه‌ی مقالات با شمارنده‌ی نادرست
+        updated = BlogPost.objects.filter(pk__in=mismatched.values('pk')).update(
+            like_count=_count_subquery(BlogLike),
+            comment_count=_count_subquery(BlogComment),
+        )
+        self.stdout.write(self.style.SUCCESS(f"شمارنده‌های {updated} مقاله اصلاح شد."))
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='عنوان')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='اسلاگ')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')),
+            ],
+            options={
+                'verbose_name': 'دسته\u200cبندی وبلاگ',
+                'verbose_name_plural': 'دسته\u200cبندی\u200cهای وبلاگ',
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='نام تگ')),
+                ('slug', models.SlugField(unique=True, verbose_name='اسلاگ')),
+            ],
+            options={
+                'verbose_name': 'تگ وبلاگ',
+                'verbose_name_plural': 'تگ\u200cهای وبلاگ',
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='عنوان')),
+                ('slug', models.SlugField(max_length=200, unique=True, verbose_name='اسلاگ')),
+                ('content', models.TextField(verbose_name='محتوا')),
+                ('excerpt', models.TextField(blank=True, max_length=300, verbose_name='چکیده')),
+                ('status', models.CharField(choices=[('draft', 'پیش نویس'), ('published', 'منتشر شده')], default='draft', max_length=10, verbose_name='وضعیت')),
+                ('featured_image', models.ImageField(blank=True, null=True, upload_to='blog/featured_images/', verbose_name='تصویر شاخص')),
+                ('published_at', models.DateTimeField(blank=True, null=True, verbose_name='تاریخ انتشار')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')),
+                ('view_count', models.PositiveIntegerField(default=0, verbose_name='تعداد بازدید')),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='blog_posts', to=settings.AUTH_USER_MODEL, verbose_name='نویسنده')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='WEBLOG.blogcategory', verbose_name='دسته\u200cبندی')),
+                ('tags', models.ManyToManyField(blank=True, related_name='posts', to='WEBLOG.blogtag', verbose_name='تگ\u200cها')),
+            ],
+            options={
+                'verbose_name': 'مقاله وبلاگ',
+                'verbose_name_plural': 'مقالات وبلاگ',
+                'ordering': ['-published_at', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField(verbose_name='متن نظر')),
+                ('is_approved', models.BooleanField(default=False, verbose_name='تایید شده')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blog_comments', to=settings.AUTH_USER_MODEL, verbose_name='نویسنده نظر')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='WEBLOG.blogcomment', verbose_name='پاسخ به')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='WEBLOG.blogpost', verbose_name='مقاله')),
+            ],
+            options={
+                'verbose_name': 'نظر وبلاگ',
+                'verbose_name_plural': 'نظرات وبلاگ',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blog_likes', to=settings.AUTH_USER_MODEL, verbose_name='کاربر')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='WEBLOG.blogpost', verbose_name='مقاله')),
+            ],
+            options={
+                'verbose_name': 'لایک وبلاگ',
+                'verbose_name_plural': 'لایک\u200cهای وبلاگ',
+                'unique_together': {('post', 'user')},
+            },
+        ),
+    ]
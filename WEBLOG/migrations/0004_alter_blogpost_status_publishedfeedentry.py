@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('WEBLOG', '0003_blogpost_featured_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogpost',
+            name='status',
+            field=models.CharField(choices=[('draft', 'پیش نویس'), ('scheduled', 'زمان\u200cبندی شده'), ('published', 'منتشر شده')], default='draft', max_length=10, verbose_name='وضعیت'),
+        ),
+        migrations.CreateModel(
+            name='PublishedFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed', models.CharField(max_length=50, verbose_name='فید')),
+                ('published_at', models.DateTimeField(verbose_name='تاریخ انتشار')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='WEBLOG.blogpost', verbose_name='مقاله')),
+            ],
+            options={
+                'verbose_name': 'ردیف فید',
+                'verbose_name_plural': 'ردیف\u200cهای فید',
+                'indexes': [models.Index(fields=['feed', '-published_at', '-post'], name='weblog_feed_order_idx')],
+                'unique_together': {('feed', 'post')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('WEBLOG', '0004_alter_blogpost_status_publishedfeedentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogcomment',
+            index=models.Index(fields=['post', 'is_approved', 'parent'], name='weblog_comment_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogcomment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['post', 'created_at'], name='weblog_comment_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['status', '-published_at', '-id'], name='weblog_post_status_pub_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import WEBLOG.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('WEBLOG', '0005_blogcomment_weblog_comment_thread_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogpost',
+            name='slug',
+            field=models.SlugField(max_length=200, unique=True, validators=[WEBLOG.models.validate_post_slug], verbose_name='اسلاگ'),
+        ),
+    ]
@@ -1,12 +1,26 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.conf import settings
 import random
 
+from finalkelasor.images import ImageVariantsMixin
+
 # استفاده از مدل کاربری فعلی شما بدون نیاز به تغییر
 User = settings.AUTH_USER_MODEL
 
+# مسیر اکشن‌های فهرستی BlogPostViewSet (مثل /posts/search/)؛ مقاله‌ای با این اسلاگ‌ها
+# از آدرس جزئیات قابل دسترسی نخواهد بود
+RESERVED_POST_SLUGS = frozenset({'search', 'liked'})
+
+
+def validate_post_slug(value):
+    if value in RESERVED_POST_SLUGS:
+        raise ValidationError(_("این اسلاگ برای آدرس‌های وبلاگ رزرو شده است."), code='reserved')
+
 class BlogCategory(models.Model):
     """
     مدل دسته‌بندی مقالات وبلاگ
@@ -37,16 +51,17 @@ class BlogTag(models.Model):
     def __str__(self):
         return self.name
 
-class BlogPost(models.Model):
+class BlogPost(ImageVariantsMixin, models.Model):
     """
     مدل اصلی مقالات وبلاگ
     """
     class Status(models.TextChoices):
         DRAFT = 'draft', _('پیش نویس')
+        SCHEDULED = 'scheduled', _('زمان‌بندی شده')
         PUBLISHED = 'published', _('منتشر شده')
 
     title = models.CharField(_("عنوان"), max_length=200)
-    slug = models.SlugField(_("اسلاگ"), max_length=200, unique=True)
+    slug = models.SlugField(_("اسلاگ"), max_length=200, unique=True, validators=[validate_post_slug])
     content = models.TextField(_("محتوا"))
     excerpt = models.TextField(_("چکیده"), max_length=300, blank=True)
     category = models.ForeignKey(
@@ -82,27 +97,71 @@ class BlogPost(models.Model):
         null=True,
         blank=True
     )
+    # مسیر نسخه‌های کوچک‌شده‌ی تصویر شاخص ({'thumbnail': ..., 'large': ...})؛ در پس‌زمینه ساخته می‌شوند
+    featured_image_variants = models.JSONField(_("نسخه‌های تصویر شاخص"), default=dict, blank=True, editable=False)
     published_at = models.DateTimeField(_("تاریخ انتشار"), null=True, blank=True)
     created_at = models.DateTimeField(_("تاریخ ایجاد"), auto_now_add=True)
     updated_at = models.DateTimeField(_("تاریخ بروزرسانی"), auto_now=True)
     view_count = models.PositiveIntegerField(_("تعداد بازدید"), default=0)
+    # شمارنده‌های غیرنرمال؛ در BlogLikeViewSet و BlogCommentViewSet به‌روز می‌شوند
+    # و با دستور reconcile_blog_counters قابل اصلاح هستند
+    like_count = models.PositiveIntegerField(_("تعداد لایک"), default=0)
+    comment_count = models.PositiveIntegerField(_("تعداد نظر"), default=0)
 
     class Meta:
         verbose_name = _("مقاله وبلاگ")
         verbose_name_plural = _("مقالات وبلاگ")
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # فهرست مقالات: فیلتر وضعیت و مرتب‌سازی نزولی روی (published_at, id)
+            # (publish_scheduled_posts هم از همین ایندکس با status='scheduled' استفاده می‌کند)
+            models.Index(fields=['status', '-published_at', '-id'], name='weblog_post_status_pub_idx'),
+        ]
+
+    image_variant_fields = {'featured_image': 'featured_image_variants'}
+    # شمارنده‌هایی که فقط با UPDATE اتمیک تغییر می‌کنند (adjust_counter و شمارنده‌ی بازدید)
+    counter_fields = ('view_count', 'like_count', 'comment_count')
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if self.status == self.Status.PUBLISHED and not self.published_at:
-            self.published_at = timezone.now()
+        if self.status == self.Status.PUBLISHED:
+            if not self.published_at:
+                self.published_at = timezone.now()
+            elif self.published_at > timezone.now():
+                # انتشار با تاریخ آینده زمان‌بندی می‌شود؛ دستور publish_scheduled_posts آن را منتشر می‌کند
+                self.status = self.Status.SCHEDULED
+        # ذخیره‌ی کامل یک مقاله‌ی موجود (ویرایش، انتشار، ادمین) نباید مقدار کهنه‌ی
+        # خوانده‌شده‌ی شمارنده‌ها را روی آن‌ها بنویسد
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
         super().save(*args, **kwargs)
 
+    @classmethod
+    def adjust_counter(cls, post_id, field, amount):
+        """تغییر اتمیک شمارنده‌ی like_count یا comment_count بدون خواندن ردیف"""
+        cls.objects.filter(pk=post_id).update(**{field: Greatest(F(field) + amount, 0)})
+
+    @classmethod
+    def on_variants_ready(cls, pk, field_name, variants):
+        """پاسخ‌های کش‌شده‌ی مقاله نشانی نسخه‌های تازه را ندارند؛ update خط پردازش سیگنالی نمی‌فرستد"""
+        from . import cache as response_cache
+
+        slug = cls.objects.filter(pk=pk).values_list('slug', flat=True).first()
+        tags = [response_cache.POSTS]
+        if slug:
+            tags.append(response_cache.post_tag(slug))
+        response_cache.invalidate(*tags)
+
     def increase_view_count(self):
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """ثبت یک بازدید در شمارنده‌ی بافرشده؛ تعداد تقریبی بازدیدها را برمی‌گرداند"""
+        from .services.view_counter import get_view_counter
+
+        return self.view_count + get_view_counter().hit(self.pk)
 
 class BlogComment(models.Model):
     """
@@ -137,6 +196,15 @@ class BlogComment(models.Model):
         verbose_name = _("نظر وبلاگ")
         verbose_name_plural = _("نظرات وبلاگ")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', 'is_approved', 'parent'], name='weblog_comment_thread_idx'),
+            # BlogCommentViewSet.list همه‌ی نظرات تاییدشده‌ی یک مقاله را به ترتیب زمان می‌خواند
+            models.Index(
+                fields=['post', 'created_at'],
+                condition=models.Q(is_approved=True),
+                name='weblog_comment_approved_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"نظر {self.author} برای مقاله {self.post.title}"
@@ -165,4 +233,32 @@ class BlogLike(models.Model):
         unique_together = ('post', 'user')
 
     def __str__(self):
-        return f"لایک {self.user} برای مقاله {self.post.title}"
\ No newline at end of file
+        return f"لایک {self.user} برای مقاله {self.post.title}"
+
+class PublishedFeedEntry(models.Model):
+    """
+    فید مادی‌شده‌ی مقالات منتشرشده
+
+    برای هر مقاله‌ی منتشرشده یک ردیف در فید کلی و یک ردیف برای دسته‌بندی و هر تگ آن
+    نگه داشته می‌شود (WEBLOG.services.feed)؛ فهرست عمومی مقالات به جای فیلتر و join
+    روی همه‌ی مقالات، یک بازه از ایندکس (feed, published_at, post) را می‌خواند.
+    """
+    feed = models.CharField(_("فید"), max_length=50)
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name=_("مقاله")
+    )
+    published_at = models.DateTimeField(_("تاریخ انتشار"))
+
+    class Meta:
+        verbose_name = _("ردیف فید")
+        verbose_name_plural = _("ردیف‌های فید")
+        unique_together = ('feed', 'post')
+        indexes = [
+            models.Index(fields=['feed', '-published_at', '-post'], name='weblog_feed_order_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.feed}: {self.post_id}"
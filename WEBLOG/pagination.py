@@ -0,0 +1,104 @@
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CommentThreadPagination(PageNumberPagination):
+    """صفحه‌بندی نظرات بر اساس رشته‌های سطح اول (هر رشته با همه‌ی پاسخ‌هایش)"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PostCursorPagination(BasePagination):
+    """
+    صفحه‌بندی کلیدی (keyset) مقالات روی (published_at, id) به ترتیب نزولی
+
+    به جای OFFSET، هر صفحه از بعد از آخرین ردیف صفحه‌ی قبل خوانده می‌شود
+    تا هزینه‌ی صفحه‌های انتهایی آرشیو با صفحه‌ی اول یکی باشد.
+    مقالات بدون تاریخ انتشار (پیش‌نویس‌ها) در انتهای فهرست می‌آیند.
+    با pk_field='post_id' همین صفحه‌بندی روی ردیف‌های PublishedFeedEntry هم کار می‌کند.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'نشانگر صفحه نامعتبر است.'
+
+    def paginate_queryset(self, queryset, request, view=None, pk_field='id'):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.pk_field = pk_field
+
+        queryset = self.order_queryset(queryset, pk_field)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            published_at, pk = cursor
+            if published_at is None:
+                queryset = queryset.filter(published_at__isnull=True, **{f'{pk_field}__lt': pk})
+            else:
+                queryset = queryset.filter(
+                    Q(published_at__lt=published_at) |
+                    Q(published_at=published_at, **{f'{pk_field}__lt': pk}) |
+                    Q(published_at__isnull=True)
+                )
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.next_cursor = self.encode_cursor(results[-1]) if self.has_next else None
+        return results
+
+    def order_queryset(self, queryset, pk_field='id'):
+        """
+        مرتب‌سازی صفحه‌بندی؛ NULLS LAST فقط برای published_at اختیاری لازم است
+
+        ایندکس‌های نزولی PostgreSQL به صورت NULLS FIRST ساخته می‌شوند، پس برای ستون
+        اجباری (مثل PublishedFeedEntry.published_at) مرتب‌سازی ساده‌ی نزولی می‌آید تا
+        ایندکس همچنان برای ORDER BY قابل استفاده باشد.
+        """
+        if queryset.model._meta.get_field('published_at').null:
+            published_at = F('published_at').desc(nulls_last=True)
+        else:
+            published_at = F('published_at').desc()
+        return queryset.order_by(published_at, f'-{pk_field}')
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            published_at, pk = b64decode(encoded.encode('ascii'), altchars=b'-_').decode('ascii').split('|')
+            published_at = datetime.fromisoformat(published_at) if published_at else None
+            return published_at, int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        published_at = row.published_at.isoformat() if row.published_at else ''
+        pk = getattr(row, self.pk_field)
+        return b64encode(f"{published_at}|{pk}".encode('ascii'), altchars=b'-_').decode('ascii')
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from finalkelasor.images import ImageVariantsField
 
 User = get_user_model()
 
@@ -20,23 +23,19 @@ class BlogPostListSerializer(serializers.ModelSerializer):
     category = BlogCategorySerializer(read_only=True)
     tags = BlogTagSerializer(many=True, read_only=True)
     author = serializers.StringRelatedField()
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    featured_image_variants = ImageVariantsField('featured_image')
 
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'excerpt', 'category', 'tags',
-            'author', 'status', 'featured_image', 'published_at',
+            'author', 'status', 'featured_image', 'featured_image_variants', 'published_at',
             'created_at', 'view_count', 'like_count', 'comment_count'
         ]
-        read_only_fields = ['id', 'slug', 'created_at', 'published_at', 'view_count']
-
-    def get_like_count(self, obj):
-        return obj.likes.count()
-
-    def get_comment_count(self, obj):
-        return obj.comments.count()
+        read_only_fields = [
+            'id', 'slug', 'created_at', 'published_at',
+            'view_count', 'like_count', 'comment_count'
+        ]
 
 class BlogPostDetailSerializer(BlogPostListSerializer):
     content = serializers.SerializerMethodField()
@@ -47,19 +46,43 @@ class BlogPostDetailSerializer(BlogPostListSerializer):
     def get_content(self, obj):
         return obj.content if obj.status == BlogPost.Status.PUBLISHED else None
 
+class BlogPostSearchSerializer(BlogPostListSerializer):
+    """نتیجه‌ی جستجو؛ رتبه و متن برجسته‌شده از context['search_hits'] خوانده می‌شود"""
+    rank = serializers.SerializerMethodField()
+    title_highlight = serializers.SerializerMethodField()
+    snippet = serializers.SerializerMethodField()
+
+    class Meta(BlogPostListSerializer.Meta):
+        fields = BlogPostListSerializer.Meta.fields + ['rank', 'title_highlight', 'snippet']
+
+    def get_rank(self, obj):
+        return self.context['search_hits'][obj.id].rank
+
+    def get_title_highlight(self, obj):
+        return self.context['search_hits'][obj.id].title
+
+    def get_snippet(self, obj):
+        return self.context['search_hits'][obj.id].snippet
+
 class BlogPostCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = BlogPost
         fields = [
             'title', 'content', 'excerpt', 'category', 'tags',
-            'status', 'featured_image'
+            'status', 'featured_image', 'published_at'
         ]
 
     def validate(self, data):
-        if data.get('status') == BlogPost.Status.PUBLISHED and not data.get('content'):
+        if data.get('status') in (BlogPost.Status.PUBLISHED, BlogPost.Status.SCHEDULED) and not data.get('content'):
             raise serializers.ValidationError(
                 "برای انتشار مقاله، محتوا الزامی است."
             )
+        if data.get('status') == BlogPost.Status.SCHEDULED:
+            published_at = data.get('published_at')
+            if not published_at or published_at <= timezone.now():
+                raise serializers.ValidationError(
+                    "برای زمان‌بندی انتشار، تاریخ انتشار باید در آینده باشد."
+                )
         return data
 
 class BlogCommentSerializer(serializers.ModelSerializer):
@@ -75,9 +98,34 @@ class BlogCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
 
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return BlogCommentSerializer(obj.replies.all(), many=True).data
-        return None
+        children = self.context.get('comment_children')
+        if children is None:
+            if obj.replies.exists():
+                return BlogCommentSerializer(obj.replies.all(), many=True).data
+            return None
+
+        # درخت از قبل در BlogCommentViewSet.list ساخته شده است؛ کوئری جدیدی زده نمی‌شود
+        replies = children.get(obj.id)
+        if not replies:
+            return None
+
+        depth = self.context['depth']
+        if depth < self.context['max_depth']:
+            context = {**self.context, 'depth': depth + 1}
+        else:
+            # در آخرین سطح همه‌ی نوادگان به ترتیب زمان و بدون تودرتویی نمایش داده می‌شوند
+            replies = self._descendants(obj.id, children)
+            context = {**self.context, 'comment_children': {}}
+        return BlogCommentSerializer(replies, many=True, context=context).data
+
+    def _descendants(self, comment_id, children):
+        descendants = []
+        stack = list(children.get(comment_id, []))
+        while stack:
+            comment = stack.pop()
+            descendants.append(comment)
+            stack.extend(children.get(comment.id, []))
+        return sorted(descendants, key=lambda comment: (comment.created_at, comment.id))
 
 class BlogCommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,89 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from ..models import BlogPost, PublishedFeedEntry
+
+# کلید فید کلی؛ فیدهای دسته‌بندی و تگ با category_key و tag_key ساخته می‌شوند
+ALL = 'all'
+
+
+def category_key(category_id):
+    return f"category:{category_id}"
+
+
+def tag_key(tag_id):
+    return f"tag:{tag_id}"
+
+
+def entries(feed, using=DEFAULT_DB_ALIAS):
+    """ردیف‌های یک فید؛ مرتب‌سازی و صفحه‌بندی روی (published_at, post) انجام می‌شود"""
+    return PublishedFeedEntry.objects.using(using).filter(feed=feed)
+
+
+def _feed_keys(category_id, tag_ids):
+    keys = [ALL]
+    if category_id:
+        keys.append(category_key(category_id))
+    keys.extend(tag_key(tag_id) for tag_id in tag_ids)
+    return keys
+
+
+def sync_post(post_id, using=DEFAULT_DB_ALIAS):
+    """
+    همگام کردن ردیف‌های فید یک مقاله با وضعیت فعلی آن
+
+    فقط تفاوت‌ها نوشته می‌شود: ردیف فیدهایی که مقاله دیگر در آن‌ها نیست حذف،
+    ردیف‌های جدید اضافه و تاریخ انتشار ردیف‌های موجود در صورت تغییر به‌روز می‌شود.
+    """
+    post = BlogPost.objects.using(using).filter(pk=post_id).values(
+        'status', 'published_at', 'category_id'
+    ).first()
+
+    wanted = []
+    if post and post['status'] == BlogPost.Status.PUBLISHED and post['published_at']:
+        tag_ids = BlogPost.tags.through.objects.using(using).filter(
+            blogpost_id=post_id
+        ).values_list('blogtag_id', flat=True)
+        wanted = _feed_keys(post['category_id'], tag_ids)
+
+    current = PublishedFeedEntry.objects.using(using).filter(post_id=post_id)
+    with transaction.atomic(using=using):
+        current.exclude(feed__in=wanted).delete()
+        if not wanted:
+            return
+        current.filter(feed__in=wanted).exclude(published_at=post['published_at']).update(
+            published_at=post['published_at']
+        )
+        existing = set(current.values_list('feed', flat=True))
+        PublishedFeedEntry.objects.using(using).bulk_create(
+            [
+                PublishedFeedEntry(feed=feed, post_id=post_id, published_at=post['published_at'])
+                for feed in wanted if feed not in existing
+            ],
+            ignore_conflicts=True
+        )
+
+
+def drop_feed(feed, using=DEFAULT_DB_ALIAS):
+    """حذف کامل یک فید (مثلاً پس از حذف دسته‌بندی یا تگ)"""
+    entries(feed, using).delete()
+
+
+def rebuild(using=DEFAULT_DB_ALIAS, batch_size=1000):
+    """ساخت دوباره‌ی همه‌ی فیدها از روی مقالات منتشرشده؛ تعداد ردیف‌ها را برمی‌گرداند"""
+    posts = BlogPost.objects.using(using).filter(
+        status=BlogPost.Status.PUBLISHED, published_at__isnull=False
+    ).only('id', 'published_at', 'category_id').prefetch_related('tags')
+
+    with transaction.atomic(using=using):
+        PublishedFeedEntry.objects.using(using).all().delete()
+        batch, total = [], 0
+        for post in posts.iterator(chunk_size=batch_size):
+            for feed in _feed_keys(post.category_id, [tag.id for tag in post.tags.all()]):
+                batch.append(PublishedFeedEntry(feed=feed, post_id=post.id, published_at=post.published_at))
+            if len(batch) >= batch_size:
+                PublishedFeedEntry.objects.using(using).bulk_create(batch)
+                total += len(batch)
+                batch = []
+        PublishedFeedEntry.objects.using(using).bulk_create(batch)
+        total += len(batch)
+    return total
@@ -0,0 +1,31 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from ..models import BlogPost
+
+
+def publish_due_posts(using=DEFAULT_DB_ALIAS):
+    """
+    انتشار مقالات زمان‌بندی‌شده‌ای که زمان انتشارشان رسیده است
+
+    هر مقاله جداگانه و با قفل ردیف منتشر می‌شود تا اجرای همزمان دو نمونه یا
+    ویرایش همزمان مقاله باعث انتشار دوباره نشود. ذخیره با save انجام می‌شود تا
+    سیگنال‌ها (فید، کش پاسخ‌ها و ایندکس جستجو) هم اجرا شوند.
+    """
+    now = timezone.now()
+    due = BlogPost.objects.using(using).filter(
+        status=BlogPost.Status.SCHEDULED, published_at__lte=now
+    ).order_by('published_at').values_list('pk', flat=True)
+
+    published = []
+    for pk in list(due):
+        with transaction.atomic(using=using):
+            post = BlogPost.objects.using(using).select_for_update().filter(
+                pk=pk, status=BlogPost.Status.SCHEDULED, published_at__lte=now
+            ).first()
+            if post is None:
+                continue
+            post.status = BlogPost.Status.PUBLISHED
+            post.save(update_fields=['status', 'updated_at'])
+        published.append(post)
+    return published
@@ -0,0 +1,267 @@
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+SearchHit = namedtuple('SearchHit', ['post_id', 'rank', 'title', 'snippet'])
+
+# نشانه‌های موقت شروع و پایان برجسته‌سازی؛ پس از escape کردن متن به <mark> تبدیل می‌شوند
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+def _highlight(text):
+    if not text:
+        return ''
+    return escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+class SearchBackend:
+    """
+    ایندکس جستجوی متن کامل مقالات
+
+    ایندکس در جدول جداگانه‌ی `weblog_post_search` نگهداری می‌شود و با سیگنال‌های
+    ذخیره و حذف BlogPost همگام می‌ماند. زیرکلاس‌ها SQL مخصوص هر پایگاه داده را دارند.
+
+    جدول در زمان migrate (گیرنده‌ی post_migrate در WEBLOG.signals) یا با دستور
+    rebuild_blog_search_index ساخته می‌شود؛ مسیر درخواست‌ها و on_commit هیچ DDL اجرا نمی‌کنند.
+    """
+    table = 'weblog_post_search'
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.connection = connections[using]
+
+    def create_table(self):
+        with self.connection.cursor() as cursor:
+            for sql in self.create_sql():
+                cursor.execute(sql)
+
+    def drop_table(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def create_sql(self):
+        raise NotImplementedError
+
+    def index_post(self, post):
+        raise NotImplementedError
+
+    def remove_post(self, post_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE {self.id_column} = %s", [post_id])
+
+    def search(self, query, category=None, tag=None, published_only=True, limit=20, offset=0):
+        raise NotImplementedError
+
+    def filter_posts(self, queryset, query):
+        """
+        محدود کردن queryset مقالات به همه‌ی نتایج جستجو با یک زیرکوئری
+
+        برای جاهایی مثل جستجوی پنل مدیریت که رتبه و برجسته‌سازی لازم ندارند و
+        نباید تعداد نتایج محدود شود.
+        """
+        raise NotImplementedError
+
+    def _filters(self, category, tag, published_only):
+        """شرط‌های مشترک روی جدول مقالات (با نام مستعار p)"""
+        from ..models import BlogPost, BlogCategory, BlogTag
+
+        quote = self.connection.ops.quote_name
+        through = BlogPost.tags.through._meta
+        joins, where, params = [], [], []
+
+        if published_only:
+            where.append("p.status = %s")
+            params.append(BlogPost.Status.PUBLISHED)
+        if category:
+            joins.append(
+                f"JOIN {quote(BlogCategory._meta.db_table)} c "
+                f"ON c.id = p.{quote(BlogPost._meta.get_field('category').column)}"
+            )
+            where.append("c.slug = %s")
+            params.append(category)
+        if tag:
+            where.append(
+                f"EXISTS (SELECT 1 FROM {quote(through.db_table)} pt "
+                f"JOIN {quote(BlogTag._meta.db_table)} t ON t.id = pt.{quote(through.get_field('blogtag').column)} "
+                f"WHERE pt.{quote(through.get_field('blogpost').column)} = p.id AND t.slug = %s)"
+            )
+            params.append(tag)
+
+        return " ".join(joins), "".join(f" AND {condition}" for condition in where), params
+
+    def _post_table(self):
+        from ..models import BlogPost
+
+        return self.connection.ops.quote_name(BlogPost._meta.db_table)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """جستجو با جدول مجازی FTS5 در SQLite؛ rowid همان شناسه‌ی مقاله است"""
+    id_column = 'rowid'
+
+    def create_sql(self):
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+            f"USING fts5(title, excerpt, content, tokenize='unicode61 remove_diacritics 2')"
+        ]
+
+    def index_post(self, post):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [post.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)",
+                [post.pk, post.title, post.excerpt, post.content]
+            )
+
+    def _match(self, query):
+        terms = re.findall(r'\w+', query or '')
+        if not terms:
+            return None
+        # هر کلمه به صورت عبارت نقل‌قول‌شده تا عملگرهای FTS5 از ورودی کاربر تفسیر نشوند؛
+        # کلمه‌ی آخر پیشوندی جستجو می‌شود
+        return " ".join(f'"{term}"' for term in terms) + "*"
+
+    def search(self, query, category=None, tag=None, published_only=True, limit=20, offset=0):
+        match = self._match(query)
+        if match is None:
+            return []
+
+        joins, where, params = self._filters(category, tag, published_only)
+        sql = (
+            f"SELECT {self.table}.rowid, "
+            f"bm25({self.table}, 10.0, 4.0, 1.0) AS rank, "
+            f"highlight({self.table}, 0, %s, %s), "
+            f"snippet({self.table}, 2, %s, %s, '…', 24) "
+            f"FROM {self.table} "
+            f"JOIN {self._post_table()} p ON p.id = {self.table}.rowid {joins} "
+            f"WHERE {self.table} MATCH %s{where} "
+            f"ORDER BY rank LIMIT %s OFFSET %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [MARK_START, MARK_END, MARK_START, MARK_END, match, *params, limit, offset])
+            rows = cursor.fetchall()
+        # در bm25 عدد کمتر یعنی مرتبط‌تر؛ برای یکسانی با PostgreSQL قرینه می‌شود
+        return [SearchHit(pk, -rank, _highlight(title), _highlight(snippet)) for pk, rank, title, snippet in rows]
+
+    def filter_posts(self, queryset, query):
+        match = self._match(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match]))
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """جستجو با ستون tsvector و ایندکس GIN در PostgreSQL"""
+    id_column = 'post_id'
+
+    def create_sql(self):
+        return [
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            f"post_id bigint PRIMARY KEY, title text NOT NULL, content text NOT NULL, "
+            f"document tsvector NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS {self.table}_document ON {self.table} USING GIN (document)",
+        ]
+
+    def index_post(self, post):
+        config = settings.BLOG_SEARCH_CONFIG
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table} (post_id, title, content, document) VALUES (%s, %s, %s, "
+                f"setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                f"setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+                f"setweight(to_tsvector(%s::regconfig, %s), 'C')) "
+                f"ON CONFLICT (post_id) DO UPDATE SET title = EXCLUDED.title, "
+                f"content = EXCLUDED.content, document = EXCLUDED.document",
+                [post.pk, post.title, post.content,
+                 config, post.title, config, post.excerpt, config, post.content]
+            )
+
+    def search(self, query, category=None, tag=None, published_only=True, limit=20, offset=0):
+        if not (query or '').strip():
+            return []
+
+        config = settings.BLOG_SEARCH_CONFIG
+        title_options = f"StartSel={MARK_START}, StopSel={MARK_END}, HighlightAll=true"
+        snippet_options = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=35, MinWords=15"
+        joins, where, params = self._filters(category, tag, published_only)
+        sql = (
+            f"SELECT s.post_id, ts_rank_cd(s.document, q.query) AS rank, "
+            f"ts_headline(%s::regconfig, s.title, q.query, %s), "
+            f"ts_headline(%s::regconfig, s.content, q.query, %s) "
+            f"FROM {self.table} s "
+            f"CROSS JOIN (SELECT websearch_to_tsquery(%s::regconfig, %s) AS query) q "
+            f"JOIN {self._post_table()} p ON p.id = s.post_id {joins} "
+            f"WHERE s.document @@ q.query{where} "
+            f"ORDER BY rank DESC LIMIT %s OFFSET %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [
+                config, title_options, config, snippet_options, config, query,
+                *params, limit, offset
+            ])
+            rows = cursor.fetchall()
+        return [SearchHit(pk, rank, _highlight(title), _highlight(snippet)) for pk, rank, title, snippet in rows]
+
+    def filter_posts(self, queryset, query):
+        if not (query or '').strip():
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT post_id FROM {self.table} WHERE document @@ websearch_to_tsquery(%s::regconfig, %s)",
+            [settings.BLOG_SEARCH_CONFIG, query]
+        ))
+
+
+class FallbackSearchBackend(SearchBackend):
+    """برای پایگاه‌های داده‌ی دیگر: جستجوی ساده با icontains و بدون رتبه‌بندی"""
+
+    def create_table(self):
+        pass
+
+    def drop_table(self):
+        pass
+
+    def index_post(self, post):
+        pass
+
+    def remove_post(self, post_id):
+        pass
+
+    def search(self, query, category=None, tag=None, published_only=True, limit=20, offset=0):
+        from ..models import BlogPost
+
+        if not (query or '').split():
+            return []
+        queryset = self.filter_posts(BlogPost.objects.using(self.using), query)
+        if published_only:
+            queryset = queryset.filter(status=BlogPost.Status.PUBLISHED)
+        if category:
+            queryset = queryset.filter(category__slug=category)
+        if tag:
+            queryset = queryset.filter(tags__slug=tag)
+        rows = queryset.values_list('pk', 'title', 'excerpt')[offset:offset + limit]
+        return [SearchHit(pk, 0.0, escape(title), escape(excerpt)) for pk, title, excerpt in rows]
+
+    def filter_posts(self, queryset, query):
+        terms = (query or '').split()
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(excerpt__icontains=term) | Q(content__icontains=term)
+            )
+        return queryset
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """انتخاب پیاده‌سازی جستجو بر اساس نوع پایگاه داده"""
+    return BACKENDS.get(connections[using].vendor, FallbackSearchBackend)(using)
@@ -0,0 +1,116 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounterBuffer:
+    """
+    شمارنده‌ی بافرشده‌ی بازدید مقالات
+
+    هر بازدید فقط یک افزایش در حافظه است. افزایش‌ها وقتی مجموعشان به
+    `flush_threshold` برسد یا `flush_interval` ثانیه بگذرد با یک UPDATE
+    (view_count = view_count + n برای هر مقاله) در پایگاه داده نوشته می‌شوند.
+    """
+
+    # حداکثر تعداد مقاله در هر دستور UPDATE
+    UPDATE_CHUNK_SIZE = 500
+
+    def __init__(self, flush_threshold=500, flush_interval=10):
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def hit(self, post_id):
+        """ثبت یک بازدید؛ تعداد بازدیدهای ذخیره‌نشده‌ی این مقاله را برمی‌گرداند"""
+        with self._lock:
+            self._pending[post_id] += 1
+            self._total += 1
+            pending = self._pending[post_id]
+            should_flush = self._total >= self.flush_threshold
+
+        if should_flush:
+            self.flush()
+        else:
+            self._start_timer()
+        return pending
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def flush(self):
+        """نوشتن همه‌ی بازدیدهای بافرشده؛ تعداد مقالات به‌روزشده را برمی‌گرداند"""
+        from ..models import BlogPost
+
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, Counter()
+                self._total = 0
+            if not pending:
+                return 0
+
+            items = list(pending.items())
+            try:
+                for start in range(0, len(items), self.UPDATE_CHUNK_SIZE):
+                    chunk = items[start:start + self.UPDATE_CHUNK_SIZE]
+                    BlogPost.objects.filter(pk__in=[post_id for post_id, _ in chunk]).update(
+                        view_count=F('view_count') + Case(
+                            *[When(pk=post_id, then=Value(count)) for post_id, count in chunk],
+                            default=Value(0),
+                            output_field=PositiveIntegerField()
+                        )
+                    )
+            except Exception:
+                logger.exception("Failed to flush view counts for %d posts", len(pending))
+                # بازدیدهای ذخیره‌نشده برای تلاش بعدی برمی‌گردند
+                with self._lock:
+                    self._pending.update(dict(items[start:]))
+                    self._total += sum(count for _, count in items[start:])
+                return start
+            return len(items)
+
+    def _start_timer(self):
+        if self._timer is not None:
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Thread(target=self._run_timer, name="blog-view-flusher", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+_view_counter = None
+_view_counter_lock = threading.Lock()
+
+def get_view_counter():
+    """شمارنده‌ی مشترک پردازه که هنگام خروج پردازه تخلیه می‌شود"""
+    global _view_counter
+    if _view_counter is None:
+        with _view_counter_lock:
+            if _view_counter is None:
+                _view_counter = ViewCounterBuffer(
+                    flush_threshold=settings.BLOG_VIEW_FLUSH_THRESHOLD,
+                    flush_interval=settings.BLOG_VIEW_FLUSH_INTERVAL,
+                )
+                atexit.register(_view_counter.flush)
+    return _view_counter
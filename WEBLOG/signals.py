@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from . import cache as response_cache
+from .models import BlogPost, BlogCategory, BlogTag, BlogComment, BlogLike
+from .services import feed
+from .services.search import get_search_backend
+
+
+def create_search_table(using, **kwargs):
+    """ساخت جدول ایندکس جستجو پس از migrate؛ در WeblogConfig.ready به post_migrate وصل می‌شود"""
+    get_search_backend(using).create_table()
+
+
+@receiver(post_save, sender=BlogPost)
+def index_post(sender, instance, using, **kwargs):
+    transaction.on_commit(lambda: get_search_backend(using).index_post(instance), using=using)
+
+
+@receiver(post_delete, sender=BlogPost)
+def unindex_post(sender, instance, using, **kwargs):
+    post_id = instance.pk
+    transaction.on_commit(lambda: get_search_backend(using).remove_post(post_id), using=using)
+
+
+# گیرنده‌های فید پیش از گیرنده‌های کش ثبت می‌شوند تا کارهای on_commit آن‌ها زودتر اجرا شود
+# و پاسخ کش‌شده‌ی تازه از فید به‌روز ساخته شود
+@receiver(post_save, sender=BlogPost)
+def sync_post_feed(sender, instance, using, **kwargs):
+    # ردیف‌های فید با حذف مقاله به صورت آبشاری حذف می‌شوند؛ فقط ذخیره نیاز به همگام‌سازی دارد
+    post_id = instance.pk
+    transaction.on_commit(lambda: feed.sync_post(post_id, using), using=using)
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def sync_tag_feeds(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        post_ids = [instance.pk]
+    elif pk_set:
+        post_ids = list(pk_set)
+    else:
+        # پاک کردن همه‌ی مقالات یک تگ: فید همان تگ خالی می‌شود
+        feed_key = feed.tag_key(instance.pk)
+        transaction.on_commit(lambda: feed.drop_feed(feed_key, using), using=using)
+        return
+
+    def sync():
+        for post_id in post_ids:
+            feed.sync_post(post_id, using)
+    transaction.on_commit(sync, using=using)
+
+
+@receiver(post_delete, sender=BlogCategory)
+def drop_category_feed(sender, instance, using, **kwargs):
+    feed_key = feed.category_key(instance.pk)
+    transaction.on_commit(lambda: feed.drop_feed(feed_key, using), using=using)
+
+
+@receiver(post_delete, sender=BlogTag)
+def drop_tag_feed(sender, instance, using, **kwargs):
+    feed_key = feed.tag_key(instance.pk)
+    transaction.on_commit(lambda: feed.drop_feed(feed_key, using), using=using)
+
+
+def _invalidate_on_commit(using, *tags):
+    transaction.on_commit(lambda: response_cache.invalidate(*tags), using=using)
+
+
+@receiver(pre_save, sender=BlogPost)
+def remember_old_slug(sender, instance, using, **kwargs):
+    # اگر اسلاگ عوض شود، پاسخ کش‌شده‌ی آدرس قبلی هم باید باطل شود
+    if instance.pk:
+        instance._old_slug = sender.objects.using(using).filter(pk=instance.pk).values_list('slug', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=BlogPost)
+def invalidate_post_responses(sender, instance, using, **kwargs):
+    tags = {response_cache.POSTS, response_cache.post_tag(instance.slug)}
+    if getattr(instance, '_old_slug', None):
+        tags.add(response_cache.post_tag(instance._old_slug))
+    _invalidate_on_commit(using, *tags)
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def invalidate_post_tags(sender, instance, action, using, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, BlogPost):
+        _invalidate_on_commit(using, response_cache.POSTS, response_cache.post_tag(instance.slug))
+    else:
+        _invalidate_on_commit(using, response_cache.POSTS, response_cache.TAGS)
+
+
+@receiver([post_save, post_delete], sender=BlogCategory)
+def invalidate_category_responses(sender, using, **kwargs):
+    _invalidate_on_commit(using, response_cache.CATEGORIES)
+
+
+@receiver([post_save, post_delete], sender=BlogTag)
+def invalidate_tag_responses(sender, using, **kwargs):
+    _invalidate_on_commit(using, response_cache.TAGS)
+
+
+@receiver([post_save, post_delete], sender=BlogComment)
+@receiver([post_save, post_delete], sender=BlogLike)
+def invalidate_post_counters(sender, instance, using, **kwargs):
+    # تعداد نظر و لایک در پاسخ لیست و جزئیات مقاله نمایش داده می‌شود
+    slug = BlogPost.objects.using(using).filter(pk=instance.post_id).values_list('slug', flat=True).first()
+    tags = [response_cache.POSTS]
+    if slug:
+        tags.append(response_cache.post_tag(slug))
+    _invalidate_on_commit(using, *tags)
+
@@ -1,3 +1,553 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from finalkelasor.images import ImageVariantPipeline
+from finalkelasor.testing import QueryPlanAssertionsMixin
+from USER.models import User
+
+from .admin import BlogPostAdmin
+from .checks import check_response_cache
+from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike, PublishedFeedEntry
+from .pagination import PostCursorPagination
+from .services import feed
+from .services.publishing import publish_due_posts
+from .services.view_counter import ViewCounterBuffer
+from .views import BlogCommentViewSet, BlogLikeViewSet, BlogPostViewSet
+
+
+def _user(index, **extra):
+    return User.objects.create_user(
+        phone=f"0912{index:07d}", password='password', first_name='a', last_name='b',
+        national_id=f"{index:010d}", gender='male', **extra
+    )
+
+
+def _post(slug='post', **extra):
+    extra.setdefault('status', BlogPost.Status.PUBLISHED)
+    extra.setdefault('title', f"مقاله {slug}")
+    extra.setdefault('content', "متن مقاله")
+    return BlogPost.objects.create(slug=slug, **extra)
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class IndexUsageTests(QueryPlanAssertionsMixin, TestCase):
+    """کوئری‌های اصلی فهرست‌های وبلاگ باید از ایندکس‌های Meta.indexes استفاده کنند"""
+
+    def test_post_list_uses_status_index(self):
+        queryset = BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED).order_by(
+            F('published_at').desc(nulls_last=True), '-id'
+        )
+        self.assertUsesIndex(queryset, 'weblog_post_status_pub_idx')
+
+    def test_scheduled_posts_use_status_index(self):
+        queryset = BlogPost.objects.filter(status=BlogPost.Status.SCHEDULED, published_at__lte=timezone.now())
+        self.assertUsesIndex(queryset, 'weblog_post_status_pub_idx')
+
+    def test_comment_list_uses_approved_index(self):
+        queryset = BlogComment.objects.filter(post_id=1, is_approved=True).order_by('created_at', 'id')
+        self.assertUsesIndex(queryset, 'weblog_comment_approved_idx')
+
+    def test_feed_uses_order_index(self):
+        # همان مرتب‌سازی‌ای که PostCursorPagination برای فید می‌سازد
+        queryset = PostCursorPagination().order_queryset(feed.entries(feed.ALL), pk_field='post_id')
+        self.assertUsesIndex(queryset, 'weblog_feed_order_idx')
+
+
+# کش پاسخ درون‌پردازه‌ای است تا بودجه فقط کوئری‌های خود view را بشمارد، نه کوئری‌های DatabaseCache
+@override_settings(QUERY_BUDGET_ENFORCE=True, BLOG_RESPONSE_CACHE_ALIAS='default')
+class QueryBudgetTests(TestCase):
+    """فهرست و جزئیات مقالات با هر تعداد مقاله باید در بودجه‌ی کوئری BlogPostViewSet بماند"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            phone='09120000001', password='password', first_name='a', last_name='b',
+            national_id='0000000001', gender='male'
+        )
+        cls.staff = User.objects.create_user(
+            phone='09120000002', password='password', first_name='c', last_name='d',
+            national_id='0000000002', gender='male', is_staff=True
+        )
+        category = BlogCategory.objects.create(title="دسته", slug='category')
+        tags = [BlogTag.objects.create(name=f"تگ {index}", slug=f'tag-{index}') for index in range(3)]
+        for index in range(15):
+            post = BlogPost.objects.create(
+                title=f"مقاله {index}", slug=f'post-{index}', content="متن", category=category,
+                author=cls.staff, status=BlogPost.Status.PUBLISHED
+            )
+            post.tags.set(tags)
+        feed.rebuild()
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+
+    def get(self, action, user, path='/WEBLOG/posts/', **kwargs):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=user)
+        return BlogPostViewSet.as_view({'get': action})(request, **kwargs)
+
+    def test_list_within_budget(self):
+        for path in ('/WEBLOG/posts/', '/WEBLOG/posts/?category=category', '/WEBLOG/posts/?tag=tag-1'):
+            for user in (self.user, self.staff):
+                response = self.get('list', user, path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), 15)
+
+    def test_retrieve_within_budget(self):
+        response = self.get('retrieve', self.user, '/WEBLOG/posts/post-1/', slug='post-1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['tags']), 3)
+
+
+class CounterTests(TestCase):
+    """شمارنده‌های لایک و نظر با UPDATE اتمیک تغییر می‌کنند و ذخیره‌ی کامل آن‌ها را بازنویسی نمی‌کند"""
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        self.user = _user(1)
+        self.post = _post()
+
+    def test_like_and_comment_adjust_counters(self):
+        client = _client(self.user)
+        client.post('/WEBLOG/posts/post/likes/')
+        client.post('/WEBLOG/posts/post/comments/', {'content': "نظر"})
+        parent = BlogComment.objects.get()
+        client.post('/WEBLOG/posts/post/comments/', {'content': "پاسخ", 'parent': parent.pk})
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 2))
+
+        # حذف نظر پاسخ‌هایش را هم حذف و از شمارنده کم می‌کند
+        BlogComment.objects.update(is_approved=True)
+        client.delete(f'/WEBLOG/posts/post/comments/{parent.pk}/')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+
+    def test_full_save_of_stale_instance_keeps_counters(self):
+        stale = BlogPost.objects.get(pk=self.post.pk)
+        _client(self.user).post('/WEBLOG/posts/post/likes/')
+        BlogPost.objects.filter(pk=self.post.pk).update(view_count=F('view_count') + 7)
+
+        stale.title = "عنوان تازه"
+        stale.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.like_count, self.post.view_count), ("عنوان تازه", 1, 7))
+
+    def test_unpublish_keeps_counters(self):
+        staff = _user(2, is_staff=True)
+        BlogPost.adjust_counter(self.post.pk, 'like_count', 3)
+        self.assertEqual(_client(staff).post('/WEBLOG/posts/post/unpublish/').status_code, 200)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.status, self.post.like_count), (BlogPost.Status.DRAFT, 3))
+
+    def test_reconcile_fixes_drifted_counters(self):
+        BlogLike.objects.create(post=self.post, user=self.user)
+        BlogPost.objects.filter(pk=self.post.pk).update(like_count=5, comment_count=2)
+        call_command('reconcile_blog_counters', stdout=io.StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 0))
+
+
+class ViewCounterBufferTests(TestCase):
+    """بازدیدها در حافظه جمع و با یک UPDATE برای همه‌ی مقالات نوشته می‌شوند"""
+
+    def setUp(self):
+        self.posts = [_post('first'), _post('second')]
+        self.buffer = ViewCounterBuffer(flush_threshold=5, flush_interval=3600)
+        patcher = mock.patch.object(self.buffer, '_start_timer')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _view_counts(self):
+        return list(BlogPost.objects.order_by('pk').values_list('view_count', flat=True))
+
+    def test_hits_are_buffered_until_threshold(self):
+        first, second = self.posts
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                self.buffer.hit(first.pk)
+            self.assertEqual(self.buffer.hit(second.pk), 1)
+        self.assertEqual((self.buffer.pending(first.pk), self._view_counts()), (3, [0, 0]))
+
+        with self.assertNumQueries(1):
+            self.buffer.hit(second.pk)
+        self.assertEqual((self.buffer.pending(first.pk), self._view_counts()), (0, [3, 2]))
+
+    def test_view_action_counts_buffered_hits(self):
+        with mock.patch('WEBLOG.services.view_counter.get_view_counter', return_value=self.buffer):
+            response = APIClient().get('/WEBLOG/posts/first/view/')
+            response = APIClient().get('/WEBLOG/posts/first/view/')
+        self.assertEqual(response.data, {'view_count': 2})
+
+    def test_failed_flush_keeps_hits_for_next_try(self):
+        for post in self.posts:
+            self.buffer.hit(post.pk)
+        with mock.patch.object(BlogPost.objects, 'filter', side_effect=DatabaseError), \
+                self.assertLogs('WEBLOG.services.view_counter', 'ERROR'):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.pending(self.posts[0].pk), 1)
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self._view_counts(), [1, 1])
+
+
+class CommentThreadTests(TestCase):
+    """درخت نظرات با یک کوئری ساخته می‌شود و پاسخ‌های عمیق در آخرین سطح تخت می‌شوند"""
+
+    def setUp(self):
+        self.user = _user(1)
+        self.post = _post()
+
+    def _comment(self, content, parent=None, is_approved=True):
+        return BlogComment.objects.create(
+            post=self.post, author=self.user, content=content, parent=parent, is_approved=is_approved
+        )
+
+    def _thread(self):
+        with mock.patch.object(BlogCommentViewSet, 'max_depth', 2):
+            return APIClient().get('/WEBLOG/posts/post/comments/').data['results']
+
+    def test_thread_is_built_with_single_query(self):
+        for index in range(3):
+            root = self._comment(f"نظر {index}")
+            self._comment(f"پاسخ {index}", parent=root)
+        # یک کوئری برای همه‌ی نظرات همراه با نویسنده؛ صفحه‌بندی روی فهرست در حافظه است
+        with self.assertNumQueries(1):
+            results = self._thread()
+        self.assertEqual([item['content'] for item in results], ["نظر 2", "نظر 1", "نظر 0"])
+        self.assertEqual(results[0]['replies'][0]['content'], "پاسخ 2")
+
+    def test_deep_replies_are_flattened_at_max_depth(self):
+        root = self._comment("ریشه")
+        child = self._comment("سطح ۲", parent=root)
+        grandchild = self._comment("سطح ۳", parent=child)
+        self._comment("سطح ۴", parent=grandchild)
+
+        child_data = self._thread()[0]['replies'][0]
+        self.assertEqual([item['content'] for item in child_data['replies']], ["سطح ۳", "سطح ۴"])
+        self.assertEqual([item['replies'] for item in child_data['replies']], [None, None])
+
+    def test_replies_of_unapproved_comments_are_hidden(self):
+        hidden = self._comment("در انتظار تایید", is_approved=False)
+        self._comment("پاسخ پنهان", parent=hidden)
+        self._comment("نظر")
+        self.assertEqual([item['content'] for item in self._thread()], ["نظر"])
+
+
+class CursorPaginationTests(TestCase):
+    """صفحه‌بندی کلیدی بدون تکرار یا جا افتادن ردیف، حتی با تاریخ انتشار یکسان"""
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        same_time = timezone.now() - timedelta(days=1)
+        self.posts = [
+            _post(f'post-{index}', published_at=same_time - timedelta(hours=index // 2))
+            for index in range(5)
+        ]
+        _post('draft', status=BlogPost.Status.DRAFT)
+        for post in self.posts:
+            feed.sync_post(post.pk)
+
+    def _walk(self, client, url):
+        slugs = []
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            slugs.extend(item['slug'] for item in response.data['results'])
+            url = response.data['next']
+        return slugs
+
+    def _expected(self, posts):
+        ordered = sorted(posts, key=lambda post: (post.published_at, post.pk), reverse=True)
+        return [post.slug for post in ordered]
+
+    def test_public_feed_pages(self):
+        slugs = self._walk(APIClient(), '/WEBLOG/posts/?page_size=2')
+        self.assertEqual(slugs, self._expected(self.posts))
+
+    def test_drafts_come_last_for_staff(self):
+        slugs = self._walk(_client(_user(1, is_staff=True)), '/WEBLOG/posts/?page_size=2')
+        self.assertEqual(slugs, self._expected(self.posts) + ['draft'])
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(APIClient().get('/WEBLOG/posts/?cursor=bad').status_code, 404)
+
+
+class SearchTests(TestCase):
+    """جستجوی متن کامل: ایندکس با on_commit، رتبه‌بندی و برجسته‌سازی، بدون DDL در زمان درخواست"""
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.match = _post('django', title="آموزش جنگو", content="جنگو چارچوب وب پایتون است")
+            _post('python', title="پایتون", content="زبان برنامه‌نویسی")
+            self.draft = _post('draft', title="پیش‌نویس جنگو", status=BlogPost.Status.DRAFT)
+
+    def _search(self, client, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/WEBLOG/posts/search/', {'q': query})
+        self.assertFalse([query for query in queries if query['sql'].lstrip().upper().startswith('CREATE')])
+        return response
+
+    def test_published_hits_are_highlighted(self):
+        response = self._search(APIClient(), "جنگو")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['slug'] for item in response.data['results']], ['django'])
+        self.assertIn('<mark>', response.data['results'][0]['title_highlight'])
+
+    def test_staff_also_find_drafts(self):
+        response = self._search(_client(_user(1, is_staff=True)), "جنگو")
+        self.assertEqual({item['slug'] for item in response.data['results']}, {'django', 'draft'})
+
+    def test_deleted_post_leaves_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.match.delete()
+        self.assertEqual(self._search(APIClient(), "جنگو").data['results'], [])
+
+    def test_rebuild_command_recreates_index(self):
+        call_command('rebuild_blog_search_index', stdout=io.StringIO())
+        self.assertEqual(len(self._search(APIClient(), "جنگو").data['results']), 1)
+
+    def test_admin_search_is_not_capped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(3):
+                _post(f'extra-{index}', title=f"جنگو {index}")
+        queryset, may_have_duplicates = BlogPostAdmin(BlogPost, admin.site).get_search_results(
+            None, BlogPost.objects.all(), "جنگو"
+        )
+        self.assertFalse(may_have_duplicates)
+        self.assertEqual(queryset.count(), 5)
+
+
+class ConditionalResponseTests(TestCase):
+    """Last-Modified پاسخ کش‌شده با لایک و نظر هم جلو می‌رود، نه فقط با updated_at"""
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        self.user = _user(1)
+        self.post = _post()
+        BlogPost.objects.filter(pk=self.post.pk).update(updated_at=timezone.now() - timedelta(days=2))
+
+    def test_like_invalidates_if_modified_since(self):
+        day_ago = time.time_ns() - 24 * 3600 * 10 ** 9
+        with mock.patch('WEBLOG.cache.time.time_ns', return_value=day_ago):
+            first = APIClient().get('/WEBLOG/posts/post/')
+        cached = APIClient().get('/WEBLOG/posts/post/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(cached.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            _client(self.user).post('/WEBLOG/posts/post/likes/')
+
+        response = APIClient().get('/WEBLOG/posts/post/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual((response.status_code, response.data['like_count']), (200, 1))
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(
+            APIClient().get('/WEBLOG/posts/post/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'blog.example.com'])
+    def test_absolute_links_follow_request_host(self):
+        _post('second')
+        feed.rebuild()
+        APIClient().get('/WEBLOG/posts/', {'page_size': 1})
+        response = APIClient().get('/WEBLOG/posts/', {'page_size': 1}, HTTP_HOST='blog.example.com')
+        self.assertTrue(response.data['next'].startswith('http://blog.example.com/'))
+
+    def test_process_local_response_cache_is_an_error(self):
+        with override_settings(CACHES={'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([error.id for error in check_response_cache(None)], ['WEBLOG.E001'])
+        self.assertEqual(check_response_cache(None), [])
+
+
+class ImageVariantTests(TestCase):
+    """نسخه‌های تصویر شاخص پس از commit ساخته و با عوض شدن تصویر حذف می‌شوند"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        pipeline = ImageVariantPipeline({'thumbnail': (40, 40)}, workers=0)
+        patcher = mock.patch('finalkelasor.images.get_image_pipeline', return_value=pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage = BlogPost._meta.get_field('featured_image').storage
+
+    def _image(self, name, size=(120, 80)):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, format='PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def _variants(self, post):
+        return BlogPost.objects.values_list('featured_image_variants', flat=True).get(pk=post.pk)
+
+    def test_upload_builds_variants_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = _post(featured_image=self._image('cover.png'))
+        path = self._variants(post)['thumbnail']
+        with self.storage.open(path) as variant:
+            self.assertEqual(Image.open(variant).size, (40, 27))
+
+    def test_replaced_image_deletes_old_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = _post(featured_image=self._image('first.png'))
+        # نمونه‌ای که پیش از نوشته شدن نسخه‌ها بارگذاری شده هم نسخه‌های قبلی را پیدا می‌کند
+        stale = BlogPost.objects.get(pk=post.pk)
+        stale.featured_image_variants = {}
+        old_path = self._variants(post)['thumbnail']
+
+        stale.featured_image = self._image('second.png')
+        with self.captureOnCommitCallbacks(execute=True):
+            stale.save()
+
+        self.assertFalse(self.storage.exists(old_path))
+        new_path = self._variants(post)['thumbnail']
+        self.assertNotEqual(new_path, old_path)
+        self.assertTrue(self.storage.exists(new_path))
+
+    def test_cleared_image_deletes_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = _post(featured_image=self._image('cover.png'))
+        post.refresh_from_db()
+        old_path = post.featured_image_variants['thumbnail']
+
+        post.featured_image = None
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save(update_fields=['featured_image'])
+
+        self.assertFalse(self.storage.exists(old_path))
+        self.assertEqual(self._variants(post), {})
+
+    def test_ready_variants_invalidate_cached_responses(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        with mock.patch('finalkelasor.images.get_image_pipeline'), self.captureOnCommitCallbacks(execute=True):
+            post = _post(featured_image=self._image('cover.png'))
+        self.assertEqual(APIClient().get('/WEBLOG/posts/post/').data['featured_image_variants'], {})
+        self.assertEqual(APIClient().get('/WEBLOG/posts/').data['results'][0]['featured_image_variants'], {})
+
+        ImageVariantPipeline({'thumbnail': (40, 40)}, workers=0).process(
+            BlogPost, post.pk, 'featured_image', 'featured_image_variants'
+        )
+        for path in ('/WEBLOG/posts/post/', '/WEBLOG/posts/'):
+            response = APIClient().get(path)
+            item = response.data if 'slug' in response.data else response.data['results'][0]
+            self.assertIn('thumbnail', item['featured_image_variants'])
+
+
+class LikeTests(TestCase):
+    """لایک تکراری و برداشتن دوباره‌ی لایک خطا نمی‌دهند و شمارنده را فقط یک بار تغییر می‌دهند"""
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        self.client = _client(_user(1))
+        self.post = _post()
+
+    def test_like_is_idempotent(self):
+        first = self.client.post('/WEBLOG/posts/post/likes/')
+        second = self.client.post('/WEBLOG/posts/post/likes/')
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(second.data, {'liked': True, 'like_count': 1})
+
+        for _ in range(2):
+            response = self.client.delete('/WEBLOG/posts/post/likes/')
+        self.assertEqual(response.data, {'liked': False, 'like_count': 0})
+
+    def test_liked_lists_state_per_post(self):
+        other = _post('other')
+        self.client.post('/WEBLOG/posts/post/likes/')
+        response = self.client.get('/WEBLOG/posts/liked/', {'ids': f"{self.post.pk},{other.pk}"})
+        self.assertEqual(response.data, {str(self.post.pk): True, str(other.pk): False})
+
+    def test_post_deleted_during_like_is_not_found(self):
+        # مقاله بین خواندن شناسه و درج لایک حذف شده است
+        with mock.patch.object(BlogLikeViewSet, '_get_post_id', return_value=self.post.pk + 1000), \
+                mock.patch.object(BlogLike.objects, 'create', side_effect=IntegrityError):
+            response = self.client.post('/WEBLOG/posts/post/likes/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_action_names_are_reserved_slugs(self):
+        for slug in ('search', 'liked'):
+            post = BlogPost(title="عنوان", slug=slug, content="متن")
+            with self.assertRaises(ValidationError) as raised:
+                post.full_clean()
+            self.assertEqual(raised.exception.error_dict['slug'][0].code, 'reserved')
+
+
+class ScheduledPublishingTests(TestCase):
+    """انتشار زمان‌بندی‌شده و همگام ماندن فید مادی‌شده با وضعیت مقاله"""
+
+    def setUp(self):
+        caches[settings.BLOG_RESPONSE_CACHE_ALIAS].clear()
+        self.staff = _client(_user(1, is_staff=True))
+        self.tag = BlogTag.objects.create(name="جنگو", slug='django')
+        self.post = _post(status=BlogPost.Status.DRAFT)
+
+    def _public_slugs(self, **params):
+        return [item['slug'] for item in APIClient().get('/WEBLOG/posts/', params).data['results']]
+
+    def test_future_publish_is_scheduled_until_due(self):
+        published_at = timezone.now() + timedelta(hours=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.staff.post('/WEBLOG/posts/post/publish/', {'published_at': published_at.isoformat()})
+            self.post.tags.add(self.tag)
+        self.assertEqual(response.data['published_at'], published_at)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, BlogPost.Status.SCHEDULED)
+        self.assertEqual(publish_due_posts(), [])
+        self.assertEqual(self._public_slugs(), [])
+
+        BlogPost.objects.filter(pk=self.post.pk).update(published_at=timezone.now() - timedelta(minutes=1))
+        stdout = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('publish_scheduled_posts', stdout=stdout)
+        self.assertIn('post', stdout.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, BlogPost.Status.PUBLISHED)
+        self.assertEqual((self._public_slugs(), self._public_slugs(tag='django')), (['post'], ['post']))
+
+    def test_unpublish_and_tag_removal_update_feeds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.staff.post('/WEBLOG/posts/post/publish/')
+            self.post.tags.add(self.tag)
+        self.assertEqual(
+            set(feed.entries(feed.tag_key(self.tag.pk)).values_list('post_id', flat=True)), {self.post.pk}
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.tags.remove(self.tag)
+        self.assertFalse(feed.entries(feed.tag_key(self.tag.pk)).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.staff.post('/WEBLOG/posts/post/unpublish/')
+        self.assertFalse(feed.entries(feed.ALL).exists())
+
+    def test_rebuild_feed_restores_entries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.staff.post('/WEBLOG/posts/post/publish/')
+        PublishedFeedEntry.objects.all().delete()
+        call_command('rebuild_blog_feed', stdout=io.StringIO())
+        self.assertEqual(self._public_slugs(), ['post'])
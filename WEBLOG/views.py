@@ -1,9 +1,11 @@
-from rest_framework import viewsets, permissions, status
+from rest_framework import viewsets, permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from collections import defaultdict
 
 from .models import BlogCategory, BlogTag, BlogPost, BlogComment, BlogLike
 from .serializers import (
@@ -11,28 +13,55 @@ from .serializers import (
     BlogTagSerializer,
     BlogPostListSerializer,
     BlogPostDetailSerializer,
+    BlogPostSearchSerializer,
     BlogPostCreateUpdateSerializer,
     BlogCommentSerializer,
     BlogCommentCreateSerializer,
     BlogLikeSerializer
 )
+from .pagination import CommentThreadPagination, PostCursorPagination
+from . import cache as response_cache
+from .cache import CachedResponseMixin
+from finalkelasor.metrics import QueryBudgetMixin
+from .services import feed
+from .services.search import get_search_backend
 
-class BlogCategoryViewSet(viewsets.ModelViewSet):
+class BlogCategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = BlogCategory.objects.all()
+    cache_tags = [response_cache.CATEGORIES]
     serializer_class = BlogCategorySerializer
     permission_classes = [permissions.IsAdminUser]
     lookup_field = 'slug'
 
-class BlogTagViewSet(viewsets.ModelViewSet):
+class BlogTagViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = BlogTag.objects.all()
+    cache_tags = [response_cache.TAGS]
     serializer_class = BlogTagSerializer
     permission_classes = [permissions.IsAdminUser]
     lookup_field = 'slug'
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+class BlogPostViewSet(QueryBudgetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'
+    pagination_class = PostCursorPagination
+    query_budget = {'list': 5, 'retrieve': 3, 'liked': 1}
+    cache_tags = [response_cache.CATEGORIES, response_cache.TAGS]
+    object_cache_tag = staticmethod(response_cache.post_tag)
+    # ستون‌هایی که BlogPostListSerializer لازم دارد؛ content در فهرست خوانده نمی‌شود
+    list_fields = [
+        'id', 'title', 'slug', 'excerpt', 'category', 'author', 'status',
+        'featured_image', 'featured_image_variants', 'published_at', 'created_at', 'updated_at',
+        'view_count', 'like_count', 'comment_count'
+    ]
+    # حداکثر تعداد شناسه در اکشن liked
+    liked_batch_size = 100
+
+    def get_cache_tags(self):
+        tags = super().get_cache_tags()
+        if self.action == 'list':
+            tags.append(response_cache.POSTS)
+        return tags
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -45,15 +74,18 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         if not self.request.user.is_staff:
             queryset = queryset.filter(status=BlogPost.Status.PUBLISHED)
-        
+
+        # در فهرست عمومی فیلتر دسته‌بندی و تگ از فید مادی‌شده خوانده می‌شود (paginate_queryset)
+        use_feed = self.get_feed_key() is not None
+
         # فیلتر بر اساس دسته‌بندی
         category_slug = self.request.query_params.get('category')
-        if category_slug:
+        if category_slug and not use_feed:
             queryset = queryset.filter(category__slug=category_slug)
         
         # فیلتر بر اساس تگ
         tag_slug = self.request.query_params.get('tag')
-        if tag_slug:
+        if tag_slug and not use_feed:
             queryset = queryset.filter(tags__slug=tag_slug)
         
         # فیلتر بر اساس نویسنده
@@ -61,20 +93,63 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if author_id:
             queryset = queryset.filter(author__id=author_id)
         
-        return queryset.annotate(
-            like_count=Count('likes'),
-            comment_count=Count('comments')
+        if self.action == 'list':
+            queryset = queryset.only(*self.list_fields)
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.select_related('category', 'author').prefetch_related('tags')
+        
+        return queryset
+
+    def get_feed_key(self):
+        """کلید فید مادی‌شده برای فهرست عمومی؛ None یعنی فهرست از جدول مقالات ساخته شود"""
+        if self.action != 'list' or self.request.user.is_staff:
+            return None
+        if hasattr(self, '_feed_key'):
+            return self._feed_key
+
+        params = self.request.query_params
+        category_slug, tag_slug = params.get('category'), params.get('tag')
+        if params.get('author') or (category_slug and tag_slug):
+            self._feed_key = None
+        elif category_slug:
+            category_id = BlogCategory.objects.filter(slug=category_slug).values_list('id', flat=True).first()
+            self._feed_key = feed.category_key(category_id)
+        elif tag_slug:
+            tag_id = BlogTag.objects.filter(slug=tag_slug).values_list('id', flat=True).first()
+            self._feed_key = feed.tag_key(tag_id)
+        else:
+            self._feed_key = feed.ALL
+        return self._feed_key
+
+    def paginate_queryset(self, queryset):
+        feed_key = self.get_feed_key()
+        if feed_key is None:
+            return super().paginate_queryset(queryset)
+
+        # یک خواندن بازه‌ای از ایندکس فید و سپس خواندن همان مقالات با کلید اصلی
+        entries = self.paginator.paginate_queryset(
+            feed.entries(feed_key), self.request, view=self, pk_field='post_id'
         )
+        posts = queryset.in_bulk([entry.post_id for entry in entries])
+        page = [posts[entry.post_id] for entry in entries if entry.post_id in posts]
+        self.remember_last_modified(page)
+        return page
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
     def publish(self, request, slug=None):
+        """انتشار مقاله؛ با published_at آینده انتشار زمان‌بندی می‌شود"""
         post = self.get_object()
+        published_at = request.data.get('published_at')
         post.status = BlogPost.Status.PUBLISHED
-        post.published_at = timezone.now()
+        post.published_at = (
+            serializers.DateTimeField().to_internal_value(published_at) if published_at else timezone.now()
+        )
         post.save()
+        if post.status == BlogPost.Status.SCHEDULED:
+            return Response({'status': 'انتشار مقاله زمان‌بندی شد.', 'published_at': post.published_at})
         return Response({'status': 'مقاله منتشر شد.'})
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
@@ -84,15 +159,76 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         post.save()
         return Response({'status': 'مقاله به پیش نویس تغییر یافت.'})
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """جستجوی متن کامل با رتبه‌بندی، برجسته‌سازی و فیلتر دسته‌بندی/تگ"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'detail': 'عبارت جستجو (q) الزامی است.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response(
+                {'detail': 'مقدار limit یا offset نامعتبر است.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        hits = get_search_backend().search(
+            query,
+            category=request.query_params.get('category'),
+            tag=request.query_params.get('tag'),
+            published_only=not request.user.is_staff,
+            limit=limit,
+            offset=offset
+        )
+        hits_by_id = {hit.post_id: hit for hit in hits}
+        posts = BlogPost.objects.filter(pk__in=hits_by_id).only(*self.list_fields).select_related(
+            'category', 'author'
+        ).prefetch_related('tags').in_bulk()
+
+        context = self.get_serializer_context()
+        context['search_hits'] = hits_by_id
+        results = [posts[hit.post_id] for hit in hits if hit.post_id in posts]
+        return Response({
+            'results': BlogPostSearchSerializer(results, many=True, context=context).data
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def liked(self, request):
+        """وضعیت «لایک‌شده توسط من» برای چند مقاله با یک کوئری: ?ids=1,2,3"""
+        try:
+            ids = {int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()}
+        except ValueError:
+            return Response(
+                {'detail': 'پارامتر ids باید فهرستی از شناسه‌های عددی جدا شده با کاما باشد.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > self.liked_batch_size:
+            return Response(
+                {'detail': f'حداکثر {self.liked_batch_size} شناسه در هر درخواست مجاز است.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        liked_ids = set(
+            BlogLike.objects.filter(user=request.user, post_id__in=ids).values_list('post_id', flat=True)
+        )
+        return Response({str(post_id): post_id in liked_ids for post_id in sorted(ids)})
+
     @action(detail=True, methods=['get'])
     def view(self, request, slug=None):
         post = self.get_object()
-        post.increase_view_count()
-        return Response({'view_count': post.view_count})
+        return Response({'view_count': post.increase_view_count()})
 
 class BlogCommentViewSet(viewsets.ModelViewSet):
     serializer_class = BlogCommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentThreadPagination
+    # پاسخ‌های عمیق‌تر از این سطح زیر آخرین سطح به صورت تخت نمایش داده می‌شوند
+    max_depth = 5
 
     def get_queryset(self):
         return BlogComment.objects.filter(
@@ -101,6 +237,36 @@ class BlogCommentViewSet(viewsets.ModelViewSet):
             parent__isnull=True
         )
 
+    def list(self, request, *args, **kwargs):
+        # همه‌ی نظرات تاییدشده‌ی مقاله با یک کوئری؛ درخت در حافظه ساخته می‌شود
+        comments = list(
+            BlogComment.objects.filter(
+                post__slug=self.kwargs['post_slug'],
+                is_approved=True
+            ).select_related('author').order_by('created_at', 'id')
+        )
+        approved_ids = {comment.id for comment in comments}
+
+        roots = []
+        children = defaultdict(list)
+        for comment in comments:
+            if comment.parent_id is None:
+                roots.append(comment)
+            elif comment.parent_id in approved_ids:
+                # پاسخ‌های نظرهای تاییدنشده همراه با خود نظر پنهان می‌مانند
+                children[comment.parent_id].append(comment)
+        roots.reverse()
+
+        context = self.get_serializer_context()
+        context.update(comment_children=children, depth=1, max_depth=self.max_depth)
+
+        page = self.paginate_queryset(roots)
+        if page is not None:
+            return self.get_paginated_response(
+                BlogCommentSerializer(page, many=True, context=context).data
+            )
+        return Response(BlogCommentSerializer(roots, many=True, context=context).data)
+
     def get_serializer_class(self):
         if self.action in ['create', 'update']:
             return BlogCommentCreateSerializer
@@ -108,10 +274,20 @@ class BlogCommentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         post = get_object_or_404(BlogPost, slug=self.kwargs['post_slug'])
-        serializer.save(
-            author=self.request.user,
-            post=post
-        )
+        with transaction.atomic():
+            serializer.save(
+                author=self.request.user,
+                post=post
+            )
+            BlogPost.adjust_counter(post.id, 'comment_count', 1)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # پاسخ‌های نظر هم به صورت آبشاری حذف می‌شوند
+            _, deleted = instance.delete()
+            BlogPost.adjust_counter(
+                instance.post_id, 'comment_count', -deleted.get(BlogComment._meta.label, 0)
+            )
 
 class BlogLikeViewSet(viewsets.ModelViewSet):
     serializer_class = BlogLikeSerializer
@@ -123,11 +299,39 @@ class BlogLikeViewSet(viewsets.ModelViewSet):
             user=self.request.user
         )
 
-    def perform_create(self, serializer):
-        post = get_object_or_404(BlogPost, slug=self.kwargs['post_slug'])
-        if BlogLike.objects.filter(post=post, user=self.request.user).exists():
-            return Response(
-                {'detail': 'شما قبلاً این مقاله را لایک کرده‌اید.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        serializer.save(user=self.request.user, post=post)
+    def create(self, request, *args, **kwargs):
+        """لایک کردن مقاله؛ تکرار درخواست خطا نمی‌دهد و شمارنده را دوباره زیاد نمی‌کند"""
+        post_id = self._get_post_id()
+        try:
+            # درج مستقیم در یک savepoint؛ unique_together از لایک تکراری (حتی همزمان) جلوگیری می‌کند
+            with transaction.atomic():
+                BlogLike.objects.create(post_id=post_id, user=request.user)
+                BlogPost.adjust_counter(post_id, 'like_count', 1)
+        except IntegrityError:
+            # خطای یکتایی یعنی لایک از قبل ثبت شده؛ در غیر این صورت (مثلاً حذف همزمان مقاله) مقاله‌ای نیست
+            if not BlogLike.objects.filter(post_id=post_id, user=request.user).exists():
+                raise NotFound()
+            created = False
+        else:
+            created = True
+        return self._like_state(post_id, True, status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    def destroy(self, request, *args, **kwargs):
+        """برداشتن لایک؛ اگر لایکی وجود نداشته باشد هم پاسخ موفق برمی‌گرداند"""
+        post_id = self._get_post_id()
+        with transaction.atomic():
+            deleted, _ = BlogLike.objects.filter(post_id=post_id, user=request.user).delete()
+            if deleted:
+                BlogPost.adjust_counter(post_id, 'like_count', -deleted)
+        return self._like_state(post_id, False, status.HTTP_200_OK)
+
+    def _get_post_id(self):
+        return get_object_or_404(
+            BlogPost.objects.values_list('id', flat=True), slug=self.kwargs['post_slug']
+        )
+
+    def _like_state(self, post_id, liked, status_code):
+        like_count = BlogPost.objects.filter(pk=post_id).values_list('like_count', flat=True).first()
+        if like_count is None:
+            raise NotFound()
+        return Response({'liked': liked, 'like_count': like_count}, status=status_code)
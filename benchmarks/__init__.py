@@ -0,0 +1,11 @@
+"""
+مجموعه‌ی بنچمارک API همه‌ی اپ‌ها
+
+اجرا (از ریشه‌ی پروژه):
+
+    python -m benchmarks --scale small --output bench/HEAD.json
+    python -m benchmarks --compare bench/main.json bench/HEAD.json
+
+برای PostgreSQL محلی متغیرهای DB_ENGINE=postgresql و DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT
+را تنظیم کنید؛ داده‌ها در پایگاه داده‌ی آزمایشی جداگانه (test_<DB_NAME>) ساخته و در پایان حذف می‌شوند.
+"""
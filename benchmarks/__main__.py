@@ -0,0 +1,52 @@
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from .report import compare
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="بنچمارک API همه‌ی اپ‌ها")
+    parser.add_argument('--scale', default='small', choices=['small', 'medium', 'large'])
+    parser.add_argument('--iterations', type=int, default=50, help="تعداد درخواست اندازه‌گیری‌شده برای هر سناریو")
+    parser.add_argument('--warmup', type=int, default=5, help="تعداد درخواست گرم‌کردن پیش از اندازه‌گیری")
+    parser.add_argument('--only', action='append', help="فقط سناریوهایی که با این پیشوند شروع می‌شوند")
+    parser.add_argument('--no-cache', action='store_true', help="اجرا با DummyCache به جای کش پاسخ‌ها")
+    parser.add_argument('--output', help="مسیر فایل JSON خروجی")
+    parser.add_argument('--baseline', help="مقایسه‌ی نتیجه‌ی این اجرا با یک خروجی قبلی")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help="مقایسه‌ی دو خروجی بدون اجرای بنچمارک")
+    parser.add_argument('--threshold', type=float, default=10.0, help="درصد کندشدن p50 که علامت‌گذاری می‌شود")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        base, head = (json.loads(Path(path).read_text(encoding='utf-8')) for path in args.compare)
+        print(compare(base, head, args.threshold))
+        return
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'finalkelasor.settings')
+    import django
+
+    django.setup()
+    from .runner import run
+
+    report = run(
+        scale=args.scale, iterations=args.iterations, warmup=args.warmup, only=args.only,
+        use_cache=not args.no_cache, log=lambda line: print(line, file=sys.stderr),
+    )
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        print(compare(baseline, report, args.threshold), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
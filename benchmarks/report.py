@@ -0,0 +1,25 @@
+def compare(base, head, threshold=10.0):
+    """جدول مقایسه‌ی دو خروجی؛ تغییرهای بیشتر از threshold درصد با علامت ! مشخص می‌شوند"""
+    lines = [
+        f"base: {base['meta'].get('commit')} ({base['meta'].get('database')}, {base['meta'].get('scale')})  "
+        f"head: {head['meta'].get('commit')} ({head['meta'].get('database')}, {head['meta'].get('scale')})",
+        f"{'scenario':<42} {'p50 base':>10} {'p50 head':>10} {'change':>9} {'p99 change':>11} {'queries':>9}",
+    ]
+    for name in sorted(base['results'].keys() | head['results'].keys()):
+        old, new = base['results'].get(name), head['results'].get(name)
+        if old is None or new is None:
+            lines.append(f"{name:<42} {'only in ' + ('head' if old is None else 'base'):>10}")
+            continue
+
+        change = _change(old['p50_ms'], new['p50_ms'])
+        tail_change = _change(old['p99_ms'], new['p99_ms'])
+        flag = ' !' if change > threshold or new['queries'] > old['queries'] else ''
+        lines.append(
+            f"{name:<42} {old['p50_ms']:>10.2f} {new['p50_ms']:>10.2f} {change:>+8.1f}% {tail_change:>+10.1f}% "
+            f"{old['queries']:>4}→{new['queries']:<4}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def _change(old, new):
+    return (new - old) / old * 100 if old else 0.0
@@ -0,0 +1,149 @@
+import platform
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import django
+from django.apps import apps
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from finalkelasor.metrics import track_queries
+from USER.tokens import UserRefreshToken
+
+from .scenarios import build_scenarios
+from .seed import seed
+
+# تنظیمات اجرای بنچمارک: بدون نخ پس‌زمینه، بدون پیامک و ایمیل واقعی
+BENCHMARK_SETTINGS = {
+    'OTP_QUEUE_WORKERS': 0,
+    'OTP_SMS_SENDER': 'USER.services.sms_service.send_otp_locally',
+    'IMAGE_PIPELINE_WORKERS': 0,
+    'QUERY_BUDGET_ENFORCE': False,
+    'QUERY_METRICS_HEADERS': False,
+}
+
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'otp': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'otp'},
+}
+
+
+def percentile(values, percent):
+    """صدک به روش nearest-rank روی مقادیر مرتب‌شده"""
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _client(fixtures, user_key):
+    client = APIClient()
+    if user_key is not None:
+        # توکن برای هر سناریو تازه ساخته می‌شود تا در اجراهای طولانی منقضی نشود
+        token = UserRefreshToken.for_user(fixtures[user_key]).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def run_scenario(scenario, fixtures, iterations, warmup):
+    client = _client(fixtures, scenario.user)
+    send = getattr(client, scenario.method)
+
+    def request():
+        return send(scenario.path, scenario.data, format='json') if scenario.data else send(scenario.path)
+
+    for _ in range(warmup):
+        request()
+
+    timings, queries, statuses, size = [], [], Counter(), 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with track_queries() as metrics:
+            request_started = time.perf_counter()
+            response = request()
+            timings.append((time.perf_counter() - request_started) * 1000)
+        queries.append(metrics.queries)
+        statuses[response.status_code] += 1
+        size = len(response.content)
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        'method': scenario.method.upper(),
+        'path': scenario.path,
+        'user': scenario.user,
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p90_ms': round(percentile(timings, 90), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'rps': round(iterations / elapsed, 1) if elapsed else None,
+        'queries': max(queries),
+        'queries_mean': round(statistics.fmean(queries), 2),
+        'status': {str(code): count for code, count in sorted(statuses.items())},
+        'response_bytes': size,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scale='small', iterations=50, warmup=5, only=None, use_cache=True, seed_value=1234, log=print):
+    """
+    ساخت پایگاه داده‌ی آزمایشی، پر کردن آن و اجرای همه‌ی سناریوها
+
+    only فهرست پیشوندهای نام سناریو است (مثلاً ['weblog.posts']). خروجی یک دیکشنری
+    قابل ذخیره به صورت JSON است.
+    """
+    overrides = dict(BENCHMARK_SETTINGS)
+    # پروژه فایل مایگریشن ندارد؛ جدول‌ها مستقیماً از روی مدل‌ها ساخته می‌شوند
+    overrides['MIGRATION_MODULES'] = {app.label: None for app in apps.get_app_configs()}
+    if not use_cache:
+        overrides['CACHES'] = NO_CACHE
+
+    runner = DiscoverRunner(interactive=False, verbosity=0)
+    with override_settings(**overrides):
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+        try:
+            started = time.perf_counter()
+            fixtures = seed(scale, seed_value)
+            log(f"seeded {fixtures['counts']} in {time.perf_counter() - started:.1f}s")
+
+            results = {}
+            for scenario in build_scenarios(fixtures):
+                if only and not any(scenario.name.startswith(prefix) for prefix in only):
+                    continue
+                results[scenario.name] = run_scenario(scenario, fixtures, iterations, warmup)
+                result = results[scenario.name]
+                log(f"{scenario.name:<42} p50={result['p50_ms']:>8.2f}ms "
+                    f"p99={result['p99_ms']:>8.2f}ms queries={result['queries']}")
+
+            meta = {
+                'commit': _git_commit(),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'scale': scale,
+                'counts': fixtures['counts'],
+                'iterations': iterations,
+                'warmup': warmup,
+                'cache': use_cache,
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            }
+        finally:
+            runner.teardown_databases(old_config)
+            runner.teardown_test_environment()
+
+    return {'meta': meta, 'results': results}
+
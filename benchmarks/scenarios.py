@@ -0,0 +1,50 @@
+from collections import namedtuple
+
+from .seed import PASSWORD
+
+# user کلید کاربر در خروجی seed است؛ None یعنی درخواست بدون احراز هویت
+Scenario = namedtuple('Scenario', ['name', 'method', 'path', 'user', 'data'])
+
+
+def build_scenarios(fixtures):
+    """فهرست درخواست‌های بنچمارک برای همه‌ی اپ‌ها"""
+    user, post, ticket, invoice = fixtures['user'], fixtures['post'], fixtures['ticket'], fixtures['invoice']
+    post_ids = ",".join(str(item.id) for item in fixtures['posts'])
+
+    return [
+        # USER
+        Scenario('user.login', 'post', '/USER/login/', None, {'phone': user.phone, 'password': PASSWORD}),
+        Scenario('user.profile', 'get', '/USER/profile/', 'user', None),
+
+        # WEBLOG
+        Scenario('weblog.posts.list', 'get', '/WEBLOG/posts/', None, None),
+        Scenario('weblog.posts.list.category', 'get', f"/WEBLOG/posts/?category={fixtures['category'].slug}", None, None),
+        Scenario('weblog.posts.list.tag', 'get', f"/WEBLOG/posts/?tag={fixtures['tag'].slug}", None, None),
+        Scenario('weblog.posts.list.staff', 'get', '/WEBLOG/posts/', 'staff', None),
+        Scenario('weblog.posts.retrieve', 'get', f'/WEBLOG/posts/{post.slug}/', None, None),
+        Scenario('weblog.posts.search', 'get', '/WEBLOG/posts/search/?q=جنگو', None, None),
+        Scenario('weblog.posts.liked', 'get', f'/WEBLOG/posts/liked/?ids={post_ids}', 'user', None),
+        Scenario('weblog.comments.list', 'get', f'/WEBLOG/posts/{post.slug}/comments/', None, None),
+        Scenario('weblog.likes.create', 'post', f'/WEBLOG/posts/{post.slug}/likes/', 'user', None),
+        Scenario('weblog.categories.list', 'get', '/WEBLOG/categories/', 'staff', None),
+        Scenario('weblog.tags.list', 'get', '/WEBLOG/tags/', 'staff', None),
+
+        # PAYMENT
+        Scenario('payment.invoices.list', 'get', '/PAYMENT/invoices/', 'user', None),
+        Scenario('payment.invoices.list.staff', 'get', '/PAYMENT/invoices/', 'staff', None),
+        Scenario('payment.invoices.retrieve', 'get', f'/PAYMENT/invoices/{invoice.id}/', 'user', None),
+        Scenario('payment.transactions.list', 'get', '/PAYMENT/transactions/', 'user', None),
+        Scenario('payment.transactions.summary', 'get', '/PAYMENT/transactions/summary/', 'user', None),
+
+        # TICKET
+        Scenario('ticket.tickets.list', 'get', '/TICKET/tickets/', 'user', None),
+        Scenario('ticket.tickets.list.support', 'get', '/TICKET/tickets/', 'support', None),
+        Scenario('ticket.tickets.retrieve', 'get', f'/TICKET/tickets/{ticket.id}/', 'user', None),
+        Scenario('ticket.messages.list', 'get', f'/TICKET/tickets/{ticket.id}/messages/', 'user', None),
+
+        # BOOTCAMP
+        Scenario('bootcamp.bootcamps.list', 'get', '/BOOTCAMP/bootcamps/', 'user', None),
+        Scenario('bootcamp.bootcamps.list.registration', 'get', '/BOOTCAMP/bootcamps/?status=registration', 'user', None),
+        Scenario('bootcamp.bootcamps.retrieve', 'get', f"/BOOTCAMP/bootcamps/{fixtures['bootcamp'].id}/", 'user', None),
+        Scenario('bootcamp.registrations.list', 'get', '/BOOTCAMP/registrations/', 'user', None),
+    ]
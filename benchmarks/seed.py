@@ -0,0 +1,173 @@
+import io
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.utils import timezone
+
+from BOOTCAMP.models import Bootcamp, BootcampCategory, BootcampRegistration
+from PAYMENT.models import Invoice, Transaction
+from TICKET.models import Ticket, TicketMessage
+from USER.models import User
+from WEBLOG.models import BlogCategory, BlogComment, BlogLike, BlogPost, BlogTag
+from WEBLOG.services import feed
+
+PASSWORD = 'benchmark-password'
+
+# ضریب حجم داده برای هر مقیاس
+SCALES = {
+    'small': 1,
+    'medium': 5,
+    'large': 20,
+}
+
+
+def seed(scale='small', seed_value=1234):
+    """
+    ساخت داده‌ی آزمایشی با حجم نزدیک به محیط واقعی؛ همه با bulk_create
+
+    خروجی دیکشنری اشیای نمونه‌ای است که سناریوها برای ساخت آدرس‌ها لازم دارند.
+    """
+    factor = SCALES[scale]
+    rng = random.Random(seed_value)
+    now = timezone.now()
+    # هش رمز یک بار ساخته می‌شود؛ ساختن آن برای هر کاربر بیشتر زمان seed را می‌گیرد
+    password = make_password(PASSWORD)
+
+    users = User.objects.bulk_create([
+        User(
+            phone=f"0910{index:07d}", password=password, first_name="کاربر", last_name=str(index),
+            national_id=f"{index:010d}", gender=rng.choice(['male', 'female'])
+        )
+        for index in range(100 * factor)
+    ])
+    staff = User.objects.create_superuser(
+        phone='09990000000', password=PASSWORD, first_name="مدیر", last_name="سیستم",
+        national_id='9990000000', gender='male'
+    )
+    support = User.objects.create_support_user(
+        phone='09990000001', password=PASSWORD, first_name="پشتیبان", last_name="سیستم",
+        national_id='9990000001', gender='female'
+    )
+
+    # وبلاگ
+    categories = BlogCategory.objects.bulk_create([
+        BlogCategory(title=f"دسته {index}", slug=f'category-{index}') for index in range(5)
+    ])
+    tags = BlogTag.objects.bulk_create([
+        BlogTag(name=f"تگ {index}", slug=f'tag-{index}') for index in range(20)
+    ])
+    words = ["جنگو", "پایتون", "بوتکمپ", "پایگاه داده", "کارایی", "کش", "ایندکس", "امنیت", "آموزش", "پروژه"]
+    posts = BlogPost.objects.bulk_create([
+        BlogPost(
+            title=" ".join(rng.sample(words, 3)) + f" {index}",
+            slug=f'post-{index}',
+            content=" ".join(rng.choice(words) for _ in range(400)),
+            excerpt=" ".join(rng.choice(words) for _ in range(20)),
+            category=rng.choice(categories),
+            author=staff,
+            status=BlogPost.Status.PUBLISHED if index % 10 else BlogPost.Status.DRAFT,
+            published_at=now - timedelta(hours=index) if index % 10 else None,
+        )
+        for index in range(200 * factor)
+    ])
+    BlogPost.tags.through.objects.bulk_create([
+        BlogPost.tags.through(blogpost_id=post.id, blogtag_id=tag.id)
+        for post in posts for tag in rng.sample(tags, 3)
+    ])
+    comments = BlogComment.objects.bulk_create([
+        BlogComment(post=post, author=rng.choice(users), content="نظر", is_approved=rng.random() < 0.9)
+        for post in posts for _ in range(5)
+    ])
+    BlogComment.objects.bulk_create([
+        BlogComment(
+            post_id=comment.post_id, author=rng.choice(users), parent=comment,
+            content="پاسخ", is_approved=True
+        )
+        for comment in comments if rng.random() < 0.2
+    ])
+    BlogLike.objects.bulk_create([
+        BlogLike(post=post, user=user)
+        for post in posts for user in rng.sample(users, min(10, len(users)))
+    ])
+    call_command('reconcile_blog_counters', stdout=io.StringIO())
+    call_command('rebuild_blog_search_index', stdout=io.StringIO())
+    feed.rebuild()
+
+    # مالی
+    invoices = Invoice.objects.bulk_create([
+        Invoice(
+            user=user, amount=rng.randrange(100, 5000) * 1000, title=f"فاکتور {index}",
+            status=rng.choice(Invoice.Status.values), created_by=staff
+        )
+        for user in users for index in range(3)
+    ])
+    Transaction.objects.bulk_create([
+        Transaction(
+            user_id=invoice.user_id, invoice=invoice, amount=invoice.amount,
+            transaction_type=rng.choice(['payment', 'charge', 'refund'])
+        )
+        for invoice in invoices for _ in range(2)
+    ])
+
+    # بوتکمپ
+    bootcamp_categories = BootcampCategory.objects.bulk_create([
+        BootcampCategory(name=f"دسته {index}") for index in range(3)
+    ])
+    bootcamps = Bootcamp.objects.bulk_create([
+        Bootcamp(
+            title=f"بوتکمپ {index}", category=rng.choice(bootcamp_categories),
+            start_date=now.date() + timedelta(days=30), end_date=now.date() + timedelta(days=90),
+            schedule_days="شنبه و دوشنبه", schedule_time="18 تا 21", capacity=50,
+            status=Bootcamp.Status.REGISTRATION if index % 3 else Bootcamp.Status.ONGOING,
+            price=rng.randrange(1, 20) * 1000000
+        )
+        for index in range(10 * factor)
+    ])
+    BootcampRegistration.objects.bulk_create([
+        BootcampRegistration(user=user, bootcamp=bootcamp)
+        for user in users for bootcamp in rng.sample(bootcamps, 2)
+    ])
+    # شمارنده‌ی صندلی‌ها همان چیزی است که سرویس ثبت‌نام نگه می‌دارد
+    for bootcamp in bootcamps:
+        Bootcamp.objects.filter(pk=bootcamp.pk).update(seats_taken=bootcamp.registrations.count())
+
+    # تیکت (bulk_create تا ایمیل‌های اطلاع‌رسانی save ارسال نشوند)
+    tickets = Ticket.objects.bulk_create([
+        Ticket(user=user, subject=f"تیکت {index}", bootcamp=rng.choice(bootcamps))
+        for user in users for index in range(2)
+    ])
+    TicketMessage.objects.bulk_create([
+        TicketMessage(
+            ticket=ticket, sender=support if index % 2 else ticket.user,
+            content="متن پیام", is_from_support=bool(index % 2)
+        )
+        for ticket in tickets for index in range(4)
+    ])
+
+    user = users[0]
+    return {
+        'user': user,
+        'staff': staff,
+        'support': support,
+        'post': posts[1],
+        'posts': posts[1:21],
+        'category': categories[0],
+        'tag': tags[0],
+        'invoice': Invoice.objects.filter(user=user).first(),
+        'ticket': Ticket.objects.filter(user=user).first(),
+        'bootcamp': bootcamps[1],
+        'counts': {
+            'users': len(users) + 2,
+            'posts': len(posts),
+            'comments': BlogComment.objects.count(),
+            'likes': BlogLike.objects.count(),
+            'invoices': len(invoices),
+            'transactions': Transaction.objects.count(),
+            'bootcamps': len(bootcamps),
+            'registrations': BootcampRegistration.objects.count(),
+            'tickets': len(tickets),
+            'ticket_messages': TicketMessage.objects.count(),
+        },
+    }
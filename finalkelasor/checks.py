@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Error
+
+# کش‌هایی که داده‌شان فقط در حافظه‌ی همان پردازه است
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def check_shared_cache(setting, purpose, check_id):
+    """
+    خطای بررسی سیستم اگر کش تنظیم `setting` بین پردازه‌ها مشترک نباشد
+
+    purpose در متن خطا توضیح می‌دهد چه داده‌ای در این کش است.
+    """
+    alias = getattr(settings, setting)
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f"{purpose} cache '{alias}' ({setting}) uses {backend}, which is not shared between processes.",
+            hint=f"Use django.core.cache.backends.db.DatabaseCache or RedisCache for {setting}.",
+            id=check_id,
+        )]
+    return []
@@ -0,0 +1,189 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+
+def render_variant(source, size, image_format='WEBP', quality=80):
+    """ساخت یک نسخه‌ی کوچک‌شده از تصویر؛ تصویرهای کوچک‌تر از size بزرگ نمی‌شوند"""
+    image = ImageOps.exif_transpose(Image.open(source))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=quality)
+    return buffer.getvalue()
+
+
+class ImageVariantPipeline:
+    """
+    ساخت نسخه‌های کوچک‌شده (مثلاً WebP) از تصاویر آپلودشده در نخ‌های پس‌زمینه
+
+    نسخه‌ها کنار فایل اصلی در همان storage ذخیره می‌شوند و مسیرشان در یک JSONField
+    روی همان ردیف نوشته می‌شود. اگر تعداد کارگرها صفر باشد پردازش همزمان انجام می‌شود (مناسب تست).
+    """
+
+    def __init__(self, variants, workers=2, image_format='WEBP', quality=80):
+        self.variants = variants
+        self.workers = workers
+        self.image_format = image_format
+        self.quality = quality
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, model, pk, field_name, variants_field):
+        if self.workers == 0:
+            self.process(model, pk, field_name, variants_field)
+            return
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='image-variants'
+                    )
+        self._executor.submit(self._run, model, pk, field_name, variants_field)
+
+    def _run(self, model, pk, field_name, variants_field):
+        try:
+            self.process(model, pk, field_name, variants_field)
+        except Exception:
+            logger.exception("Could not build image variants for %s #%s", model._meta.label, pk)
+        finally:
+            close_old_connections()
+
+    def process(self, model, pk, field_name, variants_field):
+        name = model.objects.filter(pk=pk).values_list(field_name, flat=True).first()
+        if not name:
+            return {}
+
+        storage = model._meta.get_field(field_name).storage
+        root = os.path.splitext(name)[0]
+        extension = self.image_format.lower()
+        variants = {}
+
+        for variant, size in self.variants.items():
+            with storage.open(name, 'rb') as source:
+                content = render_variant(source, size, self.image_format, self.quality)
+            variants[variant] = storage.save(f"{root}_{variant}.{extension}", ContentFile(content))
+
+        # اگر در این فاصله فایل دیگری آپلود شده باشد نسخه‌های این فایل نوشته نمی‌شوند
+        updated = model.objects.filter(pk=pk, **{field_name: name}).update(**{variants_field: variants})
+        if not updated:
+            for path in variants.values():
+                storage.delete(path)
+            return variants
+
+        # update سیگنالی نمی‌فرستد؛ مدل از این راه کش‌های وابسته به ردیف را باطل می‌کند
+        on_variants_ready = getattr(model, 'on_variants_ready', None)
+        if on_variants_ready is not None:
+            on_variants_ready(pk, field_name, variants)
+        return variants
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_image_pipeline():
+    """خط پردازش مشترک پردازه که بر اساس تنظیمات ساخته می‌شود"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = ImageVariantPipeline(
+                    variants=settings.IMAGE_VARIANTS,
+                    workers=settings.IMAGE_PIPELINE_WORKERS,
+                    image_format=settings.IMAGE_VARIANT_FORMAT,
+                    quality=settings.IMAGE_VARIANT_QUALITY,
+                )
+    return _pipeline
+
+
+def _delete_files(files):
+    for storage, path in files:
+        storage.delete(path)
+
+
+class ImageVariantsMixin:
+    """
+    میکسین مدل: پس از آپلود فایل جدید، ساخت نسخه‌ها را بعد از commit تراکنش زمان‌بندی می‌کند
+
+    image_variant_fields نام فیلد تصویر را به نام JSONField نسخه‌ها نگاشت می‌کند. با عوض
+    شدن یا پاک شدن تصویر، فایل نسخه‌های قبلی هم پس از commit از storage حذف می‌شوند.
+    """
+    image_variant_fields = {}
+
+    @classmethod
+    def on_variants_ready(cls, pk, field_name, variants):
+        """پس از نوشته شدن نسخه‌های field_name ردیف pk توسط خط پردازش صدا زده می‌شود"""
+
+    def save(self, *args, **kwargs):
+        pending, reset = [], []
+        for field_name, variants_field in self.image_variant_fields.items():
+            file = getattr(self, field_name)
+            if file and not file._committed:
+                pending.append((field_name, variants_field))
+            if (file and not file._committed) or (not file and getattr(self, variants_field)):
+                # نسخه‌های فایل قبلی دیگر معتبر نیستند
+                setattr(self, variants_field, {})
+                reset.append((field_name, variants_field))
+
+        model, using = type(self), kwargs.get('using') or self._state.db
+        stale = []
+        if reset and not self._state.adding:
+            # مسیر نسخه‌های قبلی از پایگاه داده خوانده می‌شود؛ نمونه‌ی در حافظه ممکن است
+            # پیش از نوشته شدن نسخه‌ها توسط خط پردازش بارگذاری شده باشد
+            current = model._base_manager.using(using).filter(pk=self.pk).values(
+                *[variants_field for _, variants_field in reset]
+            ).first() or {}
+            for field_name, variants_field in reset:
+                storage = model._meta.get_field(field_name).storage
+                stale.extend((storage, path) for path in (current.get(variants_field) or {}).values())
+
+        if kwargs.get('update_fields') is not None and reset:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *[variants_field for _, variants_field in reset]}
+        super().save(*args, **kwargs)
+
+        pk, using = self.pk, using or self._state.db
+        if stale:
+            # فایل نسخه‌های قبلی فقط پس از commit حذف می‌شوند تا با rollback از دست نروند
+            transaction.on_commit(lambda: _delete_files(stale), using=using)
+        for field_name, variants_field in pending:
+            transaction.on_commit(
+                lambda f=field_name, v=variants_field: get_image_pipeline().submit(model, pk, f, v),
+                using=using
+            )
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """نشانی کامل نسخه‌های یک تصویر؛ تا آماده شدن نسخه‌ها یک دیکشنری خالی است"""
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return {}
+        storage = self.parent.Meta.model._meta.get_field(self.image_field).storage
+        request = self.context.get('request')
+        urls = {}
+        for variant, path in value.items():
+            url = storage.url(path)
+            urls[variant] = request.build_absolute_uri(url) if request else url
+        return urls
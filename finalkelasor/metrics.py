@@ -0,0 +1,163 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """تعداد کوئری‌های یک اکشن از بودجه‌ی تعیین‌شده بیشتر شده است"""
+
+
+class RequestMetrics:
+    """شمارش کوئری‌ها، زمان پایگاه داده و زمان سریالایزر در طول یک درخواست"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # امضای execute_wrapper جنگو
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+def current_metrics():
+    """آمار درخواست جاری یا None اگر اندازه‌گیری فعال نباشد"""
+    return _current.get()
+
+
+@contextmanager
+def track_queries():
+    """
+    اندازه‌گیری کوئری‌های همه‌ی اتصال‌های پایگاه داده در این بلوک
+
+    بلوک‌ها می‌توانند تودرتو باشند (میان‌افزار و QueryBudgetMixin)؛ هر کدام کوئری‌ها را
+    جداگانه می‌شمارند و زمان سریالایزر بلوک داخلی به بلوک بیرونی هم اضافه می‌شود.
+    """
+    metrics = RequestMetrics()
+    parent = _current.get()
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(metrics))
+            yield metrics
+    finally:
+        _current.reset(token)
+        if parent is not None:
+            parent.serializer_time += metrics.serializer_time
+
+
+class QueryMetricsMiddleware:
+    """
+    ثبت تعداد کوئری، زمان پایگاه داده، زمان سریالایزر و حجم پاسخ هر درخواست
+
+    آمار در لاگ finalkelasor.metrics (با extra={'metrics': ...}) نوشته می‌شود و اگر
+    QUERY_METRICS_HEADERS فعال باشد در سرآیندهای Server-Timing و X-Query-Count هم برمی‌گردد.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with track_queries() as metrics:
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        size = len(response.content) if not response.streaming else None
+        data = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'serializer_ms': round(metrics.serializer_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'response_bytes': size,
+        }
+        logger.info(
+            "%(method)s %(path)s %(status)s queries=%(queries)s db=%(db_ms)sms "
+            "serializer=%(serializer_ms)sms total=%(total_ms)sms bytes=%(response_bytes)s",
+            data, extra={'metrics': data}
+        )
+
+        if settings.QUERY_METRICS_HEADERS:
+            response['Server-Timing'] = ", ".join([
+                f'db;dur={data["db_ms"]};desc="{metrics.queries} queries"',
+                f'serializer;dur={data["serializer_ms"]}',
+                f'total;dur={data["total_ms"]}',
+            ])
+            response['X-Query-Count'] = str(metrics.queries)
+        return response
+
+
+class _TimedSerializer:
+    """پوشش سریالایزر که زمان ساخت data را در آمار درخواست جاری ثبت می‌کند"""
+
+    def __init__(self, serializer):
+        self._serializer = serializer
+
+    @property
+    def data(self):
+        started = time.perf_counter()
+        try:
+            return self._serializer.data
+        finally:
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.serializer_time += time.perf_counter() - started
+
+    def __getattr__(self, name):
+        return getattr(self._serializer, name)
+
+    def __setattr__(self, name, value):
+        # مثلاً serializer.instance = ... در perform_create/perform_update باید به خود سریالایزر برسد
+        if name == '_serializer':
+            super().__setattr__(name, value)
+        else:
+            setattr(self._serializer, name, value)
+
+
+class QueryBudgetMixin:
+    """
+    بودجه‌ی کوئری برای اکشن‌های یک ViewSet
+
+    query_budget نام اکشن را به حداکثر تعداد کوئری نگاشت می‌کند. اگر اکشنی از بودجه‌اش
+    بیشتر کوئری بزند هشدار لاگ می‌شود و اگر QUERY_BUDGET_ENFORCE فعال باشد (مثلاً در تست‌ها)
+    خطای QueryBudgetExceeded رخ می‌دهد.
+    """
+    query_budget = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        with track_queries() as metrics:
+            response = super().dispatch(request, *args, **kwargs)
+        self.check_query_budget(metrics)
+        return response
+
+    def get_serializer(self, *args, **kwargs):
+        return _TimedSerializer(super().get_serializer(*args, **kwargs))
+
+    def check_query_budget(self, metrics):
+        action = getattr(self, 'action', None) or self.request.method.lower()
+        budget = self.query_budget.get(action)
+        if budget is None or metrics.queries <= budget:
+            return
+
+        message = f"{type(self).__name__}.{action} issued {metrics.queries} queries (budget {budget})"
+        if settings.QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message, extra={'metrics': {'view': type(self).__name__, 'action': action,
+                                                   'queries': metrics.queries, 'budget': budget}})
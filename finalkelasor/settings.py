@@ -39,17 +39,17 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'USER',
-    #'PROJECTS',
-    #'PAYMENT',
-    #'TICKET',
-    #'WEBLOG',
-    #'BOOTCAMP',
-    #'WEBLOG'
-
+    'PROJECTS',
+    'PAYMENT',
+    'TICKET',
+    'WEBLOG',
+    'BOOTCAMP',
+    'NOTIFICATION',
 ]
 
 
 MIDDLEWARE = [
+    'finalkelasor.metrics.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,7 +64,7 @@ ROOT_URLCONF = 'finalkelasor.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -89,6 +89,17 @@ DATABASES = {
     }
 }
 
+# برای اجرا روی PostgreSQL (مثلاً در بنچمارک‌ها): DB_ENGINE=postgresql
+if os.environ.get('DB_ENGINE') == 'postgresql':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DB_NAME', 'finalkelasor'),
+        'USER': os.environ.get('DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -108,6 +119,29 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# سیاست هش رمز عبور
+# اولین هشر برای رمزهای جدید استفاده می‌شود؛ بقیه فقط برای بررسی هش‌های قدیمی هستند
+# و این هش‌ها در اولین ورود موفق با هشر اول دوباره ساخته می‌شوند.
+# argon2 به بسته‌ی argon2-cffi و bcrypt به بسته‌ی bcrypt نیاز دارد.
+PASSWORD_HASH_POLICY = os.environ.get('PASSWORD_HASH_POLICY', 'pbkdf2')  # pbkdf2 | argon2 | bcrypt
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 600000))
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 102400  # کیلوبایت
+PASSWORD_ARGON2_PARALLELISM = 8
+PASSWORD_BCRYPT_ROUNDS = 12
+
+PASSWORD_HASHERS_BY_POLICY = {
+    'pbkdf2': 'USER.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'USER.hashers.TunedArgon2PasswordHasher',
+    'bcrypt': 'USER.hashers.TunedBCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHERS_BY_POLICY[PASSWORD_HASH_POLICY]] + [
+    hasher for policy, hasher in PASSWORD_HASHERS_BY_POLICY.items() if policy != PASSWORD_HASH_POLICY
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -133,14 +167,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # این خط JWT را به عنوان روش احراز هویت قرار می‌دهد.
+        'USER.authentication.ClaimsJWTAuthentication',  # JWT بدون کوئری کاربر؛ کاربر از ادعاهای توکن ساخته می‌شود.
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',  # این خط اطمینان می‌دهد که تنها کاربران احراز هویت‌شده به منابع دسترسی دارند.
     ],
 }
 
-AUTH_USER_MODEL = 'auth.User'
+AUTH_USER_MODEL = 'USER.User'
 
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -157,13 +191,77 @@ SIMPLE_JWT = {
     'LEEWAY': 0,  # میزان انعطاف‌پذیری زمانی برای توکن‌ها. به طور پیش‌فرض صفر است.
 }
 
+# مدت نگهداری زمان آخرین تغییر کاربر در کش درون‌پردازه‌ای (ثانیه)؛ 0 یعنی هر بار از کش مشترک خوانده شود
+JWT_CLAIMS_CACHE_TTL = 5
+
 # تنظیمات احراز هویت
-AUTH_USER_MODEL = 'auth.User'
+AUTH_USER_MODEL = 'USER.User'
 
 
 # تنظیمات کاوهنگار
 KAVEHNEGAR_API_KEY = 'your-api-key-here'
 KAVEHNEGAR_OTP_TEMPLATE = 'otp-template-name'
+KAVEHNEGAR_SENDER = ''  # شماره‌ی فرستنده‌ی پیامک‌های متنی؛ خالی یعنی شماره‌ی پیش‌فرض حساب
+KAVEHNEGAR_CONNECT_TIMEOUT = 3  # ثانیه
+KAVEHNEGAR_READ_TIMEOUT = 5  # ثانیه
+KAVEHNEGAR_POOL_SIZE = 10  # حداکثر اتصال‌های باز نگه‌داشته‌شده
+KAVEHNEGAR_CIRCUIT_FAILURE_THRESHOLD = 5  # تعداد خطای پشت‌سرهم تا قطع مدار
+KAVEHNEGAR_CIRCUIT_RESET_TIMEOUT = 30  # ثانیه تا درخواست آزمایشی بعدی
+
+# صف ارسال OTP
+# در تست‌ها می‌توان ارسال‌کننده را 'USER.services.sms_service.send_otp_locally' و تعداد کارگرها را 0 گذاشت
+OTP_SMS_SENDER = 'USER.services.sms_service.send_otp_via_kaveneghar'
+OTP_QUEUE_WORKERS = 4  # تعداد نخ‌های ارسال؛ 0 یعنی ارسال همزمان
+OTP_QUEUE_MAX_SIZE = 1000  # حداکثر پیامک‌های در انتظار ارسال
+OTP_QUEUE_MAX_RETRIES = 3
+OTP_QUEUE_RETRY_BACKOFF = 0.5  # ثانیه؛ در هر تلاش دو برابر می‌شود
+
+# لاگ پیامک‌ها
+SMS_LOG_BATCH_SIZE = 100  # تعداد رکورد در هر bulk_create
+SMS_LOG_FLUSH_INTERVAL = 5  # ثانیه؛ حداکثر تأخیر ذخیره‌ی لاگ
+SMS_LOG_RETENTION_DAYS = 90  # پیش‌فرض دستور prune_sms_logs
+
+# کش‌ها
+# 'default' فقط داده‌ای را نگه می‌دارد که اشکالی ندارد در هر پردازه جدا باشد. داده‌ای که
+# همه‌ی پردازه‌ها باید یکسان ببینند (ابطال توکن‌ها، کش دسترسی‌ها و پاسخ‌ها، OTP) در
+# کش‌های 'shared' و 'otp' است و بررسی‌های سیستم (USER.E001 و ...) کش درون‌پردازه‌ای را
+# برای آن‌ها نمی‌پذیرند. جدول کش پایگاه داده با دستور createcachetable ساخته می‌شود؛
+# با REDIS_URL کش مشترک روی Redis می‌رود.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'shared_cache',
+    },
+    'otp': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'otp_cache',
+    },
+}
+if os.environ.get('REDIS_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+
+# کش زمان آخرین تغییر کاربران برای ابطال توکن‌های مبتنی بر ادعا (USER.authentication)
+AUTH_CHANGED_CACHE_ALIAS = 'shared'
+
+# کش دسترسی‌های پشتیبانی (SupportPermission و گروه‌ها)
+SUPPORT_PERMISSION_CACHE_ALIAS = 'shared'
+SUPPORT_PERMISSION_CACHE_TIMEOUT = 60 * 60  # ثانیه در کش مشترک؛ با سیگنال‌ها باطل می‌شود
+SUPPORT_PERMISSION_LOCAL_CACHE_TTL = 5  # ثانیه در کش درون‌پردازه‌ای (حداکثر تأخیر اعمال تغییر در پردازه‌های دیگر)
+SUPPORT_PERMISSION_LOCAL_CACHE_SIZE = 5000
+
+# محدودیت‌های OTP (همه بر حسب ثانیه)
+OTP_CACHE_ALIAS = 'otp'
+OTP_CODE_TTL = 5 * 60  # اعتبار کد
+OTP_RESEND_INTERVAL = 2 * 60  # فاصله‌ی مجاز بین دو ارسال
+OTP_MAX_SENDS = 5  # حداکثر ارسال پیش از مسدود شدن
+OTP_LOCKOUT = 30 * 60  # مدت مسدود بودن پس از رسیدن به حداکثر
+OTP_MAX_ATTEMPTS = 5  # تعداد تلاش برای وارد کردن هر کد پیش از باطل شدن آن
 
 
 # تنظیمات ایمیل
@@ -175,6 +273,39 @@ EMAIL_HOST_USER = 'noreply@yourdomain.com'
 EMAIL_HOST_PASSWORD = 'yourpassword'
 DEFAULT_FROM_EMAIL = 'noreply@yourdomain.com'
 SUPPORT_EMAIL = 'support@yourdomain.com'
+SITE_URL = 'https://yourdomain.com'  # برای لینک‌های داخل ایمیل‌ها
+TICKET_REPLY_DIGEST_WINDOW = 5 * 60  # ثانیه؛ پاسخ‌های پشت‌سرهم به یک تیکت با یک پیامک اطلاع داده می‌شوند
+
+# صف اطلاع‌رسانی (NOTIFICATION)؛ ارسال با دستور drain_outbox
+# در تست و محیط توسعه می‌توان هر کانال را 'NOTIFICATION.backends.LocalBackend' گذاشت
+NOTIFICATION_BACKENDS = {
+    'email': 'NOTIFICATION.backends.EmailBackend',
+    'sms': 'NOTIFICATION.backends.SMSBackend',
+}
+NOTIFICATION_WORKERS = 4  # تعداد نخ‌های ارسال؛ 0 یعنی ارسال در همان نخ
+NOTIFICATION_BATCH_SIZE = 100  # تعداد پیام برداشته‌شده در هر دسته
+NOTIFICATION_MAX_ATTEMPTS = 5
+NOTIFICATION_RETRY_BACKOFF = 30  # ثانیه؛ در هر تلاش دو برابر می‌شود
+NOTIFICATION_LEASE = 300  # ثانیه؛ پس از آن پیام «در حال ارسال» دوباره برداشته می‌شود
+
+# شمارنده‌ی بازدید وبلاگ
+BLOG_VIEW_FLUSH_THRESHOLD = 500  # تعداد بازدید بافرشده تا نوشتن در پایگاه داده
+BLOG_VIEW_FLUSH_INTERVAL = 10  # ثانیه؛ حداکثر تأخیر نوشتن بازدیدها
+
+# جستجوی وبلاگ
+BLOG_SEARCH_CONFIG = 'simple'  # پیکربندی متن PostgreSQL (برای فارسی ریشه‌یاب داخلی وجود ندارد)
+
+# آمار کوئری درخواست‌ها (finalkelasor.metrics)
+QUERY_METRICS_HEADERS = DEBUG  # ارسال سرآیندهای Server-Timing و X-Query-Count
+QUERY_BUDGET_ENFORCE = False  # در تست‌ها True شود تا عبور از query_budget خطا بدهد
+
+# کش پاسخ‌های خواندنی وبلاگ
+BLOG_RESPONSE_CACHE_ALIAS = 'shared'  # باید بین پردازه‌ها مشترک باشد (بررسی WEBLOG.E001)
+BLOG_RESPONSE_CACHE_TIMEOUT = 300  # ثانیه؛ باطل‌سازی اصلی با سیگنال‌هاست
+
+# کش کاتالوگ بوتکمپ‌ها
+BOOTCAMP_CATALOG_CACHE_ALIAS = 'shared'  # باید بین پردازه‌ها مشترک باشد (بررسی BOOTCAMP.E001)
+BOOTCAMP_CATALOG_CACHE_TIMEOUT = 300  # ثانیه؛ با سیگنال‌های BOOTCAMP باطل می‌شود
 
 # تنظیمات فایل
 MEDIA_URL = '/media/'
@@ -183,4 +314,13 @@ MAX_ATTACHMENT_SIZE = 10 * 1024 * 1024  # 10MB
 
 # تنظیمات مدیا برای آپلود تصاویر
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# نسخه‌های کوچک‌شده‌ی تصاویر آپلودشده (finalkelasor.images)
+IMAGE_VARIANTS = {
+    'thumbnail': (400, 400),  # برای فهرست‌ها
+    'large': (1600, 1600),  # برای صفحه‌ی جزئیات
+}
+IMAGE_VARIANT_FORMAT = 'WEBP'
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_PIPELINE_WORKERS = 2  # تعداد نخ‌های پردازش؛ 0 یعنی پردازش همزمان
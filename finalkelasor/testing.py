@@ -0,0 +1,17 @@
+from django.db import connections
+
+
+class QueryPlanAssertionsMixin:
+    """بررسی اینکه پایگاه داده برای یک کوئری از ایندکس مورد انتظار استفاده می‌کند"""
+
+    def explain(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            # روی جدول‌های کوچک تست، PostgreSQL اسکن ترتیبی را ترجیح می‌دهد
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, f"Expected index {index_name} in plan:\n{plan}")